@@ -0,0 +1,595 @@
+# benchmark.py
+"""
+Benchmarks for Video Search Platform data structures
+Measures memory footprint and operation latency of alternative implementations
+"""
+
+import gc
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from hash_table import Video, VideoMetadataStore, HashTable, OpenAddressingHashTable, HASH_MODES
+from snapshot import save_snapshot, MappedVideoStore
+from spelling import SpellingIndex
+from trie import Trie, VideoTrieSystem, TRIE_TYPES, SPELLING_CATEGORIES
+
+
+def measure_table_memory(table_class, keys, values):
+    """Return bytes allocated per entry when filling a table"""
+    tracemalloc.start()
+    table = table_class(8)
+    for key, value in zip(keys, values):
+        table.insert(key, value)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(keys), table
+
+
+def measure_lookup_latency(table, keys, rounds=3):
+    """Return the best average lookup time in microseconds"""
+    best = float('inf')
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        for key in keys:
+            table.search(key)
+        best = min(best, time.perf_counter() - start_time)
+    return best / len(keys) * 1e6
+
+
+def benchmark_hash_tables(num_entries=100000):
+    """Compare chained and open-addressing hash tables"""
+    print("\n" + "="*70)
+    print(f"HASH TABLE COMPARISON ({num_entries} entries)")
+    print("="*70)
+    
+    # Keys and values are created up front so only table overhead is measured
+    workloads = {
+        'int keys': list(range(num_entries)),
+        'str keys': [f"actor name {i}" for i in range(num_entries)]
+    }
+    values = list(range(num_entries))
+    
+    for workload, keys in workloads.items():
+        print(f"\n{workload}")
+        print("-" * 30)
+        for table_class in (HashTable, OpenAddressingHashTable):
+            bytes_per_entry, table = measure_table_memory(table_class, keys, values)
+            latency = measure_lookup_latency(table, keys)
+            print(f"  {table_class.__name__:<26} {bytes_per_entry:8.1f} bytes/entry  "
+                  f"{latency:6.3f} us/lookup")
+
+
+def benchmark_hash_modes(num_entries=50000):
+    """Compare HashTable string hash modes on long actor-style keys"""
+    print("\n" + "="*70)
+    print(f"HASH MODE COMPARISON ({num_entries} long string keys)")
+    print("="*70)
+    
+    keys = [f"actor with a rather long stage name number {i}" for i in range(num_entries)]
+    for hash_mode in HASH_MODES:
+        table = HashTable(1000, hash_mode=hash_mode)
+        for i, key in enumerate(keys):
+            table.insert(key, i)
+        latency = measure_lookup_latency(table, keys)
+        stats = table.get_stats()
+        print(f"  {hash_mode:<12} {latency:6.3f} us/lookup  "
+              f"max chain {stats['max_bucket_size']}  "
+              f"histogram {stats['chain_length_histogram']}")
+
+
+def benchmark_index_ingest(sizes=(10000, 20000, 40000)):
+    """Show VideoMetadataStore ingest cost per video stays flat with catalog size"""
+    print("\n" + "="*70)
+    print("METADATA STORE INGEST SCALING")
+    print("="*70)
+    
+    for num_videos in sizes:
+        videos = make_videos(num_videos)
+        store = VideoMetadataStore()
+        start_time = time.perf_counter()
+        for video in videos:
+            store.add_video(video)
+        elapsed = time.perf_counter() - start_time
+        print(f"  {num_videos:>8} videos  {elapsed:7.3f} s  "
+              f"{elapsed / num_videos * 1e6:6.2f} us/video")
+
+
+def make_videos(num_videos):
+    """Build a synthetic catalog with realistic name reuse"""
+    return [
+        Video(i, f"Movie {i}", 1950 + i % 70, ["Drama", f"Genre{i % 10}"],
+              [f"Actor {i % 5000}", f"Actor {(i * 7) % 5000}"],
+              [f"Director {i % 800}"], [f"keyword{i % 300}"], 5.0 + i % 5)
+        for i in range(num_videos)
+    ]
+
+
+def benchmark_video_storage(num_videos=50000):
+    """Compare memory retained by object and columnar video storage"""
+    print("\n" + "="*70)
+    print(f"VIDEO STORAGE MEMORY ({num_videos} videos)")
+    print("="*70)
+    
+    for columnar in (False, True):
+        # Input videos are dropped after ingest, so only what the store
+        # keeps alive (including its indexes) is counted
+        tracemalloc.start()
+        store = VideoMetadataStore(columnar=columnar)
+        for video in make_videos(num_videos):
+            store.add_video(video)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        label = 'columnar' if columnar else 'objects'
+        print(f"  {label:<10} {current / num_videos:8.1f} bytes/video")
+
+
+def benchmark_batched_lookups(num_videos=100000):
+    """Compare per-ID double lookups with batched get_videos on search_by_* paths"""
+    print("\n" + "="*70)
+    print(f"BATCHED VIDEO MATERIALIZATION ({num_videos} video catalog)")
+    print("="*70)
+    
+    store = VideoMetadataStore()
+    for video in make_videos(num_videos):
+        store.add_video(video)
+    
+    queries = [('genre', store.genre_index.search('drama')),
+               ('genre', store.genre_index.search('genre3')),
+               ('keyword', store.keyword_index.search('keyword42'))]
+    for index_name, postings in queries:
+        video_ids = list(postings)
+        
+        # Previous behaviour: two hash lookups per ID
+        start_time = time.perf_counter()
+        [store.videos.search(vid) for vid in video_ids if store.videos.search(vid)]
+        before = len(video_ids) / (time.perf_counter() - start_time)
+        
+        start_time = time.perf_counter()
+        store.get_videos(video_ids)
+        after = len(video_ids) / (time.perf_counter() - start_time)
+        
+        print(f"  {index_name:<8} {len(video_ids):>7} ids  "
+              f"before {before:12,.0f} lookups/s  after {after:12,.0f} lookups/s")
+
+
+def benchmark_range_queries(num_videos=100000):
+    """Compare range-index lookups with a full catalog scan"""
+    print("\n" + "="*70)
+    print(f"YEAR / RATING RANGE QUERIES ({num_videos} video catalog)")
+    print("="*70)
+    
+    store = VideoMetadataStore()
+    for video in make_videos(num_videos):
+        store.add_video(video)
+    
+    start_time = time.perf_counter()
+    scanned = {video.video_id for video in store.get_all_videos()
+               if 1990 <= video.year <= 1995 and video.rating >= 9.0}
+    scan_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    indexed = store.search_by_year_range(1990, 1995) & store.search_by_min_rating(9.0)
+    index_time = time.perf_counter() - start_time
+    
+    assert scanned == indexed
+    print(f"  {len(indexed)} matches  full scan {scan_time * 1000:8.2f} ms  "
+          f"range indexes {index_time * 1000:8.2f} ms")
+
+
+def benchmark_posting_encodings(num_videos=100000):
+    """Compare plain and compressed posting lists for keyword and actor indexes"""
+    print("\n" + "="*70)
+    print(f"POSTING LIST ENCODINGS ({num_videos} video catalog)")
+    print("="*70)
+    
+    videos = make_videos(num_videos)
+    for posting_type in ('plain', 'compressed'):
+        store = VideoMetadataStore(posting_types={'keyword': posting_type, 'actor': posting_type})
+        for video in videos:
+            store.add_video(video)
+        posting_stats = store.get_storage_stats()['postings']
+        for index_name in ('keyword', 'actor'):
+            stats = posting_stats[index_name]
+            print(f"  {index_name:<8} {posting_type:<11} {stats['bytes_per_posting']:5.2f} bytes/posting  "
+                  f"ratio {stats['compression_ratio']:5.2f}  "
+                  f"decode {stats['decode_postings_per_second']:12,.0f} postings/s")
+
+
+def benchmark_facet_algebra(num_videos=100000):
+    """Compare bitmap facet intersection with Python set intersection"""
+    print("\n" + "="*70)
+    print(f"GENRE AND YEAR SET ALGEBRA ({num_videos} video catalog)")
+    print("="*70)
+    
+    store = VideoMetadataStore()
+    for video in make_videos(num_videos):
+        store.add_video(video)
+    
+    start_time = time.perf_counter()
+    drama = set(store.genre_index.search('drama'))
+    years = set()
+    for year in range(1960, 1990):
+        years.update(store.year_index.search(year) or ())
+    set_result = drama & years - set(store.genre_index.search('genre3'))
+    set_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    bitmap_result = (store.get_postings('genre', 'drama') & store.get_year_range_postings(1960, 1989)
+                     - store.get_postings('genre', 'genre3'))
+    bitmap_time = time.perf_counter() - start_time
+    
+    assert bitmap_result.to_list() == sorted(set_result)
+    print(f"  {len(bitmap_result)} matches  sets {set_time * 1000:8.2f} ms  "
+          f"bitmaps {bitmap_time * 1000:8.2f} ms")
+
+
+def benchmark_snapshot_startup(num_videos=100000):
+    """Compare rebuilding the metadata store with opening a mapped snapshot"""
+    print("\n" + "="*70)
+    print(f"SNAPSHOT STARTUP ({num_videos} videos)")
+    print("="*70)
+    
+    videos = make_videos(num_videos)
+    start_time = time.perf_counter()
+    store = VideoMetadataStore()
+    for video in videos:
+        store.add_video(video)
+    rebuild_time = time.perf_counter() - start_time
+    
+    handle, path = tempfile.mkstemp(suffix='.snapshot')
+    os.close(handle)
+    try:
+        save_snapshot(store, path)
+        start_time = time.perf_counter()
+        mapped = MappedVideoStore(path)
+        open_time = time.perf_counter() - start_time
+        
+        start_time = time.perf_counter()
+        for video_id in range(0, num_videos, 97):
+            mapped.get_video(video_id)
+        lookup_time = (time.perf_counter() - start_time) / len(range(0, num_videos, 97))
+        
+        print(f"  rebuild with add_video {rebuild_time * 1000:10.2f} ms")
+        print(f"  open mapped snapshot   {open_time * 1000:10.2f} ms "
+              f"({os.path.getsize(path) / 1e6:.1f} MB file)")
+        print(f"  mapped get_video       {lookup_time * 1e6:10.2f} us")
+        mapped.close()
+    finally:
+        os.remove(path)
+
+
+def benchmark_concurrent_throughput(num_videos=40000, thread_counts=(1, 2, 4, 8)):
+    """Threaded ingest plus lookups against a concurrent store"""
+    print("\n" + "="*70)
+    print(f"CONCURRENT STORE THROUGHPUT ({num_videos} videos ingested per run)")
+    print("="*70)
+    
+    videos = make_videos(num_videos)
+    for thread_count in thread_counts:
+        store = VideoMetadataStore(table_type='concurrent')
+        
+        # Half the threads ingest, the rest serve lookups while they do
+        writers = max(1, thread_count // 2)
+        readers = thread_count - writers
+        lookups = [0] * readers
+        done = threading.Event()
+        
+        def ingest(offset):
+            for video in videos[offset::writers]:
+                store.add_video(video)
+        
+        def serve(slot):
+            video_id = slot
+            while not done.is_set():
+                store.get_video(video_id % num_videos)
+                store.actor_index.search(f"actor {video_id % 5000}")
+                video_id += 7
+                lookups[slot] += 1
+        
+        threads = [threading.Thread(target=ingest, args=(i,)) for i in range(writers)]
+        reader_threads = [threading.Thread(target=serve, args=(i,)) for i in range(readers)]
+        start_time = time.perf_counter()
+        for thread in threads + reader_threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+        done.set()
+        for thread in reader_threads:
+            thread.join()
+        
+        assert store.get_video_count() == num_videos
+        print(f"  {thread_count} threads ({writers} writers, {readers} readers)  "
+              f"ingest {num_videos / elapsed:10,.0f} videos/s  "
+              f"lookups {sum(lookups) / elapsed:10,.0f} /s")
+    
+    # Cost of the locks with a single thread
+    for table_type in ('chained', 'concurrent'):
+        store = VideoMetadataStore(table_type=table_type)
+        start_time = time.perf_counter()
+        for video in videos:
+            store.add_video(video)
+        elapsed = time.perf_counter() - start_time
+        print(f"  single-threaded {table_type:<10} ingest {num_videos / elapsed:10,.0f} videos/s")
+
+
+def make_words(num_words, seed=7):
+    """Build a vocabulary of distinct pronounceable words from random syllables"""
+    rng = random.Random(seed)
+    onsets = ['', 'b', 'c', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v', 'w',
+              'br', 'ch', 'st', 'tr', 'sh', 'th', 'gr', 'cl']
+    vowels = ['a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'ou', 'ie']
+    codas = ['', 'n', 'r', 's', 't', 'l', 'm', 'nd', 'st', 'ck']
+    syllables = [onset + vowel + coda for onset in onsets for vowel in vowels for coda in codas]
+    words = set()
+    while len(words) < num_words:
+        words.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return list(words)
+
+
+def benchmark_fuzzy_search(num_words=1000000, num_queries=200, max_distance=2):
+    """Time Trie.fuzzy_search on a large vocabulary with two typos per query"""
+    print("\n" + "="*70)
+    print(f"TRIE FUZZY SEARCH ({num_words} words, distance {max_distance})")
+    print("="*70)
+    
+    words = make_words(num_words)
+    trie = Trie()
+    for word in words:
+        trie.insert(word)
+    
+    rng = random.Random(11)
+    queries = []
+    for _ in range(num_queries):
+        query = list(rng.choice(words))
+        for _ in range(max_distance):
+            query[rng.randrange(len(query))] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+        queries.append(''.join(query))
+    
+    best = float('inf')
+    for _ in range(3):
+        start_time = time.perf_counter()
+        for query in queries:
+            trie.fuzzy_search(query, max_distance)
+        best = min(best, time.perf_counter() - start_time)
+    print(f"  {best / num_queries * 1000:6.2f} ms/query")
+
+
+def make_named_videos(num_videos):
+    """make_videos with word-like titles and actor names
+
+    The numbered names from make_videos fill a decimal trie where nearly
+    every node ends a word, which hides what trie layouts cost.
+    """
+    words = make_words(num_videos * 3)
+    videos = make_videos(num_videos)
+    for video in videos:
+        first, second, third = words[3 * video.video_id:3 * video.video_id + 3]
+        video.title = f"{first} {second}".title()
+        video.actors = [f"{third} {first}".title(), f"{second} {third}".title()]
+    return videos
+
+
+def benchmark_trie_memory(num_videos=10000):
+    """Compare memory and node counts of the standard and radix trie systems"""
+    print("\n" + "="*70)
+    print(f"TRIE MEMORY ({num_videos} videos)")
+    print("="*70)
+    
+    videos = make_named_videos(num_videos)
+    for trie_type in TRIE_TYPES:
+        tracemalloc.start()
+        tries = VideoTrieSystem(trie_type)
+        for video in videos:
+            tries.add_video_to_tries(video)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = tries.get_system_stats()
+        words = sum(trie_stats['word_count'] for trie_stats in stats.values())
+        nodes = sum(trie_stats['node_count'] for trie_stats in stats.values())
+        print(f"  {trie_type:<10} {current / 1e6:8.1f} MB  {current / words:7.1f} bytes/word  "
+              f"{nodes / words:5.2f} nodes/word")
+
+
+def benchmark_frozen_tries(num_videos=10000, num_queries=1000):
+    """Compare a live trie system with its frozen buffers and time loading them"""
+    print("\n" + "="*70)
+    print(f"FROZEN TRIES ({num_videos} videos)")
+    print("="*70)
+    
+    videos = make_named_videos(num_videos)
+    tracemalloc.start()
+    tries = VideoTrieSystem()
+    for video in videos:
+        tries.add_video_to_tries(video)
+    live_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    queries = [video.title[:3].lower() for video in videos[:num_queries]]
+    start_time = time.perf_counter()
+    for query in queries:
+        tries.search_titles(query)
+    live_elapsed = time.perf_counter() - start_time
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tries.bin")
+        tries.save_frozen(path)
+        file_bytes = os.path.getsize(path)
+        del tries
+        
+        start_time = time.perf_counter()
+        frozen = VideoTrieSystem.load_frozen(path)
+        load_elapsed = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        for query in queries:
+            frozen.search_titles(query)
+        frozen_elapsed = time.perf_counter() - start_time
+        frozen.close()
+    
+    print(f"  live tries   {live_bytes / 1e6:8.1f} MB  {live_elapsed / num_queries * 1e6:7.1f} us/prefix query")
+    print(f"  frozen file  {file_bytes / 1e6:8.1f} MB  {frozen_elapsed / num_queries * 1e6:7.1f} us/prefix query  "
+          f"loaded in {load_elapsed * 1000:.2f} ms")
+
+
+def benchmark_substring_search(num_videos=100000, num_queries=200):
+    """Compare trigram-indexed substring search with scanning every title"""
+    print("\n" + "="*70)
+    print(f"SUBSTRING SEARCH ({num_videos} videos)")
+    print("="*70)
+    
+    store = VideoMetadataStore()
+    videos = make_named_videos(num_videos)
+    for video in videos:
+        store.add_video(video)
+    
+    # Infixes cut from the middle of real titles
+    rng = random.Random(5)
+    queries = []
+    for video in rng.sample(videos, num_queries):
+        title = video.title.lower()
+        start = rng.randrange(len(title) - 4)
+        queries.append(title[start:start + 5])
+    
+    start_time = time.perf_counter()
+    for query in queries[:20]:
+        [video for video in store.iter_videos() if query in video.title.lower()]
+    scan_elapsed = (time.perf_counter() - start_time) / 20
+    
+    start_time = time.perf_counter()
+    for query in queries:
+        store.search_by_substring('title', query)
+    index_elapsed = (time.perf_counter() - start_time) / num_queries
+    
+    grams = len(store.substring_indexes['title'].postings)
+    print(f"  full scan      {scan_elapsed * 1000:8.2f} ms/query")
+    print(f"  trigram index  {index_elapsed * 1000:8.2f} ms/query  ({grams} distinct trigrams)")
+
+
+def benchmark_bulk_trie_load(num_videos=10000):
+    """Compare per-video trie inserts with the sorted bulk-load path"""
+    print("\n" + "="*70)
+    print(f"TRIE BULK LOAD ({num_videos} videos)")
+    print("="*70)
+    
+    videos = make_named_videos(num_videos)
+    for trie_type in TRIE_TYPES:
+        # Both paths run under the same GC setting, so the ratio is the bulk path's own
+        for pause_gc in (False, True):
+            tries = VideoTrieSystem(trie_type)
+            if pause_gc:
+                gc.disable()
+            try:
+                start_time = time.perf_counter()
+                for video in videos:
+                    tries.add_video_to_tries(video)
+                per_video = time.perf_counter() - start_time
+            finally:
+                if pause_gc:
+                    gc.enable()
+            
+            tries = VideoTrieSystem(trie_type)
+            start_time = time.perf_counter()
+            tries.bulk_add_videos(videos, pause_gc=pause_gc)
+            bulk = time.perf_counter() - start_time
+            print(f"  {trie_type:<10} GC {'paused' if pause_gc else 'on':<6}  per-video {per_video:7.2f} s  "
+                  f"bulk {bulk:6.2f} s  ({per_video / bulk:4.1f}x)")
+
+
+def benchmark_trie_stats(num_videos=10000, rounds=1000):
+    """Time trie system statistics, which no longer walk the tries"""
+    print("\n" + "="*70)
+    print(f"TRIE STATISTICS ({num_videos} videos)")
+    print("="*70)
+    
+    videos = make_named_videos(num_videos)
+    for trie_type in TRIE_TYPES:
+        tries = VideoTrieSystem(trie_type)
+        tries.bulk_add_videos(videos)
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            stats = tries.get_system_stats()
+        elapsed = (time.perf_counter() - start_time) / rounds
+        nodes = sum(trie_stats['node_count'] for trie_stats in stats.values())
+        print(f"  {trie_type:<10} {nodes:>9} nodes  get_system_stats {elapsed * 1e6:7.1f} us")
+
+
+def benchmark_spelling_index(num_videos=10000, num_queries=200):
+    """Memory and latency of symmetric-delete spelling indexes against trie fuzzy search"""
+    print("\n" + "="*70)
+    print(f"SPELLING INDEX ({num_videos} videos)")
+    print("="*70)
+    
+    videos = make_named_videos(num_videos)
+    tries = VideoTrieSystem()
+    tries.bulk_add_videos(videos)
+    terms = {name: list(tries._tries[name].items()) for name in SPELLING_CATEGORIES}
+    
+    rng = random.Random(13)
+    queries = []
+    for _ in range(num_queries):
+        name = rng.choice(SPELLING_CATEGORIES)
+        query = list(rng.choice(terms[name])[0])
+        query[rng.randrange(len(query))] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+        queries.append((name, ''.join(query)))
+    
+    def build_indexes(max_distance):
+        indexes = {}
+        for name in SPELLING_CATEGORIES:
+            indexes[name] = SpellingIndex(max_distance)
+            for word, frequency, _ in terms[name]:
+                indexes[name].add(word, frequency)
+        return indexes
+    
+    for max_distance in (1, 2):
+        # Measured apart from the timings, which tracing would slow down
+        tracemalloc.start()
+        traced = build_indexes(max_distance)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del traced
+        
+        start_time = time.perf_counter()
+        indexes = build_indexes(max_distance)
+        build = time.perf_counter() - start_time
+        
+        start_time = time.perf_counter()
+        for name, query in queries:
+            indexes[name].lookup(query, max_distance)
+        lookup = (time.perf_counter() - start_time) / num_queries
+        
+        start_time = time.perf_counter()
+        for name, query in queries:
+            tries._tries[name].fuzzy_search(query, max_distance)
+        fuzzy = (time.perf_counter() - start_time) / num_queries
+        
+        entries = sum(index.get_stats()['entry_count'] for index in indexes.values())
+        print(f"  distance {max_distance}: {current / 1e6:6.1f} MB  {entries:>8} deletes  build {build:5.2f} s  "
+              f"lookup {lookup * 1e6:7.1f} us  trie fuzzy {fuzzy * 1e6:8.1f} us")
+
+
+def run_all_benchmarks():
+    """Run every benchmark"""
+    benchmark_hash_tables()
+    benchmark_hash_modes()
+    benchmark_index_ingest()
+    benchmark_video_storage()
+    benchmark_batched_lookups()
+    benchmark_range_queries()
+    benchmark_posting_encodings()
+    benchmark_facet_algebra()
+    benchmark_snapshot_startup()
+    benchmark_concurrent_throughput()
+    benchmark_fuzzy_search()
+    benchmark_trie_memory()
+    benchmark_frozen_tries()
+    benchmark_substring_search()
+    benchmark_bulk_trie_load()
+    benchmark_trie_stats()
+    benchmark_spelling_index()
+
+
+if __name__ == "__main__":
+    run_all_benchmarks()
@@ -38,6 +38,15 @@ class VideoContentGraph:
             'genre': set(),
             'keyword': set()
         }
+        
+        # Statistics maintained as the graph changes so get_graph_stats is cheap
+        self.edge_count = 0
+        self.max_degree = 0
+        self._degree_counts = {}  # degree -> number of nodes, for max_degree after removals
+        # Components are tracked with union-find as nodes and edges are added;
+        # removals can split one, so they leave the count to be recomputed
+        self._component_count = 0
+        self._parent = {}
 
     def add_node(self, node_id, node_type, data=None):
         """Add a node to the graph"""
@@ -46,15 +55,76 @@ class VideoContentGraph:
             self.nodes[node_id] = node
             self.node_types[node_type].add(node_id)
             self.adjacency_list[node_id] = set()
+            if self._component_count is not None:
+                self._parent[node_id] = node_id
+                self._component_count += 1
+
+    def remove_node(self, node_id):
+        """Remove a node and every edge touching it"""
+        if node_id not in self.nodes:
+            return False
+        for neighbor in list(self.adjacency_list[node_id]):
+            self.remove_edge(node_id, neighbor)
+        node = self.nodes.pop(node_id)
+        self.node_types[node.node_type].discard(node_id)
+        del self.adjacency_list[node_id]
+        self._invalidate_components()
+        return True
+
+    def _record_degree(self, old_degree, new_degree):
+        """Update the degree histogram and max_degree after a node's degree changes"""
+        counts = self._degree_counts
+        if old_degree:
+            counts[old_degree] -= 1
+            if not counts[old_degree]:
+                del counts[old_degree]
+        if new_degree:
+            counts[new_degree] = counts.get(new_degree, 0) + 1
+        
+        if new_degree > self.max_degree:
+            self.max_degree = new_degree
+        elif old_degree == self.max_degree and old_degree not in counts:
+            self.max_degree = max(counts) if counts else 0
+
+    def _find(self, node_id):
+        """Union-find root of a node's component, compressing the path to it"""
+        parent = self._parent
+        root = node_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node_id] != root:
+            parent[node_id], node_id = root, parent[node_id]
+        return root
+
+    def _union(self, node1_id, node2_id):
+        """Merge the components of two newly connected nodes"""
+        if self._component_count is None:
+            return
+        root1, root2 = self._find(node1_id), self._find(node2_id)
+        if root1 != root2:
+            self._parent[root1] = root2
+            self._component_count -= 1
+
+    def _invalidate_components(self):
+        """Drop component tracking until the count is next asked for"""
+        self._component_count = None
+        self._parent = {}
 
     def add_edge(self, node1_id, node2_id, weight=1.0):
         """Add an edge between two nodes with optional weight"""
         if node1_id in self.nodes and node2_id in self.nodes:
+            edge_key = tuple(sorted([node1_id, node2_id]))
+            if edge_key not in self.weighted_edges:
+                self.edge_count += 1
+                self._union(node1_id, node2_id)
+                for node_id in edge_key:
+                    degree = len(self.adjacency_list[node_id])
+                    self._record_degree(degree, degree + 1)
+            
             self.adjacency_list[node1_id].add(node2_id)
             self.adjacency_list[node2_id].add(node1_id)
             
             # Store edge weights
-            edge_key = tuple(sorted([node1_id, node2_id]))
             self.weighted_edges[edge_key] = weight
             
             # Update node connections
@@ -63,46 +133,110 @@ class VideoContentGraph:
             self.nodes[node1_id].weight_connections[node2_id] = weight
             self.nodes[node2_id].weight_connections[node1_id] = weight
 
+    def remove_edge(self, node1_id, node2_id):
+        """Remove the edge between two nodes if present"""
+        edge_key = tuple(sorted([node1_id, node2_id]))
+        if edge_key not in self.weighted_edges:
+            return False
+        del self.weighted_edges[edge_key]
+        self.edge_count -= 1
+        self._invalidate_components()
+        for node_id in edge_key:
+            degree = len(self.adjacency_list[node_id])
+            self._record_degree(degree, degree - 1)
+        
+        self.adjacency_list[node1_id].discard(node2_id)
+        self.adjacency_list[node2_id].discard(node1_id)
+        self.nodes[node1_id].connections.discard(node2_id)
+        self.nodes[node2_id].connections.discard(node1_id)
+        self.nodes[node1_id].weight_connections.pop(node2_id, None)
+        self.nodes[node2_id].weight_connections.pop(node1_id, None)
+        return True
+
     def get_edge_weight(self, node1_id, node2_id):
         """Get weight of edge between two nodes"""
         edge_key = tuple(sorted([node1_id, node2_id]))
         return self.weighted_edges.get(edge_key, 0.0)
 
-    def add_video_to_graph(self, video):
-        """Add a video and all its relationships to the graph"""
-        video_id = f"video_{video.video_id}"
+    @staticmethod
+    def _video_links(video):
+        """Map each attribute node a video links to onto (node_type, name, weight)"""
+        links = {}
         
-        # Add video node
-        self.add_node(video_id, 'video', {
-            'title': video.title,
-            'year': video.year,
-            'rating': video.rating,
-            'description': video.description
-        })
-        
-        # Add and connect actors
+        # Actors
         for actor in video.actors:
-            actor_id = f"actor_{actor.lower().replace(' ', '_')}"
-            self.add_node(actor_id, 'actor', {'name': actor})
-            self.add_edge(video_id, actor_id, weight=1.0)
+            links[f"actor_{actor.lower().replace(' ', '_')}"] = ('actor', actor, 1.0)
         
-        # Add and connect directors
+        # Directors
         for director in video.directors:
-            director_id = f"director_{director.lower().replace(' ', '_')}"
-            self.add_node(director_id, 'director', {'name': director})
-            self.add_edge(video_id, director_id, weight=1.5)  # Higher weight for directors
+            links[f"director_{director.lower().replace(' ', '_')}"] = ('director', director, 1.5)  # Higher weight for directors
         
-        # Add and connect genres
+        # Genres
         for genre in video.genre:
-            genre_id = f"genre_{genre.lower().replace(' ', '_')}"
-            self.add_node(genre_id, 'genre', {'name': genre})
-            self.add_edge(video_id, genre_id, weight=1.2)
+            links[f"genre_{genre.lower().replace(' ', '_')}"] = ('genre', genre, 1.2)
         
-        # Add and connect keywords
+        # Keywords
         for keyword in video.keywords:
-            keyword_id = f"keyword_{keyword.lower().replace(' ', '_')}"
-            self.add_node(keyword_id, 'keyword', {'name': keyword})
-            self.add_edge(video_id, keyword_id, weight=0.8)
+            links[f"keyword_{keyword.lower().replace(' ', '_')}"] = ('keyword', keyword, 0.8)
+        
+        return links
+
+    @staticmethod
+    def _video_data(video):
+        """Data stored on a video node"""
+        return {
+            'title': video.title,
+            'year': video.year,
+            'rating': video.rating,
+            'description': video.description
+        }
+
+    def _link(self, video_node_id, node_id, node_type, name, weight):
+        """Connect a video node to an attribute node, creating it if needed"""
+        self.add_node(node_id, node_type, {'name': name})
+        self.add_edge(video_node_id, node_id, weight=weight)
+
+    def _unlink(self, video_node_id, node_id):
+        """Disconnect a video from an attribute node, dropping the node if orphaned"""
+        self.remove_edge(video_node_id, node_id)
+        if node_id in self.nodes and not self.adjacency_list[node_id]:
+            self.remove_node(node_id)
+
+    def add_video_to_graph(self, video):
+        """Add a video and all its relationships to the graph"""
+        video_id = f"video_{video.video_id}"
+        
+        # Add video node
+        self.add_node(video_id, 'video', self._video_data(video))
+        
+        # Add and connect actors, directors, genres and keywords
+        for node_id, (node_type, name, weight) in self._video_links(video).items():
+            self._link(video_id, node_id, node_type, name, weight)
+
+    def remove_video_from_graph(self, video):
+        """Remove a video node, its edges and any attribute nodes left unconnected"""
+        video_id = f"video_{video.video_id}"
+        if video_id not in self.nodes:
+            return False
+        for node_id in list(self.adjacency_list[video_id]):
+            self._unlink(video_id, node_id)
+        return self.remove_node(video_id)
+
+    def update_video_in_graph(self, old_video, new_video):
+        """Rewire only the edges that differ between two versions of a video"""
+        video_id = f"video_{new_video.video_id}"
+        if video_id not in self.nodes:
+            self.add_video_to_graph(new_video)
+            return
+        self.nodes[video_id].data = self._video_data(new_video)
+        
+        old_links = self._video_links(old_video)
+        new_links = self._video_links(new_video)
+        for node_id in old_links.keys() - new_links.keys():
+            self._unlink(video_id, node_id)
+        for node_id in new_links.keys() - old_links.keys():
+            node_type, name, weight = new_links[node_id]
+            self._link(video_id, node_id, node_type, name, weight)
 
     def bfs(self, start_node, max_depth=3):
         """Breadth-first search with depth limitation"""
@@ -309,15 +443,13 @@ class VideoContentGraph:
     def get_graph_stats(self):
         """Get comprehensive graph statistics"""
         total_nodes = len(self.nodes)
-        total_edges = sum(len(neighbors) for neighbors in self.adjacency_list.values()) // 2
+        total_edges = self.edge_count
         
         # Count nodes by type
         type_counts = {node_type: len(nodes) for node_type, nodes in self.node_types.items()}
         
-        # Calculate average degree
-        degrees = [len(self.adjacency_list[node]) for node in self.nodes]
-        avg_degree = sum(degrees) / len(degrees) if degrees else 0
-        max_degree = max(degrees) if degrees else 0
+        # Every edge contributes to the degree of both endpoints
+        avg_degree = 2 * total_edges / total_nodes if total_nodes else 0
         
         # Calculate density
         max_possible_edges = total_nodes * (total_nodes - 1) // 2
@@ -328,27 +460,34 @@ class VideoContentGraph:
             'total_edges': total_edges,
             'node_type_counts': type_counts,
             'average_degree': avg_degree,
-            'max_degree': max_degree,
+            'max_degree': self.max_degree,
             'graph_density': density,
-            'connected_components': self._count_connected_components()
+            'connected_components': self._get_component_count()
         }
 
+    def _get_component_count(self):
+        """Connected component count, recomputed only after a removal"""
+        if self._component_count is None:
+            self._component_count = self._count_connected_components()
+        return self._component_count
+
     def _count_connected_components(self):
-        """Count the number of connected components in the graph"""
-        visited = set()
+        """Count the connected components, restarting union-find tracking from them"""
+        parent = {}
         components = 0
         
         for node in self.nodes:
-            if node not in visited:
-                # Start BFS from this node
+            if node not in parent:
+                # Start BFS from this node, which becomes its component's root
                 queue = deque([node])
                 while queue:
                     current = queue.popleft()
-                    if current not in visited:
-                        visited.add(current)
+                    if current not in parent:
+                        parent[current] = node
                         queue.extend(self.adjacency_list[current])
                 components += 1
         
+        self._parent = parent
         return components
 
     def export_graph_data(self):
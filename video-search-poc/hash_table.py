@@ -4,8 +4,62 @@ Enhanced Hash Table implementation for Video Search Platform
 Supports video metadata storage, actor indexing, genre indexing, and keyword indexing
 """
 
+from array import array
+from contextlib import nullcontext
+import threading
+import time
+from posting_list import POSTING_TYPES, BitmapPostingList, NGramIndex, RangeIndex
+
+# Slot markers for OpenAddressingHashTable
+_EMPTY = object()
+_DELETED = object()
+
+# Key-to-bucket hash functions supported by HashTable
+HASH_MODES = ('builtin', 'polynomial')
+
+# Locks guarding posting list updates in a concurrent VideoMetadataStore
+POSTING_LOCK_STRIPES = 64
+
+
+def _reverse_increment(value, bits):
+    """Add one to value as if its low `bits` bits were written in reverse
+
+    Scan cursors advance this way so that when a table doubles (one more
+    high bit) or halves, slots already visited map onto slots already
+    visited. Returns 0 once every combination has been produced.
+    """
+    bit = 1 << bits >> 1
+    while bit:
+        if not value & bit:
+            return value | bit
+        value ^= bit
+        bit >>= 1
+    return 0
+
+
+def _mix_hash(hash_value):
+    """Scramble a hash so its low bits make good OpenAddressingHashTable slots
+
+    Small ints hash to themselves, so sequential video IDs would otherwise
+    fill one contiguous probe run. This is the splitmix64 finalizer: its
+    xor-shifts and odd multipliers are a bijection on 64-bit values, so
+    mixed hashes compare equal exactly when the originals do. Returned as
+    a signed 64-bit value to fit the hashes array.
+    """
+    mixed = hash_value & 0xFFFFFFFFFFFFFFFF
+    mixed ^= mixed >> 30
+    mixed = (mixed * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    mixed ^= mixed >> 27
+    mixed = (mixed * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    mixed ^= mixed >> 31
+    return mixed - (1 << 64) if mixed >> 63 else mixed
+
+
 class Video:
     """Represents a video with comprehensive metadata"""
+    __slots__ = ('video_id', 'title', 'year', 'genre', 'actors', 'directors',
+                 'keywords', 'rating', 'description')
+    
     def __init__(self, video_id, title, year, genre, actors, directors, keywords, rating=0.0, description=""):
         self.video_id = video_id
         self.title = title
@@ -35,170 +89,1099 @@ class Video:
         }
 
 
+class _StringPool:
+    """Assigns a stable integer ID to each distinct string"""
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def intern(self, string):
+        """Return the ID for string, adding it to the pool if needed"""
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(string)
+            self.ids[string] = string_id
+        return string_id
+
+
+class _StringListColumn:
+    """Column of string lists stored as interned-string IDs in a flat array"""
+    def __init__(self, pool):
+        self.pool = pool
+        self.offsets = array('i', [0])  # Row i spans values[offsets[i]:offsets[i + 1]]
+        self.values = array('i')
+
+    def append(self, strings):
+        """Append one row of strings"""
+        for string in strings:
+            self.values.append(self.pool.intern(string))
+        self.offsets.append(len(self.values))
+
+    def get(self, row):
+        """Materialize the string list stored at row"""
+        strings = self.pool.strings
+        return [strings[i] for i in self.values[self.offsets[row]:self.offsets[row + 1]]]
+
+
+class VideoColumnStore:
+    """Columnar video storage with lazily materialized Video objects
+
+    Numeric fields live in typed arrays and the genre, actor, director and
+    keyword lists are stored as IDs into a shared string pool, so repeated
+    names cost one reference each. Rows are append-only; Video objects are
+    only built when a row is read.
+    """
+    def __init__(self):
+        self.video_ids = array('q')
+        self.years = array('i')
+        self.ratings = array('d')
+        self.titles = []
+        self.descriptions = []
+        self.pool = _StringPool()
+        self.genres = _StringListColumn(self.pool)
+        self.actors = _StringListColumn(self.pool)
+        self.directors = _StringListColumn(self.pool)
+        self.keywords = _StringListColumn(self.pool)
+
+    def append(self, video):
+        """Store a video as a new row and return its row number"""
+        self.video_ids.append(video.video_id)
+        self.years.append(video.year)
+        self.ratings.append(video.rating)
+        self.titles.append(video.title)
+        self.descriptions.append(video.description)
+        self.genres.append(video.genre)
+        self.actors.append(video.actors)
+        self.directors.append(video.directors)
+        self.keywords.append(video.keywords)
+        return len(self.video_ids) - 1
+
+    def get(self, row):
+        """Materialize the Video stored at row"""
+        return Video(
+            self.video_ids[row],
+            self.titles[row],
+            self.years[row],
+            self.genres.get(row),
+            self.actors.get(row),
+            self.directors.get(row),
+            self.keywords.get(row),
+            self.ratings[row],
+            self.descriptions[row]
+        )
+
+    def __len__(self):
+        return len(self.video_ids)
+
+
 class HashTable:
-    """Enhanced Hash Table with collision handling using chaining"""
-    def __init__(self, size=1000):
+    """Enhanced Hash Table with collision handling using chaining
+
+    The table grows (and optionally shrinks) based on its load factor.
+    Resizing is incremental: a new bucket array is allocated and the old
+    buckets are migrated a few at a time on subsequent operations, so no
+    single insert pays for a full-table rehash. Buckets are created lazily
+    (None means empty) so allocating a large table stays cheap.
+
+    hash_mode selects how keys map to buckets: 'builtin' uses Python's
+    hash(), which strings compute once and cache on the object, while
+    'polynomial' is the original per-character string hash.
+
+    Bucket usage and chain lengths are tracked as items move, so get_stats
+    is O(number of distinct chain lengths) rather than a walk of the table.
+    """
+    def __init__(self, size=1000, max_load_factor=0.75, min_load_factor=None, rehash_step=4,
+                 hash_mode='builtin'):
+        if hash_mode not in HASH_MODES:
+            raise ValueError(f"Unknown hash mode: {hash_mode}")
+        self.hash_mode = hash_mode
         self.size = size
-        self.table = [[] for _ in range(size)]
+        self.table = [None] * size
         self.count = 0
+        self.initial_size = size
+        self.max_load_factor = max_load_factor  # None disables growth
+        self.min_load_factor = min_load_factor  # None disables shrinking
+        self.rehash_step = rehash_step          # Old buckets migrated per operation
+        self.resize_count = 0
+        
+        # Incremental statistics over every non-empty bucket (old and new)
+        self.used_buckets = 0
+        self.max_bucket_size = 0
+        self._chain_counts = {}  # chain length -> number of buckets
+        
+        # Incremental rehash state: buckets of the previous table that have
+        # not been migrated yet live at old_table[rehash_index:]
+        self._old_table = None
+        self._old_size = 0
+        self._rehash_index = 0
 
-    def _hash(self, key):
-        """Improved hash function for better distribution"""
-        if isinstance(key, str):
+    def _hash(self, key, size=None):
+        """Map a key to a bucket index using the configured hash mode"""
+        if size is None:
+            size = self.size
+        if self.hash_mode == 'polynomial' and isinstance(key, str):
             hash_value = 0
             for char in key:
-                hash_value = (hash_value * 31 + ord(char)) % self.size
+                hash_value = (hash_value * 31 + ord(char)) % size
             return hash_value
-        return hash(key) % self.size
+        return hash(key) % size
+
+    def _record_chain_length(self, old_length, new_length, item_delta=0):
+        """Update the chain statistics after a bucket changes length"""
+        self.count += item_delta
+        counts = self._chain_counts
+        if old_length:
+            counts[old_length] -= 1
+            if not counts[old_length]:
+                del counts[old_length]
+        else:
+            self.used_buckets += 1
+        if new_length:
+            counts[new_length] = counts.get(new_length, 0) + 1
+        else:
+            self.used_buckets -= 1
+        
+        if new_length > self.max_bucket_size:
+            self.max_bucket_size = new_length
+        elif old_length == self.max_bucket_size and old_length not in counts:
+            self.max_bucket_size = max(counts) if counts else 0
+
+    def _find_old_bucket(self, key):
+        """Return the unmigrated old bucket that may hold key, or None"""
+        old_table = self._old_table
+        if old_table is None:
+            return None
+        old_index = self._hash(key, len(old_table))
+        if old_index < self._rehash_index:
+            return None
+        return old_table[old_index]
+
+    def _start_resize(self, new_size):
+        """Allocate a new bucket array and begin migrating into it"""
+        if self._old_table is not None:
+            # A resize is already underway; finish it before starting another
+            self._rehash_all()
+        self._old_table = self.table
+        self._old_size = self.size
+        self._rehash_index = 0
+        self.size = new_size
+        self.table = [None] * new_size
+        self.resize_count += 1
+
+    def _rehash_steps(self, steps):
+        """Migrate up to `steps` old buckets into the current table"""
+        if self._old_table is None:
+            return
+        while steps > 0 and self._rehash_index < self._old_size:
+            self._migrate_bucket(self._rehash_index)
+            steps -= 1
+        if self._rehash_index >= self._old_size:
+            self._finish_rehash()
+
+    def _migrate_bucket(self, old_index):
+        """Move one old bucket into the current table and advance the cursor
+
+        Entries are copied before the old slot is cleared, and the old chain
+        itself is never mutated, so a lookup sees every key in at least one
+        of the two tables.
+        """
+        bucket = self._old_table[old_index]
+        if bucket:
+            self._record_chain_length(len(bucket), 0)
+            for key, value in bucket:
+                index = self._hash(key)
+                if self.table[index] is None:
+                    self.table[index] = [(key, value)]
+                    self._record_chain_length(0, 1)
+                else:
+                    self.table[index].append((key, value))
+                    self._record_chain_length(len(self.table[index]) - 1, len(self.table[index]))
+        self._old_table[old_index] = None
+        self._rehash_index += 1
+
+    def _finish_rehash(self):
+        """Drop the fully migrated old table"""
+        self._old_table = None
+        self._old_size = 0
+        self._rehash_index = 0
+
+    def _rehash_all(self):
+        """Complete any in-progress migration immediately"""
+        if self._old_table is not None:
+            self._rehash_steps(self._old_size)
+
+    def _check_grow(self):
+        """Start growing the table if the load factor is too high"""
+        if self.max_load_factor is not None and self.count > self.size * self.max_load_factor:
+            self._start_resize(self.size * 2)
+
+    def _check_shrink(self):
+        """Start shrinking the table if the load factor is too low"""
+        if (self.min_load_factor is not None and self.size > self.initial_size
+                and self.count < self.size * self.min_load_factor):
+            self._start_resize(max(self.initial_size, self.size // 2))
 
     def insert(self, key, value):
         """Insert key-value pair with update capability"""
+        self._rehash_steps(self.rehash_step)
+        if self._insert_entry(key, value):
+            self._check_grow()
+
+    def _insert_entry(self, key, value):
+        """Insert or update key in place; returns True if the key is new"""
+        old_bucket = self._find_old_bucket(key)
+        if old_bucket:
+            for i, (k, v) in enumerate(old_bucket):
+                if k == key:
+                    old_bucket[i] = (key, value)
+                    return False
+        
         index = self._hash(key)
-        for i, (k, v) in enumerate(self.table[index]):
-            if k == key:
-                self.table[index][i] = (key, value)
-                return
-        self.table[index].append((key, value))
-        self.count += 1
+        bucket = self.table[index]
+        if bucket is None:
+            self.table[index] = [(key, value)]
+            self._record_chain_length(0, 1, 1)
+        else:
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    bucket[i] = (key, value)
+                    return False
+            bucket.append((key, value))
+            self._record_chain_length(len(bucket) - 1, len(bucket), 1)
+        return True
 
     def search(self, key):
         """Search for value by key"""
-        index = self._hash(key)
-        for k, v in self.table[index]:
-            if k == key:
-                return v
+        old_bucket = self._find_old_bucket(key)
+        if old_bucket:
+            for k, v in old_bucket:
+                if k == key:
+                    return v
+        
+        table = self.table
+        bucket = table[self._hash(key, len(table))]
+        if bucket:
+            for k, v in bucket:
+                if k == key:
+                    return v
         return None
 
     def delete(self, key):
         """Delete key-value pair"""
-        index = self._hash(key)
-        for i, (k, _) in enumerate(self.table[index]):
-            if k == key:
-                del self.table[index][i]
-                self.count -= 1
-                return True
+        self._rehash_steps(self.rehash_step)
+        if self._delete_entry(key):
+            self._check_shrink()
+            return True
         return False
 
+    def _delete_entry(self, key):
+        """Remove key if present; returns True if it was found"""
+        slots = [(self.table, self._hash(key))]
+        old_table = self._old_table
+        if old_table is not None:
+            old_index = self._hash(key, len(old_table))
+            if old_index >= self._rehash_index:
+                slots.append((old_table, old_index))
+        for table, index in slots:
+            bucket = table[index]
+            if not bucket:
+                continue
+            for i, (k, _) in enumerate(bucket):
+                if k == key:
+                    # Replace the chain rather than deleting from it, so a
+                    # reader iterating the old chain never skips an entry
+                    table[index] = bucket[:i] + bucket[i + 1:] or None
+                    self._record_chain_length(len(bucket), len(bucket) - 1, -1)
+                    return True
+        return False
+
+    def search_many(self, keys):
+        """Search for several keys in one pass; returns values aligned with keys
+
+        Keys are grouped by bucket so each chain is scanned once no matter
+        how many of the requested keys hash to it.
+        """
+        if self._old_table is not None:
+            # Keys may still sit in unmigrated buckets; use the two-table path
+            return [self.search(key) for key in keys]
+        
+        results = [None] * len(keys)
+        positions_by_bucket = {}
+        table = self.table
+        size = len(table)
+        builtin = self.hash_mode == 'builtin'
+        for position, key in enumerate(keys):
+            index = hash(key) % size if builtin else self._hash(key, size)
+            positions = positions_by_bucket.get(index)
+            if positions is None:
+                positions_by_bucket[index] = [position]
+            else:
+                positions.append(position)
+        
+        for index, positions in positions_by_bucket.items():
+            bucket = table[index]
+            if not bucket:
+                continue
+            if len(bucket) == 1:
+                k, v = bucket[0]
+                for position in positions:
+                    if keys[position] == k:
+                        results[position] = v
+                continue
+            entries = dict(bucket)
+            for position in positions:
+                results[position] = entries.get(keys[position])
+        return results
+
+    def _iter_buckets(self):
+        """Yield every bucket that may hold items, including unmigrated ones"""
+        if self._old_table is not None:
+            for i in range(self._rehash_index, self._old_size):
+                yield self._old_table[i]
+        for bucket in self.table:
+            yield bucket
+
+    def scan(self, cursor=0, count=10):
+        """Return (next_cursor, items) for one step of a cursor-based pass
+
+        Start with cursor 0 and pass back the returned cursor until it is 0
+        again; each step returns about `count` (key, value) pairs. Table
+        sizes are always initial_size * 2**k, so a bucket index splits into a
+        part that survives resizing (index % initial_size) and k bits that
+        gain or lose a high bit. Stepping those bits in reverse binary order
+        means every key present for the whole pass is returned at least once
+        even if inserts resize the table between steps (a key may repeat).
+        """
+        base = self.initial_size
+        tables = [self.table] if self._old_table is None else [self.table, self._old_table]
+        tables.sort(key=len)
+        bits = (len(tables[0]) // base).bit_length() - 1
+        low, high = cursor % base, (cursor // base) & ((1 << bits) - 1)
+        
+        items = []
+        while True:
+            # Visit the bucket in the smaller table and every bucket of the
+            # larger one that folds onto it
+            for table in tables:
+                for spread in range(len(table) // len(tables[0])):
+                    bucket = table[low + base * (high + (spread << bits))]
+                    if bucket:
+                        items.extend(bucket)
+            low += 1
+            if low == base:
+                low = 0
+                high = _reverse_increment(high, bits)
+                if not high:
+                    return 0, items
+            if len(items) >= count:
+                return low + base * high, items
+
+    def iter_items(self, batch_size=256):
+        """Yield every (key, value) pair without building a full list"""
+        cursor = 0
+        while True:
+            cursor, items = self.scan(cursor, batch_size)
+            yield from items
+            if not cursor:
+                return
+
+    def iter_values(self, batch_size=256):
+        """Yield every value without building a full list"""
+        for _, value in self.iter_items(batch_size):
+            yield value
+
+    def get_all_items(self):
+        """Get all (key, value) pairs stored in the hash table"""
+        items = []
+        for bucket in self._iter_buckets():
+            if bucket:
+                items.extend(bucket)
+        return items
+
     def get_all_values(self):
         """Get all values stored in the hash table"""
         values = []
-        for bucket in self.table:
+        for bucket in self._iter_buckets():
+            if not bucket:
+                continue
             for _, value in bucket:
                 values.append(value)
         return values
 
     def get_stats(self):
         """Get hash table statistics"""
-        used_buckets = sum(1 for bucket in self.table if bucket)
-        max_bucket_size = max(len(bucket) for bucket in self.table)
-        avg_bucket_size = self.count / used_buckets if used_buckets > 0 else 0
+        rehashing = self._old_table is not None
+        total_buckets = self.size + (self._old_size - self._rehash_index if rehashing else 0)
+        avg_bucket_size = self.count / self.used_buckets if self.used_buckets > 0 else 0
+        
+        # Chain length -> number of buckets, to judge hash distribution
+        histogram = {0: total_buckets - self.used_buckets}
+        histogram.update(self._chain_counts)
+        
+        return {
+            'total_items': self.count,
+            'table_size': self.size,
+            'used_buckets': self.used_buckets,
+            'load_factor': self.count / self.size,
+            'max_bucket_size': self.max_bucket_size,
+            'avg_bucket_size': avg_bucket_size,
+            'chain_length_histogram': dict(sorted(histogram.items())),
+            'hash_mode': self.hash_mode,
+            'resize_count': self.resize_count,
+            'rehash_in_progress': rehashing,
+            'rehash_progress': self._rehash_index / self._old_size if rehashing else 1.0
+        }
+
+
+class ConcurrentHashTable(HashTable):
+    """Thread-safe chained hash table using lock striping
+
+    Bucket i is guarded by lock i % stripes. The table size is kept a
+    multiple of the stripe count, so a key maps to the same stripe before
+    and after a resize, and migrating an old bucket only touches new buckets
+    guarded by the same lock. Writers to different stripes never block
+    each other.
+
+    Structural changes (starting a resize, migrating buckets) are serialized
+    by one lock and bump a version counter around the change. Lookups take
+    no lock: they read the version, search, and only fall back to locking
+    the key's stripe if a structural change overlapped the search.
+    """
+    def __init__(self, size=1000, max_load_factor=0.75, min_load_factor=None, rehash_step=4,
+                 hash_mode='builtin', stripes=16):
+        size = -(-size // stripes) * stripes
+        super().__init__(size, max_load_factor, min_load_factor, rehash_step, hash_mode)
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._structure_lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._version = 0  # Odd while a structural change is in progress
+
+    def _stripe_lock(self, key):
+        """The lock guarding every bucket key can occupy"""
+        return self._locks[self._hash(key, self.stripes)]
+
+    def _record_chain_length(self, old_length, new_length, item_delta=0):
+        with self._stats_lock:
+            super()._record_chain_length(old_length, new_length, item_delta)
+
+    def _start_resize(self, new_size):
+        with self._structure_lock:
+            self._rehash_all()
+            for lock in self._locks:
+                lock.acquire()
+            try:
+                self._version += 1
+                super()._start_resize(new_size)
+                self._version += 1
+            finally:
+                for lock in self._locks:
+                    lock.release()
+
+    def _rehash_steps(self, steps):
+        if self._old_table is None:
+            return
+        with self._structure_lock:
+            while steps > 0 and self._old_table is not None and self._rehash_index < self._old_size:
+                old_index = self._rehash_index
+                with self._locks[old_index % self.stripes]:
+                    self._version += 1
+                    self._migrate_bucket(old_index)
+                    self._version += 1
+                steps -= 1
+            if self._old_table is not None and self._rehash_index >= self._old_size:
+                self._finish_rehash()
+
+    def _check_grow(self):
+        with self._structure_lock:
+            super()._check_grow()
+
+    def _check_shrink(self):
+        with self._structure_lock:
+            super()._check_shrink()
+
+    def insert(self, key, value):
+        """Insert key-value pair with update capability"""
+        self._rehash_steps(self.rehash_step)
+        with self._stripe_lock(key):
+            inserted = self._insert_entry(key, value)
+        if inserted:
+            self._check_grow()
+
+    def search(self, key):
+        """Search for value by key without locking unless a resize interferes"""
+        version = self._version
+        if not version & 1:
+            value = super().search(key)
+            if self._version == version:
+                return value
+        with self._stripe_lock(key):
+            return super().search(key)
+
+    def delete(self, key):
+        """Delete key-value pair"""
+        self._rehash_steps(self.rehash_step)
+        with self._stripe_lock(key):
+            deleted = self._delete_entry(key)
+        if deleted:
+            self._check_shrink()
+        return deleted
+
+    def search_many(self, keys):
+        """Search for several keys; returns values aligned with keys"""
+        version = self._version
+        if not version & 1:
+            results = super().search_many(keys)
+            if self._version == version:
+                return results
+        return [self.search(key) for key in keys]
+
+    def scan(self, cursor=0, count=10):
+        with self._structure_lock:
+            return super().scan(cursor, count)
+
+    def get_all_items(self):
+        with self._structure_lock:
+            return super().get_all_items()
+
+    def get_all_values(self):
+        with self._structure_lock:
+            return super().get_all_values()
+
+    def get_stats(self):
+        with self._structure_lock, self._stats_lock:
+            stats = super().get_stats()
+        stats['lock_stripes'] = self.stripes
+        return stats
+
+
+class OpenAddressingHashTable:
+    """Array-backed hash table using linear probing with tombstones
+
+    Keys, values and full (mixed) hash codes live in flat parallel arrays
+    instead of a list per bucket plus a tuple per entry, which keeps the
+    per-entry overhead to three slots. Offers the same API as HashTable. Probe length
+    statistics are maintained on insert and delete so get_stats is cheap.
+    """
+    def __init__(self, size=1000, max_load_factor=0.7):
+        capacity = 8
+        while capacity < size:
+            capacity *= 2
+        self.max_load_factor = max_load_factor
+        self.count = 0
+        self.tombstones = 0
+        self.resize_count = 0
+        self._allocate(capacity)
+
+    def _probe_length(self, index):
+        """Number of slots probed to reach the entry stored at index"""
+        return ((index - self.hashes[index]) & self._mask) + 1
+
+    def _record_probe_length(self, probe_length, delta):
+        """Add (delta=1) or remove (delta=-1) an entry's probe length from the statistics"""
+        counts = self._probe_counts
+        counts[probe_length] = counts.get(probe_length, 0) + delta
+        self.total_probes += delta * probe_length
+        if not counts[probe_length]:
+            del counts[probe_length]
+            if probe_length == self.max_probe_length:
+                self.max_probe_length = max(counts) if counts else 0
+        elif probe_length > self.max_probe_length:
+            self.max_probe_length = probe_length
+
+    def _allocate(self, capacity):
+        """Create empty slot arrays of the given power-of-two capacity"""
+        self.size = capacity
+        self._mask = capacity - 1
+        self.keys = [_EMPTY] * capacity
+        self.values = [None] * capacity
+        self.hashes = array('q', bytes(8 * capacity))
+        self.total_probes = 0
+        self.max_probe_length = 0
+        self._probe_counts = {}  # probe length -> number of entries
+
+    def _find_slot(self, key, hash_value):
+        """Return (index of key or -1, first free slot on the probe path)"""
+        keys = self.keys
+        hashes = self.hashes
+        index = hash_value & self._mask
+        free_slot = -1
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                return -1, (index if free_slot < 0 else free_slot)
+            if k is _DELETED:
+                if free_slot < 0:
+                    free_slot = index
+            elif hashes[index] == hash_value and (k is key or k == key):
+                return index, free_slot
+            index = (index + 1) & self._mask
+
+    def _resize(self, capacity):
+        """Rebuild the slot arrays, dropping tombstones; uses stored hashes"""
+        old_keys, old_values, old_hashes = self.keys, self.values, self.hashes
+        self._allocate(capacity)
+        self.tombstones = 0
+        keys, values, hashes, mask = self.keys, self.values, self.hashes, self._mask
+        for i, k in enumerate(old_keys):
+            if k is _EMPTY or k is _DELETED:
+                continue
+            hash_value = old_hashes[i]
+            index = hash_value & mask
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = k
+            values[index] = old_values[i]
+            hashes[index] = hash_value
+            self._record_probe_length(self._probe_length(index), 1)
+        self.resize_count += 1
+
+    def insert(self, key, value):
+        """Insert key-value pair with update capability"""
+        hash_value = _mix_hash(hash(key))
+        index, free_slot = self._find_slot(key, hash_value)
+        if index >= 0:
+            self.values[index] = value
+            return
+        
+        if self.keys[free_slot] is _DELETED:
+            self.tombstones -= 1
+        elif (self.count + self.tombstones + 1) > self.size * self.max_load_factor:
+            # Double when live items fill the table; if it is mostly
+            # tombstones, rebuild at the same size to purge them instead
+            capacity = self.size
+            if (self.count + 1) > capacity * self.max_load_factor / 2:
+                capacity *= 2
+            self._resize(capacity)
+            _, free_slot = self._find_slot(key, hash_value)
         
+        self.keys[free_slot] = key
+        self.values[free_slot] = value
+        self.hashes[free_slot] = hash_value
+        self._record_probe_length(self._probe_length(free_slot), 1)
+        self.count += 1
+
+    def search(self, key):
+        """Search for value by key"""
+        index, _ = self._find_slot(key, _mix_hash(hash(key)))
+        return self.values[index] if index >= 0 else None
+
+    def delete(self, key):
+        """Delete key-value pair, leaving a tombstone in its slot"""
+        index, _ = self._find_slot(key, _mix_hash(hash(key)))
+        if index < 0:
+            return False
+        self._record_probe_length(self._probe_length(index), -1)
+        self.keys[index] = _DELETED
+        self.values[index] = None
+        self.count -= 1
+        self.tombstones += 1
+        return True
+
+    def search_many(self, keys):
+        """Search for several keys; returns values aligned with keys"""
+        search = self.search
+        return [search(key) for key in keys]
+
+    def scan(self, cursor=0, count=10):
+        """Return (next_cursor, items) for one step of a cursor-based pass
+
+        Same contract as HashTable.scan. The cursor walks home slots
+        (hash & mask) in reverse binary order; for each home slot the probe
+        run after it is searched for entries that hash there, so entries
+        displaced by probing or moved by a resize are still found. Mixed
+        hashes keep probe runs short, so a full pass is O(capacity); a step
+        also ends once it has walked a few slots per requested item.
+        """
+        keys, values, hashes = self.keys, self.values, self.hashes
+        mask = self._mask
+        bits = self.size.bit_length() - 1
+        home = cursor & mask
+        budget = 4 * count  # Slots walked before the step gives up early
+        
+        items = []
+        while True:
+            index = home
+            while keys[index] is not _EMPTY:
+                k = keys[index]
+                if k is not _DELETED and hashes[index] & mask == home:
+                    items.append((k, values[index]))
+                index = (index + 1) & mask
+                budget -= 1
+            budget -= 1
+            home = _reverse_increment(home, bits)
+            if not home:
+                return 0, items
+            if len(items) >= count or budget <= 0:
+                return home, items
+
+    def iter_items(self, batch_size=256):
+        """Yield every (key, value) pair without building a full list"""
+        cursor = 0
+        while True:
+            cursor, items = self.scan(cursor, batch_size)
+            yield from items
+            if not cursor:
+                return
+
+    def iter_values(self, batch_size=256):
+        """Yield every value without building a full list"""
+        for _, value in self.iter_items(batch_size):
+            yield value
+
+    def get_all_items(self):
+        """Get all (key, value) pairs stored in the hash table"""
+        return [(k, self.values[i]) for i, k in enumerate(self.keys)
+                if k is not _EMPTY and k is not _DELETED]
+
+    def get_all_values(self):
+        """Get all values stored in the hash table"""
+        return [self.values[i] for i, k in enumerate(self.keys)
+                if k is not _EMPTY and k is not _DELETED]
+
+    def get_stats(self):
+        """Get hash table statistics"""
         return {
             'total_items': self.count,
             'table_size': self.size,
-            'used_buckets': used_buckets,
+            'used_buckets': self.count,
             'load_factor': self.count / self.size,
-            'max_bucket_size': max_bucket_size,
-            'avg_bucket_size': avg_bucket_size
+            # Every slot holds at most one entry
+            'max_bucket_size': 1 if self.count else 0,
+            'avg_bucket_size': 1.0 if self.count else 0,
+            'resize_count': self.resize_count,
+            'tombstones': self.tombstones,
+            'max_probe_length': self.max_probe_length,
+            'avg_probe_length': self.total_probes / self.count if self.count else 0,
+            'probe_length_histogram': dict(sorted(self._probe_counts.items()))
         }
 
 
+# Hash table implementations selectable in VideoMetadataStore; 'concurrent'
+# also makes the store's own index updates thread-safe
+TABLE_TYPES = {
+    'chained': HashTable,
+    'concurrent': ConcurrentHashTable,
+    'open_addressing': OpenAddressingHashTable
+}
+
+
 class VideoMetadataStore:
     """Comprehensive video metadata storage system using multiple hash tables"""
     
-    def __init__(self):
-        # Primary storage for video objects
-        self.videos = HashTable(1000)
+    # Names of the inverted indexes, e.g. 'actor' -> self.actor_index
+    INDEX_NAMES = ('actor', 'genre', 'director', 'keyword', 'year')
+    
+    # Fields with a trigram index for substring search
+    SUBSTRING_FIELDS = ('title', 'actor', 'director')
+    
+    def __init__(self, table_type='chained', columnar=False, posting_types=None):
+        if table_type not in TABLE_TYPES:
+            raise ValueError(f"Unknown table type: {table_type}")
+        table_class = TABLE_TYPES[table_type]
+        self.table_type = table_type
+        
+        # Posting list encoding per index, e.g. {'keyword': 'compressed'};
+        # low-cardinality facets default to bitmaps for fast set algebra
+        self.posting_types = {name: 'plain' for name in self.INDEX_NAMES}
+        self.posting_types.update(genre='bitmap', year='bitmap')
+        for name, posting_type in (posting_types or {}).items():
+            if name not in self.posting_types:
+                raise ValueError(f"Unknown index: {name}")
+            if posting_type not in POSTING_TYPES:
+                raise ValueError(f"Unknown posting type: {posting_type}")
+            self.posting_types[name] = posting_type
+        
+        # Primary storage for video objects; in columnar mode it maps
+        # video_id -> row number in the column store instead
+        self.videos = table_class(1000)
+        self.column_store = VideoColumnStore() if columnar else None
         
         # Index tables for different search criteria
-        self.actor_index = HashTable(500)      # actor_name -> [video_ids]
-        self.genre_index = HashTable(100)      # genre -> [video_ids]
-        self.director_index = HashTable(300)   # director_name -> [video_ids]
-        self.keyword_index = HashTable(800)    # keyword -> [video_ids]
-        self.year_index = HashTable(200)       # year -> [video_ids]
+        self.actor_index = table_class(500)      # actor_name -> PostingList
+        self.genre_index = table_class(100)      # genre -> PostingList
+        self.director_index = table_class(300)   # director_name -> PostingList
+        self.keyword_index = table_class(800)    # keyword -> PostingList
+        self.year_index = table_class(200)       # year -> PostingList
+        self._indexes = {name: getattr(self, f"{name}_index") for name in self.INDEX_NAMES}
+        self._posting_classes = {name: POSTING_TYPES[posting_type]
+                                 for name, posting_type in self.posting_types.items()}
+        
+        # Ordered indexes for range queries
+        self.year_range_index = RangeIndex()
+        self.rating_range_index = RangeIndex()
+        
+        # Trigram indexes for substring matching, e.g. 'title' -> NGramIndex
+        self.substring_indexes = {field: NGramIndex() for field in self.SUBSTRING_FIELDS}
+        
+        # With concurrent tables, posting list updates are serialized per
+        # index key (striped) and the column store and range indexes share a
+        # lock; readers are never blocked, but may see a video mid-ingest
+        if table_type == 'concurrent':
+            self._posting_locks = [threading.Lock() for _ in range(POSTING_LOCK_STRIPES)]
+            self._shared_lock = threading.Lock()
+        else:
+            self._posting_locks = None
+            self._shared_lock = nullcontext()
         
+    def _add_to_index(self, index_name, key, video_id):
+        """Append a video ID to the posting list stored under key"""
+        if self._posting_locks is not None:
+            lock = self._posting_locks[hash((index_name, key)) % POSTING_LOCK_STRIPES]
+            with lock:
+                self._add_posting(index_name, key, video_id)
+        else:
+            self._add_posting(index_name, key, video_id)
+    
+    def _add_posting(self, index_name, key, video_id):
+        """Create the posting list for key if needed and add the video ID"""
+        index = self._indexes[index_name]
+        postings = index.search(key)
+        if postings is None:
+            postings = self._posting_classes[index_name]()
+            index.insert(key, postings)
+        postings.add(video_id)
+    
+    def _remove_from_index(self, index_name, key, video_id):
+        """Remove a video ID from the posting list stored under key"""
+        if self._posting_locks is not None:
+            lock = self._posting_locks[hash((index_name, key)) % POSTING_LOCK_STRIPES]
+            with lock:
+                self._remove_posting(index_name, key, video_id)
+        else:
+            self._remove_posting(index_name, key, video_id)
+    
+    def _remove_posting(self, index_name, key, video_id):
+        """Discard the video ID and drop the key once its posting list is empty"""
+        index = self._indexes[index_name]
+        postings = index.search(key)
+        if postings is not None and postings.discard(video_id) and not postings:
+            index.delete(key)
+    
+    @staticmethod
+    def _index_keys(video):
+        """Map each inverted index name to the keys a video is filed under"""
+        return {
+            'actor': {actor.lower() for actor in video.actors},
+            'genre': {genre.lower() for genre in video.genre},
+            'director': {director.lower() for director in video.directors},
+            'keyword': {keyword.lower() for keyword in video.keywords},
+            'year': {video.year}
+        }
+    
+    @staticmethod
+    def _substring_texts(video):
+        """Map each substring-indexed field to a video's texts for it"""
+        return {
+            'title': [video.title],
+            'actor': video.actors,
+            'director': video.directors
+        }
+    
+    def _store_video(self, video):
+        """Write a video into primary storage, replacing any earlier version"""
+        if self.column_store is not None:
+            # Rows are append-only, so a replaced row is simply left unreferenced
+            with self._shared_lock:
+                row = self.column_store.append(video)
+            self.videos.insert(video.video_id, row)
+        else:
+            self.videos.insert(video.video_id, video)
+    
     def add_video(self, video):
         """Add a video and update all relevant indexes"""
         if not isinstance(video, Video):
             raise TypeError("Expected Video object")
         
         # Store the video object
-        self.videos.insert(video.video_id, video)
-        
-        # Update actor index
-        for actor in video.actors:
-            actor_lower = actor.lower()
-            video_list = self.actor_index.search(actor_lower) or []
-            if video.video_id not in video_list:
-                video_list.append(video.video_id)
-            self.actor_index.insert(actor_lower, video_list)
-        
-        # Update genre index
-        for genre in video.genre:
-            genre_lower = genre.lower()
-            video_list = self.genre_index.search(genre_lower) or []
-            if video.video_id not in video_list:
-                video_list.append(video.video_id)
-            self.genre_index.insert(genre_lower, video_list)
-        
-        # Update director index
-        for director in video.directors:
-            director_lower = director.lower()
-            video_list = self.director_index.search(director_lower) or []
-            if video.video_id not in video_list:
-                video_list.append(video.video_id)
-            self.director_index.insert(director_lower, video_list)
-        
-        # Update keyword index
-        for keyword in video.keywords:
-            keyword_lower = keyword.lower()
-            video_list = self.keyword_index.search(keyword_lower) or []
-            if video.video_id not in video_list:
-                video_list.append(video.video_id)
-            self.keyword_index.insert(keyword_lower, video_list)
-        
-        # Update year index
-        year_list = self.year_index.search(video.year) or []
-        if video.video_id not in year_list:
-            year_list.append(video.video_id)
-        self.year_index.insert(video.year, year_list)
+        self._store_video(video)
+        
+        # Update the actor, genre, director, keyword and year indexes
+        for index_name, keys in self._index_keys(video).items():
+            for key in keys:
+                self._add_to_index(index_name, key, video.video_id)
+        
+        # Update range indexes
+        with self._shared_lock:
+            self.year_range_index.add(video.year, video.video_id)
+            self.rating_range_index.add(video.rating, video.video_id)
+            for field, texts in self._substring_texts(video).items():
+                self.substring_indexes[field].add(video.video_id, texts)
+    
+    def remove_video(self, video_id):
+        """Remove a video and its postings; returns the removed Video or None"""
+        video = self.get_video(video_id)
+        if video is None:
+            return None
+        
+        for index_name, keys in self._index_keys(video).items():
+            for key in keys:
+                self._remove_from_index(index_name, key, video_id)
+        
+        with self._shared_lock:
+            self.year_range_index.remove(video.year, video_id)
+            self.rating_range_index.remove(video.rating, video_id)
+            for field, texts in self._substring_texts(video).items():
+                self.substring_indexes[field].remove(video_id, texts)
+        
+        self.videos.delete(video_id)
+        return video
+    
+    def update_video(self, video):
+        """Replace a stored video, touching only the index keys that changed
+
+        Returns the previous version, or None if the video was not stored
+        yet, in which case it is added.
+        """
+        if not isinstance(video, Video):
+            raise TypeError("Expected Video object")
+        old_video = self.get_video(video.video_id)
+        if old_video is None:
+            self.add_video(video)
+            return None
+        
+        self._store_video(video)
+        
+        video_id = video.video_id
+        old_keys = self._index_keys(old_video)
+        for index_name, keys in self._index_keys(video).items():
+            for key in old_keys[index_name] - keys:
+                self._remove_from_index(index_name, key, video_id)
+            for key in keys - old_keys[index_name]:
+                self._add_to_index(index_name, key, video_id)
+        
+        with self._shared_lock:
+            if old_video.year != video.year:
+                self.year_range_index.remove(old_video.year, video_id)
+                self.year_range_index.add(video.year, video_id)
+            if old_video.rating != video.rating:
+                self.rating_range_index.remove(old_video.rating, video_id)
+                self.rating_range_index.add(video.rating, video_id)
+            old_texts = self._substring_texts(old_video)
+            for field, texts in self._substring_texts(video).items():
+                self.substring_indexes[field].update(video_id, old_texts[field], texts)
+        return old_video
+    
+    def _materialize(self, stored):
+        """Turn a value from the videos table into a Video"""
+        if self.column_store is not None and stored is not None:
+            return self.column_store.get(stored)
+        return stored
     
     def get_video(self, video_id):
         """Retrieve video by ID"""
-        return self.videos.search(video_id)
+        return self._materialize(self.videos.search(video_id))
+    
+    def get_videos(self, video_ids):
+        """Retrieve several videos in one batched pass, skipping missing IDs"""
+        stored_values = self.videos.search_many(list(video_ids))
+        return [self._materialize(stored) for stored in stored_values if stored is not None]
     
     def search_by_actor(self, actor_name):
         """Find all videos with a specific actor"""
         video_ids = self.actor_index.search(actor_name.lower()) or []
-        return [self.videos.search(vid) for vid in video_ids if self.videos.search(vid)]
+        return self.get_videos(video_ids)
     
     def search_by_genre(self, genre):
         """Find all videos of a specific genre"""
         video_ids = self.genre_index.search(genre.lower()) or []
-        return [self.videos.search(vid) for vid in video_ids if self.videos.search(vid)]
+        return self.get_videos(video_ids)
     
     def search_by_director(self, director_name):
         """Find all videos by a specific director"""
         video_ids = self.director_index.search(director_name.lower()) or []
-        return [self.videos.search(vid) for vid in video_ids if self.videos.search(vid)]
+        return self.get_videos(video_ids)
     
     def search_by_keyword(self, keyword):
         """Find all videos with a specific keyword"""
         video_ids = self.keyword_index.search(keyword.lower()) or []
-        return [self.videos.search(vid) for vid in video_ids if self.videos.search(vid)]
+        return self.get_videos(video_ids)
     
     def search_by_year(self, year):
         """Find all videos from a specific year"""
         video_ids = self.year_index.search(year) or []
-        return [self.videos.search(vid) for vid in video_ids if self.videos.search(vid)]
+        return self.get_videos(video_ids)
+    
+    def search_by_year_range(self, start_year, end_year):
+        """Find the IDs of all videos released between two years (inclusive)"""
+        return self.year_range_index.range(start_year, end_year)
+    
+    def get_year_range_postings(self, start_year, end_year):
+        """Bitmap of the videos released between two years, from the year index"""
+        return self.union_postings('year', self.year_range_index.keys_in_range(start_year, end_year))
+    
+    def search_by_min_rating(self, min_rating):
+        """Find the IDs of all videos rated at least min_rating"""
+        return self.rating_range_index.range(min_rating)
+    
+    def get_substring_postings(self, field, text):
+        """Bitmap of candidate videos whose field may contain text, unverified
+
+        Returns None for an empty text, which matches every video.
+        """
+        video_ids = self.substring_indexes[field].candidates(text)
+        return None if video_ids is None else BitmapPostingList.from_ids(video_ids)
+    
+    def search_by_substring(self, field, text):
+        """Find the videos whose title, actor or director contains text"""
+        text = text.lower()
+        video_ids = self.substring_indexes[field].candidates(text)
+        videos = self.iter_videos() if video_ids is None else self.get_videos(video_ids)
+        return [video for video in videos
+                if any(text in value.lower() for value in self._substring_texts(video)[field])]
+    
+    def get_index_keys(self, index_name):
+        """Get every key of an inverted index, e.g. all lowercased genres"""
+        return [key for key, _ in self._indexes[index_name].get_all_items()]
+    
+    def get_postings(self, index_name, key):
+        """Get the posting list for one index key as a bitmap (empty if missing)"""
+        postings = self._indexes[index_name].search(key)
+        return BitmapPostingList.from_ids(postings or ())
+    
+    def union_postings(self, index_name, keys):
+        """OR together the posting lists of several index keys"""
+        return BitmapPostingList.union(self.get_postings(index_name, key) for key in keys)
+    
+    def intersect_postings(self, index_name, keys):
+        """AND together the posting lists of several index keys"""
+        result = None
+        for key in keys:
+            postings = self.get_postings(index_name, key)
+            result = postings if result is None else result & postings
+        return result if result is not None else BitmapPostingList()
     
     def get_all_videos(self):
         """Get all videos in the system"""
-        return self.videos.get_all_values()
+        return [self._materialize(stored) for stored in self.videos.get_all_values()]
     
-    def get_storage_stats(self):
-        """Get comprehensive storage statistics"""
-        return {
+    def iter_videos(self):
+        """Yield every video, materializing one at a time"""
+        for stored in self.videos.iter_values():
+            yield self._materialize(stored)
+    
+    def scan(self, cursor=0, count=100):
+        """Return (next_cursor, videos) for one page of a cursor-based pass
+
+        Start with cursor 0 and stop when the returned cursor is 0. Videos
+        present for the whole pass are returned at least once even if others
+        are inserted between pages; a video may appear on two pages.
+        """
+        cursor, items = self.videos.scan(cursor, count)
+        return cursor, [self._materialize(stored) for _, stored in items]
+    
+    def get_video_count(self):
+        """Number of videos stored, without materializing them"""
+        return self.videos.count
+    
+    def get_storage_stats(self, include_postings=True):
+        """Get comprehensive storage statistics
+
+        Table statistics are maintained incrementally; posting list statistics
+        walk every posting list, so callers on a hot path can skip them.
+        """
+        stats = {
             'videos': self.videos.get_stats(),
             'actor_index': self.actor_index.get_stats(),
             'genre_index': self.genre_index.get_stats(),
@@ -206,3 +1189,32 @@ class VideoMetadataStore:
             'keyword_index': self.keyword_index.get_stats(),
             'year_index': self.year_index.get_stats()
         }
+        if include_postings:
+            stats['postings'] = {name: self._get_posting_stats(name) for name in self.INDEX_NAMES}
+        return stats
+    
+    def _get_posting_stats(self, index_name, decode_sample=50000):
+        """Size, compression ratio and decode throughput of an index's postings"""
+        posting_lists = self._indexes[index_name].get_all_values()
+        total_postings = sum(len(postings) for postings in posting_lists)
+        encoded_bytes = sum(postings.nbytes() for postings in posting_lists)
+        # Compression is measured against the plain PostingList's 8-byte integers
+        uncompressed_bytes = total_postings * 8
+        
+        # Time decoding the first posting lists up to decode_sample postings
+        decoded = 0
+        start_time = time.perf_counter()
+        for postings in posting_lists:
+            if decoded >= decode_sample:
+                break
+            decoded += len(postings.to_list())
+        elapsed = time.perf_counter() - start_time
+        
+        return {
+            'encoding': self.posting_types[index_name],
+            'total_postings': total_postings,
+            'encoded_bytes': encoded_bytes,
+            'bytes_per_posting': encoded_bytes / total_postings if total_postings else 0,
+            'compression_ratio': uncompressed_bytes / encoded_bytes if encoded_bytes else 0,
+            'decode_postings_per_second': decoded / elapsed if elapsed > 0 else 0
+        }
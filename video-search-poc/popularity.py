@@ -0,0 +1,157 @@
+# popularity.py
+"""
+Query popularity tracking for the Video Search Platform
+Estimates how often each query has been searched recently in fixed memory,
+with a count-min sketch for any query and a bounded set of heavy hitters,
+so auto-complete can rank completions by real traffic
+"""
+
+import heapq
+import time
+from array import array
+
+# Forward-decay weights grow by 2x per half-life; counters are rescaled
+# before they grow large enough to lose precision
+RESCALE_LIMIT = 2.0 ** 40
+
+
+class CountMinSketch:
+    """Fixed-size table of counters giving frequency upper bounds for any key
+
+    Each key maps to one counter per row; its estimate is the smallest of
+    them, which only ever overestimates (by colliding keys). Updates are
+    conservative: only counters below the new estimate are raised, which
+    keeps that overestimate small.
+    """
+    def __init__(self, width=4096, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('d', bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key):
+        """(row, column) of each of the key's counters, by double hashing"""
+        key_hash = hash(key)
+        first = key_hash & 0xFFFFFFFF
+        step = ((key_hash >> 32) & 0xFFFFFFFF) | 1
+        return [(row, (first + i * step) % self.width) for i, row in enumerate(self.rows)]
+
+    def add(self, key, amount=1.0):
+        """Count amount more occurrences of key and return its new estimate"""
+        cells = self._cells(key)
+        estimate = min(row[column] for row, column in cells) + amount
+        for row, column in cells:
+            if row[column] < estimate:
+                row[column] = estimate
+        return estimate
+
+    def estimate(self, key):
+        """Upper bound on the total amount added for key"""
+        return min(row[column] for row, column in self._cells(key))
+
+    def scale(self, factor):
+        """Multiply every counter by factor"""
+        for row in self.rows:
+            for column in range(self.width):
+                row[column] *= factor
+
+    def nbytes(self):
+        """Bytes used by the counters"""
+        return self.depth * self.width * 8
+
+
+class QueryPopularity:
+    """Time-decayed search counts per query in bounded memory
+
+    Every recorded search adds a weight of 2 ** (t / half_life), so a search
+    half_life seconds old counts half as much as one made now; dividing by
+    the current weight turns the totals back into "recent searches". The
+    sketch answers score() for any query, and the capacity queries with the
+    highest estimates are tracked exactly so top_queries() can list them.
+    A min-heap finds the weakest tracked query to evict; it holds stale
+    entries and is rebuilt when it grows past a few times capacity.
+    """
+    def __init__(self, capacity=256, width=4096, depth=4, half_life=3600.0, clock=time.time):
+        self.sketch = CountMinSketch(width, depth)
+        self.capacity = capacity
+        self.half_life = half_life
+        self._clock = clock
+        self._landmark = clock()
+        self._top = {}   # query -> decayed weight at its last search
+        self._heap = []  # (weight, query), possibly stale
+        self.total_recorded = 0
+
+    @staticmethod
+    def _normalize(query):
+        """Queries are tracked lowercased, as the tries store words"""
+        return query.lower().strip()
+
+    def _weight(self, now):
+        """Weight of a search made at time now"""
+        return 2.0 ** ((now - self._landmark) / self.half_life)
+
+    def _rescale(self, now):
+        """Move the landmark to now, dividing every stored weight to match"""
+        factor = 1.0 / self._weight(now)
+        self.sketch.scale(factor)
+        for query in self._top:
+            self._top[query] *= factor
+        self._heap = [(weight, query) for query, weight in self._top.items()]
+        heapq.heapify(self._heap)
+        self._landmark = now
+
+    def record(self, query):
+        """Count one search for query"""
+        query = self._normalize(query)
+        if not query:
+            return
+        
+        now = self._clock()
+        weight = self._weight(now)
+        if weight > RESCALE_LIMIT:
+            self._rescale(now)
+            weight = 1.0
+        
+        estimate = self.sketch.add(query, weight)
+        self.total_recorded += 1
+        
+        top = self._top
+        if query not in top and len(top) >= self.capacity:
+            # Drop stale heap entries until the top one is the weakest query
+            while self._heap[0][0] != top.get(self._heap[0][1]):
+                heapq.heappop(self._heap)
+            weakest_weight, weakest = self._heap[0]
+            if estimate <= weakest_weight:
+                return
+            heapq.heappop(self._heap)
+            del top[weakest]
+        
+        top[query] = estimate
+        heapq.heappush(self._heap, (estimate, query))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(weight, tracked) for tracked, weight in top.items()]
+            heapq.heapify(self._heap)
+
+    def score(self, query):
+        """Decayed number of recent searches for query (never an underestimate)"""
+        query = self._normalize(query)
+        if not query:
+            return 0.0
+        return self.sketch.estimate(query) / self._weight(self._clock())
+
+    def top_queries(self, prefix="", limit=10):
+        """Most searched tracked queries starting with prefix, as (query, score)"""
+        prefix = self._normalize(prefix)
+        weight = self._weight(self._clock())
+        matches = ((query, value / weight) for query, value in self._top.items()
+                   if query.startswith(prefix))
+        return heapq.nlargest(limit, matches, key=lambda item: item[1])
+
+    def get_stats(self):
+        """Get popularity tracker statistics"""
+        return {
+            'total_recorded': self.total_recorded,
+            'tracked_queries': len(self._top),
+            'capacity': self.capacity,
+            'sketch_bytes': self.sketch.nbytes(),
+            'half_life': self.half_life
+        }
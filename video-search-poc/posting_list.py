@@ -0,0 +1,608 @@
+# posting_list.py
+"""
+Posting list implementation for Video Search Platform indexes
+Stores the video IDs associated with an index key as a sorted integer array,
+a delta/varint compressed byte string or a roaring-style bitmap, and orders
+keys such as year and rating for range queries
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+
+class PostingList:
+    """Sorted, duplicate-free list of video IDs backed by array('q')
+
+    IDs usually arrive in increasing order during ingest, so add() is an
+    O(1) append in the common case. Out-of-order IDs are placed with a
+    binary search, which also serves membership tests without a side set.
+    """
+    def __init__(self, video_ids=None):
+        self.ids = array('q')
+        if video_ids:
+            for video_id in video_ids:
+                self.add(video_id)
+
+    def add(self, video_id):
+        """Add a video ID; returns False if it was already present"""
+        ids = self.ids
+        if not ids or video_id > ids[-1]:
+            ids.append(video_id)
+            return True
+        index = bisect_left(ids, video_id)
+        if ids[index] == video_id:
+            return False
+        ids.insert(index, video_id)
+        return True
+
+    def discard(self, video_id):
+        """Remove a video ID; returns False if it was not present"""
+        ids = self.ids
+        index = bisect_left(ids, video_id)
+        if index == len(ids) or ids[index] != video_id:
+            return False
+        del ids[index]
+        return True
+
+    def __contains__(self, video_id):
+        ids = self.ids
+        index = bisect_left(ids, video_id)
+        return index < len(ids) and ids[index] == video_id
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __bool__(self):
+        return len(self.ids) > 0
+
+    def __repr__(self):
+        return f"PostingList({self.ids.tolist()})"
+
+    def to_list(self):
+        """Return the video IDs as a plain list"""
+        return self.ids.tolist()
+
+    def nbytes(self):
+        """Bytes used to hold the encoded IDs"""
+        return len(self.ids) * self.ids.itemsize
+
+
+# Postings per block in CompressedPostingList; each block starts with an
+# absolute ID so decoding can begin at any skip pointer
+SKIP_INTERVAL = 64
+
+
+class CompressedPostingList:
+    """Sorted, duplicate-free list of video IDs stored as delta-coded varints
+
+    IDs are written as the gap from the previous ID in little-endian base-128
+    varints, usually one or two bytes per posting. Every SKIP_INTERVAL
+    postings a skip pointer records the block's first ID and byte offset, so
+    membership tests and intersections decode a single block. The first
+    block always starts at offset 0, so it has no pointer and lists shorter
+    than SKIP_INTERVAL carry no skip overhead.
+    """
+    def __init__(self, video_ids=None):
+        self._clear()
+        if video_ids:
+            for video_id in video_ids:
+                self.add(video_id)
+
+    def _clear(self):
+        """Reset to an empty list"""
+        self.data = bytearray()
+        self.count = 0
+        self.last = None
+        self.skip_ids = array('q')      # First ID of each block after the first
+        self.skip_offsets = array('q')  # Byte offset where each of those blocks starts
+
+    def _append(self, video_id):
+        """Encode an ID larger than every ID already stored"""
+        if self.count % SKIP_INTERVAL == 0:
+            if self.count:
+                self.skip_ids.append(video_id)
+                self.skip_offsets.append(len(self.data))
+            value = video_id
+        else:
+            value = video_id - self.last
+        data = self.data
+        while value >= 0x80:
+            data.append((value & 0x7f) | 0x80)
+            value >>= 7
+        data.append(value)
+        self.last = video_id
+        self.count += 1
+
+    def add(self, video_id):
+        """Add a video ID; returns False if it was already present"""
+        if self.last is None or video_id > self.last:
+            self._append(video_id)
+            return True
+        if video_id in self:
+            return False
+        # Out-of-order IDs are rare during ingest; re-encode the whole list
+        video_ids = self.to_list()
+        insort(video_ids, video_id)
+        self._clear()
+        for existing_id in video_ids:
+            self._append(existing_id)
+        return True
+
+    def discard(self, video_id):
+        """Remove a video ID; returns False if it was not present"""
+        if video_id not in self:
+            return False
+        # Removals only come from catalog corrections; re-encode the whole list
+        video_ids = self.to_list()
+        video_ids.remove(video_id)
+        self._clear()
+        for existing_id in video_ids:
+            self._append(existing_id)
+        return True
+
+    def _decode_block(self, block):
+        """Decode the IDs of one skip block; block 0 starts at offset 0"""
+        data = self.data
+        position = self.skip_offsets[block - 1] if block else 0
+        end = self.skip_offsets[block] if block < len(self.skip_offsets) else len(data)
+        video_ids = []
+        current = 0
+        while position < end:
+            value = 0
+            shift = 0
+            byte = data[position]
+            while byte & 0x80:
+                value |= (byte & 0x7f) << shift
+                shift += 7
+                position += 1
+                byte = data[position]
+            value |= byte << shift
+            position += 1
+            current = value if not video_ids else current + value
+            video_ids.append(current)
+        return video_ids
+
+    def __contains__(self, video_id):
+        if not self.count:
+            return False
+        video_ids = self._decode_block(bisect_right(self.skip_ids, video_id))
+        index = bisect_left(video_ids, video_id)
+        return index < len(video_ids) and video_ids[index] == video_id
+
+    def __len__(self):
+        return self.count
+
+    def _block_count(self):
+        """Number of skip blocks, counting the pointerless first block"""
+        return len(self.skip_offsets) + 1 if self.count else 0
+
+    def __iter__(self):
+        for block in range(self._block_count()):
+            yield from self._decode_block(block)
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __repr__(self):
+        return f"CompressedPostingList({self.to_list()})"
+
+    def to_list(self):
+        """Return the video IDs as a plain list"""
+        video_ids = []
+        for block in range(self._block_count()):
+            video_ids.extend(self._decode_block(block))
+        return video_ids
+
+    def nbytes(self):
+        """Bytes used to hold the encoded IDs and skip pointers"""
+        return len(self.data) + (len(self.skip_ids) + len(self.skip_offsets)) * 8
+
+
+# Bitmap containers cover 2**16 IDs; below this many members a container is
+# a sorted array('H'), above it a 8 KB bytearray with one bit per ID
+CONTAINER_BITS = 1 << 16
+ARRAY_CONTAINER_MAX = 4096
+
+
+def _popcount(bits):
+    """Number of set bits in a non-negative int"""
+    return bin(bits).count('1')
+
+
+def _container_to_int(container):
+    """Convert an array or bitmap container to an int bit set"""
+    if isinstance(container, bytearray):
+        return int.from_bytes(container, 'little')
+    bitmap = bytearray(CONTAINER_BITS // 8)
+    for low in container:
+        bitmap[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(bitmap, 'little')
+
+
+def _int_to_container(bits, cardinality):
+    """Build the most compact container for an int bit set of given cardinality"""
+    data = bits.to_bytes(CONTAINER_BITS // 8, 'little')
+    if cardinality > ARRAY_CONTAINER_MAX:
+        return bytearray(data)
+    lows = array('H')
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    lows.append(base + bit)
+    return lows
+
+
+def _combine_containers(left, right, operation):
+    """Apply a set operation to two containers, either of which may be None
+
+    Array containers are combined as sets of their low bits, and an array
+    is filtered against a bitmap by bit tests, so small containers are never
+    expanded. Only bitmap results of OR and ANDNOT go through Python ints.
+    """
+    if left is None or right is None:
+        if operation == 'and' or left is None and operation == 'andnot':
+            return None
+        container = left if left is not None else right
+        return bytearray(container) if isinstance(container, bytearray) else array('H', container)
+    
+    left_bitmap = isinstance(left, bytearray)
+    right_bitmap = isinstance(right, bytearray)
+    if not left_bitmap and not right_bitmap:
+        if operation == 'and':
+            lows = set(left).intersection(right)
+        elif operation == 'or':
+            lows = set(left).union(right)
+        else:
+            lows = set(left).difference(right)
+        lows = sorted(lows)
+        if len(lows) > ARRAY_CONTAINER_MAX:
+            return bytearray(_container_to_int(lows).to_bytes(CONTAINER_BITS // 8, 'little'))
+        return array('H', lows)
+    if operation == 'and' and left_bitmap != right_bitmap:
+        lows, bitmap = (right, left) if left_bitmap else (left, right)
+        return array('H', [low for low in lows if bitmap[low >> 3] >> (low & 7) & 1])
+    if operation == 'andnot' and right_bitmap and not left_bitmap:
+        return array('H', [low for low in left if not right[low >> 3] >> (low & 7) & 1])
+    
+    left_bits = _container_to_int(left)
+    right_bits = _container_to_int(right)
+    if operation == 'and':
+        bits = left_bits & right_bits
+    elif operation == 'or':
+        bits = left_bits | right_bits
+    else:
+        bits = left_bits & ~right_bits
+    return _int_to_container(bits, _popcount(bits))
+
+
+def _container_lows(container):
+    """Yield the low 16 bits of every ID in a container, in order"""
+    if isinstance(container, bytearray):
+        for byte_index, byte in enumerate(container):
+            if byte:
+                base = byte_index << 3
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield base + bit
+    else:
+        yield from container
+
+
+class BitmapPostingList:
+    """Roaring-style compressed bitmap of video IDs
+
+    IDs are split by their high 16 bits into containers. Sparse containers
+    are sorted arrays of the low 16 bits; dense ones are fixed bitmaps.
+    AND, OR and ANDNOT (&, |, -) work container by container: arrays are
+    combined directly and only dense containers go through Python ints,
+    which keeps set algebra over long, low-cardinality facets such as genre
+    and year fast.
+    """
+    def __init__(self, video_ids=None):
+        self.containers = {}  # high 16 bits -> array('H') or bytearray
+        self.count = 0
+        if video_ids:
+            for video_id in video_ids:
+                self.add(video_id)
+
+    @classmethod
+    def from_ids(cls, video_ids):
+        """Build a bitmap from any iterable of IDs (or return it if already one)"""
+        if isinstance(video_ids, cls):
+            return video_ids
+        return cls(video_ids)
+
+    def add(self, video_id):
+        """Add a video ID; returns False if it was already present"""
+        high, low = video_id >> 16, video_id & 0xffff
+        container = self.containers.get(high)
+        if container is None:
+            self.containers[high] = array('H', [low])
+        elif isinstance(container, bytearray):
+            mask = 1 << (low & 7)
+            if container[low >> 3] & mask:
+                return False
+            container[low >> 3] |= mask
+        else:
+            if container and low > container[-1]:
+                container.append(low)
+            else:
+                index = bisect_left(container, low)
+                if index < len(container) and container[index] == low:
+                    return False
+                container.insert(index, low)
+            if len(container) > ARRAY_CONTAINER_MAX:
+                self.containers[high] = bytearray(
+                    _container_to_int(container).to_bytes(CONTAINER_BITS // 8, 'little'))
+        self.count += 1
+        return True
+
+    def discard(self, video_id):
+        """Remove a video ID; returns False if it was not present"""
+        high, low = video_id >> 16, video_id & 0xffff
+        container = self.containers.get(high)
+        if container is None:
+            return False
+        if isinstance(container, bytearray):
+            mask = 1 << (low & 7)
+            if not container[low >> 3] & mask:
+                return False
+            container[low >> 3] &= ~mask
+            bits = _container_to_int(container)
+            cardinality = _popcount(bits)
+            if cardinality <= ARRAY_CONTAINER_MAX:
+                self.containers[high] = _int_to_container(bits, cardinality)
+        else:
+            index = bisect_left(container, low)
+            if index == len(container) or container[index] != low:
+                return False
+            del container[index]
+            if not container:
+                del self.containers[high]
+        self.count -= 1
+        return True
+
+    def __contains__(self, video_id):
+        container = self.containers.get(video_id >> 16)
+        if container is None:
+            return False
+        low = video_id & 0xffff
+        if isinstance(container, bytearray):
+            return bool(container[low >> 3] & (1 << (low & 7)))
+        index = bisect_left(container, low)
+        return index < len(container) and container[index] == low
+
+    def _combine(self, other, operation):
+        """Apply a bitwise operation container by container"""
+        other = BitmapPostingList.from_ids(other)
+        if operation == 'and':
+            highs = self.containers.keys() & other.containers.keys()
+        elif operation == 'or':
+            highs = self.containers.keys() | other.containers.keys()
+        else:
+            highs = self.containers.keys()
+        
+        result = BitmapPostingList()
+        for high in sorted(highs):
+            container = _combine_containers(self.containers.get(high), other.containers.get(high), operation)
+            if container is None:
+                continue
+            cardinality = _popcount(int.from_bytes(container, 'little')) \
+                if isinstance(container, bytearray) else len(container)
+            if cardinality:
+                result.containers[high] = container
+                result.count += cardinality
+        return result
+
+    @classmethod
+    def union(cls, bitmaps):
+        """OR together any number of bitmaps in one pass per container
+
+        Array containers are merged into one set and sorted once, instead of
+        being re-sorted after every pairwise OR.
+        """
+        grouped = {}
+        for bitmap in bitmaps:
+            for high, container in cls.from_ids(bitmap).containers.items():
+                grouped.setdefault(high, []).append(container)
+        
+        result = cls()
+        for high in sorted(grouped):
+            lows = set()
+            bits = 0
+            for container in grouped[high]:
+                if isinstance(container, bytearray):
+                    bits |= int.from_bytes(container, 'little')
+                else:
+                    lows.update(container)
+            if bits or len(lows) > ARRAY_CONTAINER_MAX:
+                bits |= _container_to_int(lows)
+                cardinality = _popcount(bits)
+                result.containers[high] = _int_to_container(bits, cardinality)
+            else:
+                cardinality = len(lows)
+                result.containers[high] = array('H', sorted(lows))
+            result.count += cardinality
+        return result
+
+    def __and__(self, other):
+        return self._combine(other, 'and')
+
+    def __or__(self, other):
+        return self._combine(other, 'or')
+
+    def __sub__(self, other):
+        """ANDNOT: IDs in this bitmap but not in other"""
+        return self._combine(other, 'andnot')
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for high in sorted(self.containers):
+            base = high << 16
+            for low in _container_lows(self.containers[high]):
+                yield base | low
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __repr__(self):
+        return f"BitmapPostingList({self.to_list()})"
+
+    def to_list(self):
+        """Return the video IDs as a plain list"""
+        return list(self)
+
+    def nbytes(self):
+        """Bytes used by the containers"""
+        return sum(len(container) * (2 if isinstance(container, array) else 1)
+                   for container in self.containers.values())
+
+
+# Posting list encodings selectable per VideoMetadataStore index
+POSTING_TYPES = {
+    'plain': PostingList,
+    'compressed': CompressedPostingList,
+    'bitmap': BitmapPostingList
+}
+
+
+def intersect(*posting_lists):
+    """Return the sorted IDs present in every posting list
+
+    The shortest list drives the intersection and the others are probed by
+    membership, which for compressed lists decodes only the block a skip
+    pointer lands on.
+    """
+    if not posting_lists:
+        return []
+    ordered = sorted(posting_lists, key=len)
+    shortest, others = ordered[0], ordered[1:]
+    return [video_id for video_id in shortest
+            if all(video_id in postings for postings in others)]
+
+
+class RangeIndex:
+    """Ordered index from sortable values (year, rating) to posting lists
+
+    Distinct values are kept in a sorted list so a range query is a pair of
+    binary searches plus the postings inside the range: O(log d + k) where d
+    is the number of distinct values and k the number of matches.
+    """
+    def __init__(self):
+        self.keys = []      # Sorted distinct values
+        self.postings = {}  # value -> PostingList
+
+    def add(self, value, video_id):
+        """Associate a video ID with a value"""
+        postings = self.postings.get(value)
+        if postings is None:
+            insort(self.keys, value)
+            postings = self.postings[value] = PostingList()
+        postings.add(video_id)
+
+    def remove(self, value, video_id):
+        """Drop the association between a video ID and a value"""
+        postings = self.postings.get(value)
+        if postings is None or not postings.discard(video_id):
+            return False
+        if not postings:
+            del self.postings[value]
+            del self.keys[bisect_left(self.keys, value)]
+        return True
+
+    def keys_in_range(self, low=None, high=None):
+        """Return the distinct values lying in [low, high], in order"""
+        start = 0 if low is None else bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return self.keys[start:end]
+
+    def range(self, low=None, high=None):
+        """Return the set of video IDs whose value lies in [low, high]"""
+        video_ids = set()
+        for value in self.keys_in_range(low, high):
+            video_ids.update(self.postings[value])
+        return video_ids
+
+
+class NGramIndex:
+    """Character trigram index for substring search over short texts
+
+    Each video is filed under every trigram of its lowercased texts, padded
+    with a NUL on both sides so one- and two-character texts still produce
+    trigrams. A query of three or more characters can only occur in videos
+    holding all of its trigrams, so its candidates are the intersection of
+    those posting lists; shorter queries union the lists of the trigrams
+    containing them. Candidates can be false positives (the trigrams may
+    come from different places or texts) and are verified by the caller.
+    """
+    def __init__(self):
+        self.postings = {}  # trigram -> PostingList
+
+    @staticmethod
+    def ngrams(texts):
+        """Set of trigrams across a video's texts"""
+        grams = set()
+        for text in texts:
+            padded = f"\0{text.lower()}\0"
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return grams
+
+    def add(self, video_id, texts):
+        """File a video under the trigrams of its texts"""
+        for gram in self.ngrams(texts):
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = PostingList()
+            postings.add(video_id)
+
+    def remove(self, video_id, texts):
+        """Drop a video from the trigrams of the texts it was added with"""
+        self._discard(video_id, self.ngrams(texts))
+
+    def update(self, video_id, old_texts, new_texts):
+        """Move a video between trigram lists, touching only those that changed"""
+        old_grams, new_grams = self.ngrams(old_texts), self.ngrams(new_texts)
+        self._discard(video_id, old_grams - new_grams)
+        for gram in new_grams - old_grams:
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = PostingList()
+            postings.add(video_id)
+
+    def _discard(self, video_id, grams):
+        """Remove a video from some trigram lists, dropping lists left empty"""
+        for gram in grams:
+            postings = self.postings.get(gram)
+            if postings is not None and postings.discard(video_id) and not postings:
+                del self.postings[gram]
+
+    def candidates(self, text):
+        """Sorted IDs of the videos that may contain text
+
+        Returns None for an empty query, which every text contains.
+        """
+        text = text.lower()
+        if not text:
+            return None
+        if len(text) < 3:
+            # Snapshot the trigrams: writers may add or drop some meanwhile
+            video_ids = set()
+            for gram, postings in list(self.postings.items()):
+                if text in gram:
+                    video_ids.update(postings)
+            return sorted(video_ids)
+        
+        posting_lists = []
+        for i in range(len(text) - 2):
+            postings = self.postings.get(text[i:i + 3])
+            if postings is None:
+                return []
+            posting_lists.append(postings)
+        return intersect(*posting_lists)
@@ -0,0 +1,303 @@
+# snapshot.py
+"""
+Memory-mapped snapshot format for the Video Search Platform metadata store
+Persists videos and their indexes in one binary file that can be queried in
+place through the VideoMetadataStore read API without rebuilding anything
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from hash_table import Video
+
+SNAPSHOT_MAGIC = b'VSNP'
+SNAPSHOT_VERSION = 1
+
+# Sections in file order; the header stores (offset, length) for each
+INDEX_NAMES = ('actor', 'genre', 'director', 'keyword', 'year')
+SECTIONS = (
+    'string_offsets',   # array('q'): string i spans string_data[offsets[i]:offsets[i + 1]]
+    'string_data',      # UTF-8 bytes of every string
+    'video_ids',        # array('q'): sorted video IDs; position i is record i
+    'records',          # RECORD structs, one per video
+    'lists',            # array('q'): string IDs of genre/actor/director/keyword lists
+    'rating_values',    # array('d'): ratings in ascending order
+    'rating_ids',       # array('q'): video IDs aligned with rating_values
+    'postings',         # array('q'): sorted video IDs of every index key
+) + tuple(f"index_{name}" for name in INDEX_NAMES)  # array('q'): (key, start, count) triples
+
+HEADER = struct.Struct('=4s1s3xIQ' + 'QQ' * len(SECTIONS))
+
+# year, rating, title ID, description ID, then (start, count) into `lists`
+# for genre, actors, directors and keywords
+RECORD = struct.Struct('=idqqqqqqqqqq')
+
+
+class _StringTable:
+    """Collects distinct strings and assigns them sequential IDs while writing"""
+    def __init__(self):
+        self.ids = {}
+        self.offsets = array('q', [0])
+        self.data = bytearray()
+
+    def add(self, string):
+        """Return the ID of string, appending it if it is new"""
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = len(self.offsets) - 1
+            self.ids[string] = string_id
+            self.data += string.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return string_id
+
+
+def save_snapshot(store, path):
+    """Write every video in a VideoMetadataStore and its indexes to path"""
+    strings = _StringTable()
+    videos = sorted(store.get_all_videos(), key=lambda video: video.video_id)
+    
+    video_ids = array('q')
+    records = bytearray()
+    lists = array('q')
+    postings_by_index = {name: {} for name in INDEX_NAMES}
+    
+    def add_list(values):
+        start = len(lists)
+        lists.extend(strings.add(value) for value in values)
+        return start, len(values)
+    
+    for video in videos:
+        video_ids.append(video.video_id)
+        fields = [video.year, video.rating, strings.add(video.title), strings.add(video.description)]
+        for values in (video.genre, video.actors, video.directors, video.keywords):
+            fields.extend(add_list(values))
+        records += RECORD.pack(*fields)
+        
+        # Videos are visited in ID order, so every posting list comes out sorted
+        for name, values in (('actor', video.actors), ('genre', video.genre),
+                             ('director', video.directors), ('keyword', video.keywords)):
+            for value in values:
+                posting = postings_by_index[name].setdefault(value.lower(), [])
+                if not posting or posting[-1] != video.video_id:
+                    posting.append(video.video_id)
+        postings_by_index['year'].setdefault(video.year, []).append(video.video_id)
+    
+    by_rating = sorted(videos, key=lambda video: (video.rating, video.video_id))
+    sections = {
+        'video_ids': video_ids,
+        'records': records,
+        'lists': lists,
+        'rating_values': array('d', (video.rating for video in by_rating)),
+        'rating_ids': array('q', (video.video_id for video in by_rating)),
+    }
+    
+    postings = array('q')
+    for name, postings_by_key in postings_by_index.items():
+        entries = array('q')
+        # String keys are sorted by text so lookups can binary search them
+        for key in sorted(postings_by_key):
+            key_field = key if name == 'year' else strings.add(key)
+            entries.extend((key_field, len(postings), len(postings_by_key[key])))
+            postings.extend(postings_by_key[key])
+        sections[f"index_{name}"] = entries
+    sections['postings'] = postings
+    sections['string_offsets'] = strings.offsets
+    sections['string_data'] = strings.data
+    
+    layout = []
+    offset = HEADER.size
+    for name in SECTIONS:
+        data = sections[name]
+        length = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        offset += -offset % 8  # Keep typed sections 8-byte aligned
+        layout.append((offset, length))
+        offset += length
+    
+    byte_order = b'L' if sys.byteorder == 'little' else b'B'
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, byte_order, SNAPSHOT_VERSION, len(videos),
+                            *[value for pair in layout for value in pair]))
+        for name, (section_offset, _) in zip(SECTIONS, layout):
+            f.write(b'\0' * (section_offset - f.tell()))
+            f.write(sections[name])
+
+
+class MappedVideoStore:
+    """Read-only VideoMetadataStore backed by a memory-mapped snapshot
+
+    Opening only maps the file and reads the header. Lookups binary search
+    the mapped sections through memoryviews and build Video objects for the
+    rows they return, so nothing is deserialized up front.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"Not a video snapshot: {path}")
+        header = HEADER.unpack_from(self._mmap, 0)
+        magic, byte_order, version, self.video_count = header[:4]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {SNAPSHOT_VERSION} video snapshot: {path}")
+        if byte_order != (b'L' if sys.byteorder == 'little' else b'B'):
+            self.close()
+            raise ValueError("Snapshot was written on a machine with a different byte order")
+        
+        self._sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = header[4 + 2 * i], header[5 + 2 * i]
+            self._sections[name] = (offset, length)
+        
+        self._string_offsets = self._typed_section('string_offsets', 'q')
+        self._video_ids = self._typed_section('video_ids', 'q')
+        self._lists = self._typed_section('lists', 'q')
+        self._rating_values = self._typed_section('rating_values', 'd')
+        self._rating_ids = self._typed_section('rating_ids', 'q')
+        self._postings = self._typed_section('postings', 'q')
+        self._indexes = {name: self._typed_section(f"index_{name}", 'q') for name in INDEX_NAMES}
+        self._string_data_offset = self._sections['string_data'][0]
+        self._records_offset = self._sections['records'][0]
+
+    def _typed_section(self, name, typecode):
+        """Zero-copy typed view of a section"""
+        offset, length = self._sections[name]
+        return self._view[offset:offset + length].cast(typecode)
+
+    def close(self):
+        """Release the memory map and file handle"""
+        for name in ('_string_offsets', '_video_ids', '_lists', '_rating_values',
+                     '_rating_ids', '_postings'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        for view in getattr(self, '_indexes', {}).values():
+            view.release()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _string(self, string_id):
+        """Decode one string from the pool"""
+        start = self._string_data_offset + self._string_offsets[string_id]
+        end = self._string_data_offset + self._string_offsets[string_id + 1]
+        return str(self._mmap[start:end], 'utf-8')
+
+    def _string_list(self, start, count):
+        """Decode a list of strings stored in the lists section"""
+        return [self._string(string_id) for string_id in self._lists[start:start + count]]
+
+    def _video_at(self, row):
+        """Materialize the Video stored in record row"""
+        fields = RECORD.unpack_from(self._mmap, self._records_offset + row * RECORD.size)
+        year, rating, title_id, description_id = fields[:4]
+        return Video(
+            self._video_ids[row],
+            self._string(title_id),
+            year,
+            self._string_list(fields[4], fields[5]),
+            self._string_list(fields[6], fields[7]),
+            self._string_list(fields[8], fields[9]),
+            self._string_list(fields[10], fields[11]),
+            rating,
+            self._string(description_id)
+        )
+
+    def _find_postings(self, index_name, key):
+        """Binary search an index section and return the matching video IDs"""
+        entries = self._indexes[index_name]
+        low, high = 0, len(entries) // 3
+        while low < high:
+            middle = (low + high) // 2
+            entry_key = entries[3 * middle]
+            if index_name != 'year':
+                entry_key = self._string(entry_key)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                start, count = entries[3 * middle + 1], entries[3 * middle + 2]
+                return self._postings[start:start + count]
+        return self._postings[0:0]
+
+    def get_video_count(self):
+        """Number of videos in the snapshot"""
+        return self.video_count
+
+    def get_video(self, video_id):
+        """Retrieve video by ID"""
+        row = bisect_left(self._video_ids, video_id)
+        if row < len(self._video_ids) and self._video_ids[row] == video_id:
+            return self._video_at(row)
+        return None
+
+    def get_videos(self, video_ids):
+        """Retrieve several videos, skipping missing IDs"""
+        videos = []
+        for video_id in video_ids:
+            video = self.get_video(video_id)
+            if video is not None:
+                videos.append(video)
+        return videos
+
+    def search_by_actor(self, actor_name):
+        """Find all videos with a specific actor"""
+        return self.get_videos(self._find_postings('actor', actor_name.lower()))
+
+    def search_by_genre(self, genre):
+        """Find all videos of a specific genre"""
+        return self.get_videos(self._find_postings('genre', genre.lower()))
+
+    def search_by_director(self, director_name):
+        """Find all videos by a specific director"""
+        return self.get_videos(self._find_postings('director', director_name.lower()))
+
+    def search_by_keyword(self, keyword):
+        """Find all videos with a specific keyword"""
+        return self.get_videos(self._find_postings('keyword', keyword.lower()))
+
+    def search_by_year(self, year):
+        """Find all videos from a specific year"""
+        return self.get_videos(self._find_postings('year', year))
+
+    def search_by_year_range(self, start_year, end_year):
+        """Find the IDs of all videos released between two years (inclusive)"""
+        entries = self._indexes['year']
+        # Year keys are stored sorted, so the range is a run of entries
+        years = entries[0::3]
+        video_ids = set()
+        for i in range(bisect_left(years, start_year), bisect_right(years, end_year)):
+            start, count = entries[3 * i + 1], entries[3 * i + 2]
+            video_ids.update(self._postings[start:start + count])
+        return video_ids
+
+    def search_by_min_rating(self, min_rating):
+        """Find the IDs of all videos rated at least min_rating"""
+        start = bisect_left(self._rating_values, min_rating)
+        return set(self._rating_ids[start:])
+
+    def get_all_videos(self):
+        """Get all videos in the snapshot"""
+        return [self._video_at(row) for row in range(self.video_count)]
+
+    def iter_videos(self):
+        """Yield every video in video ID order"""
+        for row in range(self.video_count):
+            yield self._video_at(row)
+
+    def scan(self, cursor=0, count=100):
+        """Return (next_cursor, videos) for one page; the cursor is a row number"""
+        end = min(cursor + count, self.video_count)
+        videos = [self._video_at(row) for row in range(cursor, end)]
+        return (end if end < self.video_count else 0), videos
@@ -0,0 +1,158 @@
+# spelling.py
+"""
+Spelling correction for the Video Search Platform
+Symmetric-delete dictionary (as in SymSpell): words are filed under every
+string their deletions can reach, so a misspelled query finds its
+corrections with a few dictionary lookups instead of a trie traversal
+"""
+
+
+def _char_masks(word):
+    """Bit i of a character's mask is set where word has it at position i"""
+    masks = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _bounded_distance(masks, length, other, max_distance):
+    """Levenshtein distance from a word to other, or None if it exceeds max_distance
+
+    Myers' bit-parallel algorithm: masks and length describe the word, and
+    one column of the edit distance table, held as bit vectors of +1/-1
+    steps, is advanced per character of other. Gives up once the distance
+    so far minus the characters left is already too large.
+    """
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    plus, minus = full, 0
+    distance = length
+    remaining = len(other)
+    
+    for char in other:
+        eq = masks.get(char, 0)
+        vertical = eq | minus
+        horizontal = ((((eq & plus) + plus) & full) ^ plus) | eq
+        h_plus = minus | (~(horizontal | plus) & full)
+        h_minus = plus & horizontal
+        if h_plus & last:
+            distance += 1
+        elif h_minus & last:
+            distance -= 1
+        remaining -= 1
+        if distance - remaining > max_distance:
+            return None
+        h_plus = ((h_plus << 1) | 1) & full
+        h_minus = (h_minus << 1) & full
+        plus = h_minus | (~(vertical | h_plus) & full)
+        minus = h_plus & vertical
+    
+    return distance if distance <= max_distance else None
+
+
+class SpellingIndex:
+    """Symmetric-delete spelling dictionary with a fixed maximum edit distance
+
+    Every word is filed under each string reachable by deleting up to
+    max_distance characters from its first prefix_length characters. Two
+    words within d edits of each other share such a string, so a lookup
+    generates the query's own deletes, checks the words filed under them
+    and verifies each with a bounded edit distance. The prefix caps the
+    deletes per word, so long titles cost no more than short words; a
+    larger max_distance makes lookups faster than a trie walk at the price
+    of many more stored deletes.
+    """
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = {}    # word -> number of times added
+        self.deletes = {}  # delete -> words filed under it
+        self.entry_count = 0
+
+    def _deletes(self, word, max_distance):
+        """Strings reachable from the word's prefix by up to max_distance deletions"""
+        key = word[:self.prefix_length]
+        found = {key}
+        frontier = [key]
+        for _ in range(max_distance):
+            next_frontier = []
+            for text in frontier:
+                for i in range(len(text)):
+                    shorter = text[:i] + text[i + 1:]
+                    if shorter not in found:
+                        found.add(shorter)
+                        next_frontier.append(shorter)
+            frontier = next_frontier
+        return found
+
+    def add(self, word, count=1):
+        """Add count occurrences of word"""
+        word = word.lower().strip()
+        if not word:
+            return
+        if word in self.words:
+            self.words[word] += count
+            return
+        
+        self.words[word] = count
+        for delete in self._deletes(word, self.max_distance):
+            self.deletes.setdefault(delete, []).append(word)
+            self.entry_count += 1
+
+    def remove(self, word, count=1):
+        """Remove count occurrences of word, dropping it once none are left"""
+        word = word.lower().strip()
+        if word not in self.words:
+            return False
+        if self.words[word] > count:
+            self.words[word] -= count
+            return True
+        
+        del self.words[word]
+        for delete in self._deletes(word, self.max_distance):
+            filed = self.deletes[delete]
+            filed.remove(word)
+            if not filed:
+                del self.deletes[delete]
+            self.entry_count -= 1
+        return True
+
+    def lookup(self, word, max_distance=None, limit=10):
+        """Known words within max_distance edits of word, as (word, distance, count)
+
+        Nearest first, then most frequent. max_distance defaults to, and is
+        capped at, the distance the index was built for.
+        """
+        word = word.lower().strip()
+        if not word:
+            return []
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        
+        masks = _char_masks(word)
+        length = len(word)
+        results = []
+        checked = set()
+        for delete in self._deletes(word, max_distance):
+            for candidate in self.deletes.get(delete, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if abs(len(candidate) - length) > max_distance:
+                    continue
+                distance = _bounded_distance(masks, length, candidate, max_distance)
+                if distance is not None:
+                    results.append((candidate, distance, self.words[candidate]))
+        
+        results.sort(key=lambda x: (x[1], -x[2], x[0]))
+        return results[:limit]
+
+    def get_stats(self):
+        """Get spelling index statistics"""
+        return {
+            'word_count': len(self.words),
+            'delete_count': len(self.deletes),
+            'entry_count': self.entry_count,
+            'max_distance': self.max_distance,
+            'prefix_length': self.prefix_length
+        }
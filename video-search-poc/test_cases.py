@@ -4,12 +4,26 @@ Comprehensive Test Suite for Video Search Platform
 Validates functionality and demonstrates robustness of all data structures
 """
 
+import fnmatch
+import gc
+import itertools
+import os
+import sys
+import tempfile
+import threading
 import unittest
 import time
+from array import array
 from video_search_system import VideoSearchSystem, SearchResult
-from hash_table import Video, VideoMetadataStore, HashTable
-from trie import Trie, VideoTrieSystem
+from hash_table import (Video, VideoMetadataStore, HashTable, ConcurrentHashTable,
+                        OpenAddressingHashTable)
+from trie import Trie, RadixTrie, VideoTrieSystem
+from snapshot import save_snapshot, MappedVideoStore
+from posting_list import (PostingList, CompressedPostingList, BitmapPostingList, NGramIndex, RangeIndex,
+                          intersect)
 from graph import VideoContentGraph
+from popularity import QueryPopularity
+from spelling import SpellingIndex
 
 
 class TestVideoSearchSystem(unittest.TestCase):
@@ -58,6 +72,14 @@ class TestVideoSearchSystem(unittest.TestCase):
         self.assertIsNotNone(retrieved_video)
         self.assertEqual(retrieved_video.title, "Test Movie")
     
+    def test_video_ids_beyond_32_bits(self):
+        """Test IDs past 2**31 are indexed like any other"""
+        big_id = 3_000_000_000
+        self.assertTrue(self.search_system.add_video(
+            Video(big_id, "Big Catalog", 2023, ["Comedy"], ["Test Actor"], ["Test Director"], ["test"], 7.5)))
+        self.assertEqual([r.video.video_id for r in self.search_system.search_by_genre("Comedy")], [big_id])
+        self.assertEqual(self.search_system.metadata_store.get_postings('genre', 'comedy').to_list(), [big_id])
+    
     def test_title_search_exact(self):
         """Test exact title search functionality"""
         results = self.search_system.search_by_title("The Matrix", "exact")
@@ -134,6 +156,63 @@ class TestVideoSearchSystem(unittest.TestCase):
             self.assertTrue(2000 <= video.year <= 2020)
             self.assertGreaterEqual(video.rating, 8.0)
     
+    def test_range_indexes(self):
+        """Test ordered year and rating indexes on the metadata store"""
+        store = self.search_system.metadata_store
+        self.assertEqual(store.search_by_year_range(1990, 2009), {1, 4, 5})
+        self.assertEqual(store.search_by_min_rating(8.8), {2, 3, 4, 5})
+        
+        # Range-only criteria must not fall back to scanning every video
+        store.get_all_videos = lambda: self.fail("complex_search scanned the catalog")
+        store.iter_videos = lambda: self.fail("complex_search scanned the catalog")
+        results = self.search_system.complex_search({'year_range': (1990, 2009), 'min_rating': 8.8})
+        self.assertEqual(sorted(r.video.video_id for r in results), [4, 5])
+    
+    def test_posting_set_algebra(self):
+        """Test bitmap-backed facet indexes and store set-algebra helpers"""
+        store = self.search_system.metadata_store
+        self.assertIsInstance(store.genre_index.search("action"), BitmapPostingList)
+        self.assertIsInstance(store.year_index.search(1999), BitmapPostingList)
+        
+        self.assertEqual(store.union_postings('genre', ['drama', 'sci-fi']).to_list(), [1, 2, 3, 5])
+        self.assertEqual(store.intersect_postings('genre', ['action', 'crime']).to_list(), [4])
+        self.assertEqual(store.get_year_range_postings(1990, 2009).to_list(), [1, 4, 5])
+        self.assertEqual(store.get_postings('genre', 'western').to_list(), [])
+        
+        # Genre and year criteria are answered from the indexes, not a scan
+        store.get_all_videos = lambda: self.fail("complex_search scanned the catalog")
+        store.iter_videos = lambda: self.fail("complex_search scanned the catalog")
+        results = self.search_system.complex_search({'genre': 'Action', 'year_range': (2000, 2020)})
+        self.assertEqual(sorted(r.video.video_id for r in results), [3, 4])
+    
+    def test_search_substring(self):
+        """Test infix matching on titles and names through the trigram indexes"""
+        ids = lambda results: sorted(r.video.video_id for r in results)
+        self.assertEqual(ids(self.search_system.search_substring('title', 'ATRI')), [1])
+        self.assertEqual(ids(self.search_system.search_substring('title', 'he')), [1, 2, 4])
+        self.assertEqual(ids(self.search_system.search_substring('actor', 'th le')), [4])
+        self.assertEqual(ids(self.search_system.search_substring('director', 'nolan')), [3, 4])
+        self.assertEqual(ids(self.search_system.search_substring('title', 'matrix godfather')), [])
+        self.assertEqual(self.search_system.search_substring('genre', 'act'), [])
+        
+        # Updates move a video between trigram lists
+        self.search_system.update_video(Video(1, "The Animatrix", 2003, ["Animation"], [], [], [], 7.3))
+        self.assertEqual(ids(self.search_system.search_substring('title', 'nimat')), [1])
+        self.assertEqual(ids(self.search_system.search_substring('actor', 'keanu')), [])
+        
+        # Title and actor criteria no longer scan the catalog
+        store = self.search_system.metadata_store
+        store.get_all_videos = lambda: self.fail("complex_search scanned the catalog")
+        store.iter_videos = lambda: self.fail("complex_search scanned the catalog")
+        results = self.search_system.complex_search({'title': 'the', 'actor': 'an'})
+        self.assertEqual(ids(results), [2, 4])
+        
+        # A genre criterion intersects with the substring candidates rather than replacing them
+        candidates = self.search_system._complex_search_candidates({'title': 'dark', 'genre': 'action'})
+        self.assertEqual([video.video_id for video in candidates], [4])
+        candidates = self.search_system._complex_search_candidates({'genre': 'action'})
+        self.assertEqual(sorted(video.video_id for video in candidates), [3, 4])
+    
     def test_similar_videos(self):
         """Test graph-based similarity search"""
         # Find videos similar to The Matrix (ID: 1)
@@ -167,6 +246,25 @@ class TestVideoSearchSystem(unittest.TestCase):
         for category, suggestion in suggestions:
             self.assertIn("the", suggestion.lower())
     
+    def test_auto_complete_ranks_by_search_popularity(self):
+        """Test suggestions follow recorded searches, ignoring searches that found nothing"""
+        self.assertEqual(self.search_system.get_auto_complete_suggestions("the", 'title', 1),
+                         [('title', 'the')])
+        
+        for _ in range(3):
+            self.search_system.search_by_title("The Matrix", 'exact')
+        self.search_system.search_by_title("The Godfather", 'exact')
+        for _ in range(5):
+            self.search_system.search_by_title("The Gofdather", 'exact')  # Typo: no results
+        
+        # Searched titles come first, the rest keep their frequency order
+        suggestions = self.search_system.get_auto_complete_suggestions("the", 'title', 3)
+        self.assertEqual(suggestions, [('title', 'the matrix'), ('title', 'the godfather'),
+                                       ('title', 'the')])
+        popularity = self.search_system.query_popularity
+        self.assertEqual(popularity.top_queries("the")[0][0], "the matrix")
+        self.assertEqual(popularity.score("the gofdather"), 0)
+    
     def test_actor_collaborations(self):
         """Test actor collaboration finding"""
         collaborations = self.search_system.get_actor_collaborations("Christian Bale")
@@ -183,6 +281,41 @@ class TestVideoSearchSystem(unittest.TestCase):
         godfather_found = any(result.video.title == "The Godfather" for result in results)
         self.assertTrue(godfather_found)
     
+    def test_spell_correction_uses_spelling_index(self):
+        """Test titles and actors are corrected from the spelling indexes, which follow updates"""
+        # Ingest builds no index; the first correction in a category does
+        self.assertEqual(self.search_system.get_system_statistics()['spelling_stats'], {})
+        results = self.search_system.search_with_spell_correction("The Dark Knigth", "title")
+        self.assertEqual([r.video.video_id for r in results], [4])
+        self.assertEqual(results[0].match_type, "fuzzy_title")
+        
+        results = self.search_system.search_by_actor("Tom Hnaks")
+        self.assertIn((5, "fuzzy_actor"), [(r.video.video_id, r.match_type) for r in results])
+        
+        self.search_system.remove_video(4)
+        self.assertEqual(self.search_system.search_with_spell_correction("The Dark Knigth", "title"), [])
+        self.assertEqual(self.search_system.trie_system.correct_spelling('title', "knigth"), [])
+        
+        stats = self.search_system.get_system_statistics()['spelling_stats']
+        self.assertEqual(stats['title_spelling']['word_count'],
+                         self.search_system.trie_system.title_trie.word_count)
+    
+    def test_spell_correction_at_configured_distance(self):
+        """Test a system built for one edit corrects from its index, not the trie"""
+        system = VideoSearchSystem(spelling_distance=1)
+        for video in self.test_videos:
+            system.add_video(video)
+        system.trie_system.title_trie.fuzzy_search = lambda *args: self.fail("walked the trie")
+        
+        results = system.search_with_spell_correction("Incepton", "title")
+        self.assertEqual([r.video.video_id for r in results], [3])
+        self.assertEqual(system.trie_system.get_spelling_stats()['title_spelling']['max_distance'], 1)
+        
+        # Later videos reach the built index
+        system.add_video(Video(6, "Interstellar", 2014, ["Sci-Fi"], ["Matthew McConaughey"],
+                               ["Christopher Nolan"], ["space"], 8.6))
+        self.assertEqual([r.video.video_id for r in system.search_with_spell_correction("Intersteller")], [6])
+    
     def test_empty_queries(self):
         """Test handling of empty queries"""
         results = self.search_system.search_by_title("")
@@ -219,6 +352,81 @@ class TestVideoSearchSystem(unittest.TestCase):
         self.assertEqual(results['success'], 2)
         self.assertEqual(results['failures'], 0)
         self.assertEqual(results['total'], 2)
+        
+        # A failed trie load takes the batch back out of the store and graph
+        graph_stats = self.search_system.content_graph.get_graph_stats()
+        self.search_system.trie_system.freeze()
+        more_videos = [Video(12, "Frozen Out", 2022, ["Western"], ["Actor 3"], ["Director 3"], ["late"], 6.0)]
+        results = self.search_system.bulk_add_videos(more_videos)
+        self.assertEqual((results['success'], results['failures']), (0, 1))
+        self.assertIsNone(self.search_system.metadata_store.get_video(12))
+        self.assertEqual(self.search_system.search_by_genre("Western"), [])
+        self.assertEqual(self.search_system.content_graph.get_graph_stats(), graph_stats)
+        self.assertTrue(gc.isenabled())
+    
+    def test_remove_and_update_video(self):
+        """Test removal and in-place correction across all data structures"""
+        system = self.search_system
+        
+        # Removing Inception drops its postings, trie words and orphaned graph nodes
+        self.assertTrue(system.remove_video(3))
+        self.assertFalse(system.remove_video(3))
+        self.assertIsNone(system.metadata_store.get_video(3))
+        self.assertEqual(system.search_by_actor("Tom Hardy"), [])
+        self.assertEqual([r.video.video_id for r in system.search_by_genre("Thriller")], [])
+        self.assertIsNone(system.metadata_store.genre_index.search("thriller"))
+        self.assertNotIn(3, system.metadata_store.search_by_min_rating(8.5))
+        self.assertFalse(system.trie_system.title_trie.search_exact("inception"))
+        self.assertEqual(system.trie_system.title_trie.search_prefix("inc"), [])
+        self.assertNotIn("video_3", system.content_graph.nodes)
+        self.assertNotIn("actor_tom_hardy", system.content_graph.nodes)
+        self.assertIn("director_christopher_nolan", system.content_graph.nodes)
+        
+        # Updating The Matrix only moves the fields that changed
+        self.assertTrue(system.update_video(Video(1, "The Matrix Reloaded", 2003, ["Action", "Sci-Fi"],
+                                                  ["Keanu Reeves", "Hugo Weaving"], ["Lana Wachowski"],
+                                                  ["virtual reality"], 7.2)))
+        video = system.metadata_store.get_video(1)
+        self.assertEqual(video.title, "The Matrix Reloaded")
+        self.assertEqual([r.video.video_id for r in system.search_by_year(2003)], [1])
+        self.assertEqual(system.search_by_year(1999), [])
+        self.assertEqual([v.video_id for v in system.metadata_store.search_by_actor("Hugo Weaving")], [1])
+        self.assertEqual(system.metadata_store.search_by_actor("Laurence Fishburne"), [])
+        self.assertIsNone(system.metadata_store.keyword_index.search("philosophy"))
+        self.assertNotIn(1, system.metadata_store.search_by_min_rating(8.0))
+        self.assertEqual(system.trie_system.title_trie.get_video_ids_for_word("matrix"), [1])
+        self.assertEqual(system.trie_system.title_trie.get_video_ids_for_word("reloaded"), [1])
+        self.assertFalse(system.trie_system.title_trie.search_exact("the matrix"))
+        self.assertNotIn("actor_laurence_fishburne", system.content_graph.nodes)
+        self.assertEqual(system.content_graph.nodes["video_1"].data['year'], 2003)
+        
+        # "the" is still shared by the remaining titles
+        self.assertEqual(sorted(system.trie_system.title_trie.get_video_ids_for_word("the")), [1, 2, 4])
+        
+        # Statistics stay consistent with a rebuild from the surviving videos
+        rebuilt = VideoSearchSystem()
+        for stored in system.metadata_store.get_all_videos():
+            rebuilt.add_video(stored)
+        self.assertEqual(system.trie_system.get_system_stats(), rebuilt.trie_system.get_system_stats())
+        self.assertEqual(system.content_graph.get_graph_stats(), rebuilt.content_graph.get_graph_stats())
+    
+    def test_refused_changes_leave_system_consistent(self):
+        """Test a remove or update the frozen tries refuse changes nothing"""
+        system = self.search_system
+        system.trie_system.freeze()
+        graph_stats = system.content_graph.get_graph_stats()
+        
+        self.assertFalse(system.remove_video(5))
+        self.assertEqual(system.metadata_store.get_video(5).title, "Forrest Gump")
+        self.assertIn("video_5", system.content_graph.nodes)
+        self.assertEqual(system.trie_system.title_trie.get_video_ids_for_word("forrest gump"), [5])
+        
+        self.assertFalse(system.update_video(Video(1, "The Matrix Reloaded", 2003, ["Action"],
+                                                   ["Keanu Reeves"], ["Lana Wachowski"], [], 7.2)))
+        self.assertEqual(system.metadata_store.get_video(1).title, "The Matrix")
+        self.assertEqual(system.content_graph.nodes["video_1"].data['year'], 1999)
+        self.assertEqual(system.trie_system.title_trie.get_video_ids_for_word("the matrix"), [1])
+        self.assertEqual(system.content_graph.get_graph_stats(), graph_stats)
     
     def test_system_statistics(self):
         """Test system statistics generation"""
@@ -240,6 +448,42 @@ class TestVideoSearchSystem(unittest.TestCase):
         self.assertGreater(stats['search_performance']['total_searches'], 0)
         self.assertGreater(stats['search_performance']['average_response_time'], 0)
     
+    def test_system_statistics_are_cheap(self):
+        """Test that statistics do not materialize the catalog or walk postings"""
+        store = self.search_system.metadata_store
+        store.get_all_videos = lambda: self.fail("statistics materialized every video")
+        store.iter_videos = lambda: self.fail("statistics materialized every video")
+        store._get_posting_stats = lambda name: self.fail("statistics walked posting lists")
+        
+        stats = self.search_system.get_system_statistics()
+        self.assertEqual(stats['total_videos'], 5)
+        
+        graph = self.search_system.content_graph
+        graph_stats = stats['graph_stats']
+        self.assertEqual(graph_stats['total_edges'],
+                         sum(len(neighbors) for neighbors in graph.adjacency_list.values()) // 2)
+        self.assertEqual(graph_stats['max_degree'],
+                         max(len(graph.adjacency_list[node]) for node in graph.nodes))
+        self.assertEqual(graph_stats['connected_components'], graph._count_connected_components())
+    
+    def test_component_count_tracked_during_ingest(self):
+        """Test adding videos keeps the component count without walking the graph"""
+        graph = self.search_system.content_graph
+        walk = graph._count_connected_components
+        graph._count_connected_components = lambda: self.fail("statistics walked the graph")
+        
+        self.search_system.add_video(Video(6, "Loner", 2020, ["Documentary"], ["Nobody Known"],
+                                           ["Solo Director"], ["alone"], 6.0))
+        components = graph.get_graph_stats()['connected_components']
+        self.search_system.add_video(Video(7, "Bridge", 2021, ["Documentary", "Drama"], [], [], [], 6.5))
+        self.assertEqual(graph.get_graph_stats()['connected_components'], components - 1)
+        self.assertEqual(components - 1, walk())
+        
+        # Removing a video may split a component, so the next count walks again
+        graph._count_connected_components = walk
+        self.search_system.remove_video(7)
+        self.assertEqual(graph.get_graph_stats()['connected_components'], components)
+    
     def test_performance_benchmarks(self):
         """Test search performance under load"""
         start_time = time.time()
@@ -318,6 +562,275 @@ class TestHashTable(unittest.TestCase):
         for i in range(10):
             self.assertEqual(small_table.search(f"key{i}"), f"value{i}")
     
+    def test_auto_resize(self):
+        """Test load-factor driven growth with incremental rehashing"""
+        table = HashTable(8)
+        for i in range(200):
+            table.insert(f"key{i}", i)
+            # Every key must stay reachable while buckets are migrating
+            self.assertEqual(table.search(f"key{i // 2}"), i // 2)
+        
+        stats = table.get_stats()
+        self.assertGreater(stats['table_size'], 8)
+        self.assertGreater(stats['resize_count'], 0)
+        self.assertLessEqual(stats['load_factor'], 0.75)
+        self.assertEqual(stats['total_items'], 200)
+        self.assertEqual(sorted(table.get_all_values()), list(range(200)))
+        
+        # Updates and deletes must find keys still sitting in old buckets
+        table.insert("key5", "updated")
+        self.assertEqual(table.search("key5"), "updated")
+        self.assertTrue(table.delete("key6"))
+        self.assertIsNone(table.search("key6"))
+        self.assertEqual(table.get_stats()['total_items'], 199)
+    
+    def test_auto_shrink(self):
+        """Test optional shrinking when the load factor drops"""
+        table = HashTable(8, min_load_factor=0.1)
+        for i in range(100):
+            table.insert(i, i)
+        grown_size = table.size
+        for i in range(95):
+            table.delete(i)
+        
+        self.assertLess(table.size, grown_size)
+        self.assertGreaterEqual(table.size, 8)
+        for i in range(95, 100):
+            self.assertEqual(table.search(i), i)
+    
+    def test_hash_modes(self):
+        """Test both hash modes and the chain length histogram"""
+        for hash_mode in ('builtin', 'polynomial'):
+            table = HashTable(64, hash_mode=hash_mode)
+            for i in range(40):
+                table.insert(f"Actor Name {i}", i)
+            for i in range(40):
+                self.assertEqual(table.search(f"Actor Name {i}"), i)
+            
+            stats = table.get_stats()
+            histogram = stats['chain_length_histogram']
+            self.assertEqual(stats['hash_mode'], hash_mode)
+            self.assertEqual(sum(histogram.values()), stats['table_size'])
+            self.assertEqual(sum(length * buckets for length, buckets in histogram.items()), 40)
+        
+        with self.assertRaises(ValueError):
+            HashTable(10, hash_mode='unknown')
+    
+    def test_search_many(self):
+        """Test batched lookups with collisions, misses and in-flight rehashing"""
+        for table in (HashTable(4), OpenAddressingHashTable(8)):
+            for i in range(50):
+                table.insert(i, f"value{i}")
+            keys = [3, 99, 7, 3, 49, -1]
+            self.assertEqual(table.search_many(keys), [table.search(key) for key in keys])
+        
+        self.assertEqual(HashTable(2).search_many([]), [])
+    
+    def test_scan_tolerates_resizes(self):
+        """Test cursor pagination returns every key despite inserts between pages"""
+        for table in (HashTable(4), ConcurrentHashTable(4, stripes=2), OpenAddressingHashTable(8)):
+            for i in range(100):
+                table.insert(i, i)
+            seen = set()
+            cursor, items = table.scan(0, 7)
+            extra = 1000
+            while True:
+                seen.update(key for key, _ in items)
+                # Grow the table several times while the pass is in flight
+                for _ in range(15):
+                    table.insert(extra, extra)
+                    extra += 1
+                if not cursor:
+                    break
+                cursor, items = table.scan(cursor, 7)
+            self.assertTrue(set(range(100)) <= seen, type(table).__name__)
+            self.assertGreater(table.resize_count, 1)
+            
+            # Without concurrent changes a pass returns each key exactly once
+            self.assertEqual(sorted(table.iter_values(batch_size=5)), sorted(table.get_all_values()))
+    
+    def test_scan_sequential_keys_in_linear_time(self):
+        """Test sequential int keys (hash(i) == i) do not form one long probe run"""
+        table = OpenAddressingHashTable(8)
+        for i in range(5000):
+            table.insert(i, i)
+        stats = table.get_stats()
+        self.assertLess(stats['avg_probe_length'], 2)
+        self.assertLess(stats['max_probe_length'], 64)
+        
+        # Each step walks a bounded number of slots, so a pass is O(capacity)
+        cursor, steps = 0, 0
+        seen = []
+        while True:
+            cursor, items = table.scan(cursor, 16)
+            seen.extend(key for key, _ in items)
+            steps += 1
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), list(range(5000)))
+        self.assertLessEqual(steps, table.size // 4 + 1)
+    
+    def test_get_videos(self):
+        """Test batched video retrieval in every storage layout"""
+        for store in (VideoMetadataStore(), VideoMetadataStore('open_addressing'),
+                      VideoMetadataStore(columnar=True)):
+            for i in range(1, 6):
+                store.add_video(Video(i, f"Movie {i}", 2020, ["Drama"],
+                                      ["Actor"], ["Director"], ["test"], 7.0))
+            videos = store.get_videos([4, 42, 1])
+            self.assertEqual([video.video_id for video in videos], [4, 1])
+            self.assertEqual(len(store.search_by_genre("Drama")), 5)
+    
+    def test_incremental_stats(self):
+        """Test that maintained statistics match a full walk of the table"""
+        table = HashTable(4, min_load_factor=0.2)
+        for i in range(300):
+            table.insert(i * 7, i)
+            if i % 3 == 0:
+                table.delete((i // 2) * 7)
+        
+        bucket_sizes = [len(bucket) if bucket else 0 for bucket in table._iter_buckets()]
+        stats = table.get_stats()
+        self.assertEqual(stats['used_buckets'], sum(1 for size in bucket_sizes if size))
+        self.assertEqual(stats['max_bucket_size'], max(bucket_sizes))
+        self.assertEqual(stats['total_items'], len(table.get_all_values()))
+        self.assertEqual(sum(stats['chain_length_histogram'].values()), len(bucket_sizes))
+        
+        open_table = OpenAddressingHashTable(8)
+        for i in range(300):
+            open_table.insert(i, i)
+        for i in range(0, 300, 4):
+            open_table.delete(i)
+        probe_lengths = [open_table._probe_length(i) for i, key in enumerate(open_table.keys)
+                         if key in range(300)]
+        open_stats = open_table.get_stats()
+        self.assertEqual(open_stats['max_probe_length'], max(probe_lengths))
+        self.assertAlmostEqual(open_stats['avg_probe_length'], sum(probe_lengths) / len(probe_lengths))
+    
+    def test_open_addressing_table(self):
+        """Test the open-addressing table against the chained API"""
+        table = OpenAddressingHashTable(8)
+        for i in range(500):
+            table.insert(f"key{i}", i)
+        for i in range(500):
+            self.assertEqual(table.search(f"key{i}"), i)
+        self.assertIsNone(table.search("nonexistent"))
+        
+        table.insert("key1", "updated")
+        self.assertEqual(table.search("key1"), "updated")
+        
+        # Deleted slots become tombstones that do not break probe chains
+        for i in range(0, 500, 2):
+            self.assertTrue(table.delete(f"key{i}"))
+        self.assertFalse(table.delete("key0"))
+        for i in range(1, 500, 2):
+            self.assertIsNotNone(table.search(f"key{i}"))
+        
+        stats = table.get_stats()
+        self.assertEqual(stats['total_items'], 250)
+        self.assertEqual(len(table.get_all_values()), 250)
+        self.assertLessEqual(stats['load_factor'], 0.7)
+    
+    def test_concurrent_table(self):
+        """Test concurrent writers and lock-free readers across resizes"""
+        table = ConcurrentHashTable(16, min_load_factor=0.1, stripes=8)
+        self.assertEqual(table.size % table.stripes, 0)
+        for i in range(200):
+            table.insert(f"stable{i}", i)
+        
+        missed = []
+        
+        def writer(thread_id):
+            for i in range(2000):
+                table.insert(f"t{thread_id}-{i}", i)
+            for i in range(0, 2000, 2):
+                table.delete(f"t{thread_id}-{i}")
+        
+        def reader():
+            for _ in range(20):
+                for i in range(200):
+                    if table.search(f"stable{i}") != i:
+                        missed.append(i)
+        
+        # Switch threads often so operations interleave mid-resize
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=writer, args=(t,)) for t in range(4)]
+            threads += [threading.Thread(target=reader) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        
+        self.assertEqual(missed, [])
+        self.assertEqual(table.count, 200 + 4 * 1000)
+        self.assertEqual(len(table.get_all_items()), table.count)
+        for t in range(4):
+            self.assertIsNone(table.search(f"t{t}-0"))
+            self.assertEqual(table.search(f"t{t}-1999"), 1999)
+        self.assertGreater(table.resize_count, 0)
+        self.assertEqual(table.size % table.stripes, 0)
+    
+    def test_concurrent_metadata_store(self):
+        """Test that threaded ingest into a concurrent store loses no postings"""
+        store = VideoMetadataStore(table_type='concurrent')
+        self.assertIsInstance(store.videos, ConcurrentHashTable)
+        
+        def ingest(offset):
+            for i in range(offset, 1200, 4):
+                store.add_video(Video(i, f"Movie {i}", 2000 + i % 5, ["Action"],
+                                      [f"Actor {i % 7}"], ["Director"], ["shared"], i % 10))
+        
+        errors = []
+        done = threading.Event()
+        
+        def read():
+            # Short substrings match over every trigram while ingest adds new ones
+            while not done.is_set():
+                try:
+                    store.search_by_substring('title', '1')
+                except Exception as e:
+                    errors.append(e)
+                    return
+        
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=ingest, args=(t,)) for t in range(4)]
+            readers = [threading.Thread(target=read) for _ in range(2)]
+            for thread in threads + readers:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            done.set()
+            for thread in readers:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(store.get_video_count(), 1200)
+        self.assertEqual(len(store.get_postings('genre', 'action')), 1200)
+        self.assertEqual(list(store.director_index.search('director')), list(range(1200)))
+        self.assertEqual(len(store.search_by_keyword("shared")), 1200)
+        self.assertEqual(len(store.search_by_year_range(2000, 2004)), 1200)
+    
+    def test_metadata_store_table_type(self):
+        """Test selecting the hash table implementation for the store"""
+        store = VideoMetadataStore(table_type='open_addressing')
+        self.assertIsInstance(store.videos, OpenAddressingHashTable)
+        
+        store.add_video(Video(1, "Test Movie", 2023, ["Action"],
+                              ["Test Actor"], ["Test Director"], ["test"], 8.0))
+        self.assertEqual(store.get_video(1).title, "Test Movie")
+        self.assertEqual(len(store.search_by_actor("Test Actor")), 1)
+        
+        with self.assertRaises(ValueError):
+            VideoMetadataStore(table_type='unknown')
+    
     def test_video_metadata_store(self):
         """Test video metadata store functionality"""
         video = Video(1, "Test Movie", 2023, ["Action"], 
@@ -339,6 +852,267 @@ class TestHashTable(unittest.TestCase):
         
         year_results = self.metadata_store.search_by_year(2023)
         self.assertEqual(len(year_results), 1)
+    
+    def test_video_slots(self):
+        """Test that Video records use __slots__ instead of a __dict__"""
+        video = Video(1, "Test Movie", 2023, "Action", "Test Actor", "Test Director", "test", 8.0)
+        self.assertFalse(hasattr(video, '__dict__'))
+        self.assertEqual(video.genre, ["Action"])
+    
+    def test_columnar_metadata_store(self):
+        """Test that columnar storage materializes equivalent videos"""
+        store = VideoMetadataStore(columnar=True)
+        videos = [
+            Video(1, "Test Movie", 2023, ["Action", "Drama"], ["Test Actor"],
+                  ["Test Director"], ["test"], 8.5, "First"),
+            Video(2, "Other Movie", 1999, ["Drama"], ["Test Actor", "Other Actor"],
+                  ["Test Director"], [], 6.25, "Second")
+        ]
+        for video in videos:
+            store.add_video(video)
+        
+        for video in videos:
+            self.assertEqual(store.get_video(video.video_id).to_dict(), video.to_dict())
+        self.assertIsNone(store.get_video(3))
+        self.assertIsInstance(store.videos.search(1), int)
+        
+        self.assertEqual(len(store.search_by_actor("Test Actor")), 2)
+        self.assertEqual(store.search_by_year(1999)[0].title, "Other Movie")
+        self.assertEqual(sorted(v.video_id for v in store.get_all_videos()), [1, 2])
+        
+        # Repeated names are stored once in the string pool
+        self.assertEqual(store.column_store.pool.strings.count("Test Actor"), 1)
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test cases for memory-mapped metadata snapshots"""
+    
+    def setUp(self):
+        self.store = VideoMetadataStore()
+        self.store.add_video(Video(2, "The Godfather", 1972, ["Drama", "Crime"],
+                                   ["Marlon Brando", "Al Pacino"], ["Francis Ford Coppola"],
+                                   ["mafia", "family"], 9.2, "Crime family saga"))
+        self.store.add_video(Video(1, "The Matrix", 1999, ["Action", "Sci-Fi"],
+                                   ["Keanu Reeves"], ["Lana Wachowski"], [], 8.7))
+        self.store.add_video(Video(3, "Amélie", 2001, ["Comedy", "Romance"],
+                                   ["Audrey Tautou"], ["Jean-Pierre Jeunet"], ["paris"], 8.3))
+        
+        handle, self.path = tempfile.mkstemp(suffix='.snapshot')
+        os.close(handle)
+        save_snapshot(self.store, self.path)
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def test_snapshot_round_trip(self):
+        """Test that mapped lookups return the same videos as the source store"""
+        with MappedVideoStore(self.path) as mapped:
+            self.assertEqual(mapped.get_video_count(), 3)
+            for video_id in (1, 2, 3):
+                self.assertEqual(mapped.get_video(video_id).to_dict(),
+                                 self.store.get_video(video_id).to_dict())
+            self.assertIsNone(mapped.get_video(4))
+            self.assertEqual(sorted(v.video_id for v in mapped.get_all_videos()), [1, 2, 3])
+    
+    def test_snapshot_indexes(self):
+        """Test index and range queries answered from the mapped file"""
+        with MappedVideoStore(self.path) as mapped:
+            self.assertEqual([v.title for v in mapped.search_by_actor("Al Pacino")], ["The Godfather"])
+            self.assertEqual([v.video_id for v in mapped.search_by_genre("drama")], [2])
+            self.assertEqual([v.video_id for v in mapped.search_by_director("Lana Wachowski")], [1])
+            self.assertEqual([v.video_id for v in mapped.search_by_keyword("Paris")], [3])
+            self.assertEqual([v.video_id for v in mapped.search_by_year(1999)], [1])
+            self.assertEqual(mapped.search_by_actor("Nobody"), [])
+            self.assertEqual(mapped.search_by_year_range(1990, 2005), {1, 3})
+            self.assertEqual(mapped.search_by_year_range(1999, 1999), {1})
+            self.assertEqual(mapped.search_by_year_range(1800, 1900), set())
+            self.assertEqual(mapped.search_by_year_range(1900, 2100), {1, 2, 3})
+            self.assertEqual(mapped.search_by_min_rating(8.7), {1, 2})
+    
+    def test_invalid_snapshot(self):
+        """Test that files that are not snapshots are rejected"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot' * 20)
+        with self.assertRaises(ValueError):
+            MappedVideoStore(self.path)
+
+
+class TestPostingList(unittest.TestCase):
+    """Test cases for posting list implementation"""
+    
+    def test_add_keeps_ids_sorted_and_unique(self):
+        """Test in-order appends, out-of-order inserts and duplicates"""
+        postings = PostingList()
+        for video_id in [1, 5, 9, 3, 7, 5, 1]:
+            postings.add(video_id)
+        
+        self.assertEqual(postings.to_list(), [1, 3, 5, 7, 9])
+        self.assertEqual(len(postings), 5)
+        self.assertIn(7, postings)
+        self.assertNotIn(4, postings)
+        self.assertNotIn(10, postings)
+        self.assertFalse(postings.add(9))
+    
+    def test_discard(self):
+        """Test removing IDs from every posting list encoding"""
+        video_ids = list(range(0, 70000, 7))
+        for cls in (PostingList, CompressedPostingList, BitmapPostingList):
+            postings = cls(video_ids)
+            self.assertTrue(postings.discard(70))
+            self.assertFalse(postings.discard(70))
+            self.assertFalse(postings.discard(71))
+            self.assertNotIn(70, postings)
+            self.assertEqual(postings.to_list(), [i for i in video_ids if i != 70], cls.__name__)
+        
+        # A dense bitmap container reverts to an array once it is sparse enough
+        bitmap = BitmapPostingList(range(5000))
+        for video_id in range(1000):
+            bitmap.discard(video_id)
+        self.assertIsInstance(bitmap.containers[0], array)
+        self.assertEqual(bitmap.to_list(), list(range(1000, 5000)))
+        
+        index = RangeIndex()
+        index.add(1999, 1)
+        index.add(2010, 2)
+        self.assertTrue(index.remove(1999, 1))
+        self.assertFalse(index.remove(1999, 1))
+        self.assertEqual(index.keys, [2010])
+    
+    def test_ngram_index(self):
+        """Test trigram candidates cover every substring, including short ones"""
+        texts = {1: ["The Matrix"], 2: ["Up"], 3: ["Matrimony", "Rix Tam"], 4: ["X"]}
+        index = NGramIndex()
+        for video_id, values in texts.items():
+            index.add(video_id, values)
+        
+        for query in ["matri", "atr", "x", "up", "p", "rix", "the m", "rix tam", "zzz", "mony x"]:
+            expected = [video_id for video_id, values in texts.items()
+                        if any(query in value.lower() for value in values)]
+            candidates = index.candidates(query)
+            self.assertTrue(set(expected) <= set(candidates), query)
+        self.assertEqual(index.candidates("atri"), [1, 3])
+        self.assertEqual(index.candidates("zzz"), [])
+        self.assertIsNone(index.candidates(""))
+        
+        index.remove(3, texts[3])
+        index.remove(2, texts[2])
+        self.assertEqual(index.candidates("atri"), [1])
+        self.assertNotIn("\0up", index.postings)
+    
+    def test_compressed_posting_list(self):
+        """Test delta/varint postings against the plain implementation"""
+        video_ids = [5, 1, 130, 70000, 2, 64, 999, 130] + list(range(200, 600, 3))
+        plain = PostingList(video_ids)
+        compressed = CompressedPostingList(video_ids)
+        
+        self.assertEqual(compressed.to_list(), plain.to_list())
+        self.assertEqual(list(compressed), plain.to_list())
+        self.assertEqual(len(compressed), len(plain))
+        self.assertGreater(len(compressed.skip_ids), 1)
+        for video_id in range(0, 1000):
+            self.assertEqual(video_id in compressed, video_id in plain)
+        self.assertIn(70000, compressed)
+        self.assertFalse(compressed.add(999))
+        self.assertLess(compressed.nbytes(), plain.nbytes())
+        
+        # Short lists carry no skip pointers
+        short = CompressedPostingList([70000, 70005])
+        self.assertEqual(len(short.skip_ids), 0)
+        self.assertEqual(short.nbytes(), 4)
+        self.assertIn(70005, short)
+        self.assertNotIn(69999, short)
+        self.assertNotIn(1, CompressedPostingList())
+    
+    def test_intersect(self):
+        """Test intersecting plain and compressed posting lists"""
+        evens = CompressedPostingList(range(0, 1000, 2))
+        threes = PostingList(range(0, 1000, 3))
+        self.assertEqual(intersect(evens, threes), list(range(0, 1000, 6)))
+        self.assertEqual(intersect(evens, PostingList()), [])
+    
+    def test_compressed_store_indexes(self):
+        """Test selecting compressed postings per index and reporting stats"""
+        store = VideoMetadataStore(posting_types={'keyword': 'compressed', 'actor': 'compressed'})
+        for i in range(1, 301):
+            store.add_video(Video(i, f"Movie {i}", 2000, ["Drama"],
+                                  [f"Actor {i % 3}"], ["Director"], ["common"], 7.0))
+        
+        self.assertIsInstance(store.keyword_index.search("common"), CompressedPostingList)
+        self.assertIsInstance(store.director_index.search("director"), PostingList)
+        self.assertEqual(len(store.search_by_keyword("common")), 300)
+        self.assertEqual(len(store.search_by_actor("Actor 1")), 100)
+        
+        posting_stats = store.get_storage_stats()['postings']
+        self.assertEqual(posting_stats['keyword']['encoding'], 'compressed')
+        self.assertGreater(posting_stats['keyword']['compression_ratio'], 2)
+        self.assertEqual(posting_stats['director']['compression_ratio'], 1)
+        self.assertGreater(posting_stats['keyword']['decode_postings_per_second'], 0)
+        
+        with self.assertRaises(ValueError):
+            VideoMetadataStore(posting_types={'keyword': 'unknown'})
+    
+    def test_bitmap_posting_list(self):
+        """Test bitmap set algebra across sparse and dense containers"""
+        dense = set(range(0, 150000, 3))       # Dense containers
+        sparse = {5, 6, 9, 65536, 65539, 200000}  # Sparse containers
+        dense_bitmap = BitmapPostingList(dense)
+        sparse_bitmap = BitmapPostingList(sorted(sparse, reverse=True))
+        
+        self.assertTrue(any(isinstance(c, bytearray) for c in dense_bitmap.containers.values()))
+        self.assertEqual(sparse_bitmap.to_list(), sorted(sparse))
+        self.assertEqual(len(dense_bitmap), len(dense))
+        self.assertIn(65538, dense_bitmap)
+        self.assertNotIn(65537, dense_bitmap)
+        self.assertFalse(sparse_bitmap.add(9))
+        
+        self.assertEqual((dense_bitmap & sparse_bitmap).to_list(), sorted(dense & sparse))
+        self.assertEqual((dense_bitmap | sparse_bitmap).to_list(), sorted(dense | sparse))
+        self.assertEqual((sparse_bitmap - dense_bitmap).to_list(), sorted(sparse - dense))
+        self.assertEqual(len(dense_bitmap - sparse_bitmap), len(dense - sparse))
+        self.assertEqual((sparse_bitmap & PostingList([6, 7, 200000])).to_list(), [6, 200000])
+        
+        # Array containers combine without passing through dense bitmaps
+        evens = BitmapPostingList(range(0, 6000, 2))
+        odds = BitmapPostingList(range(1, 6000, 2))
+        self.assertIsInstance((evens & sparse_bitmap).containers[0], array)
+        self.assertEqual(len(evens | odds), 6000)
+        self.assertIsInstance((evens | odds).containers[0], bytearray)
+        self.assertEqual(((evens | odds) - odds).to_list(), list(range(0, 6000, 2)))
+        self.assertEqual(len(evens & odds), 0)
+        self.assertEqual((evens - sparse_bitmap).to_list()[:3], [0, 2, 4])
+        self.assertNotIn(6, evens - sparse_bitmap)
+        union = BitmapPostingList.union([evens, odds, sparse_bitmap, dense_bitmap])
+        self.assertEqual(union.to_list(), sorted(set(range(6000)) | sparse | dense))
+        self.assertEqual(len(union), len(set(range(6000)) | sparse | dense))
+        self.assertEqual(BitmapPostingList.union([]).to_list(), [])
+    
+    def test_range_index(self):
+        """Test inclusive and open-ended range queries"""
+        index = RangeIndex()
+        for video_id, year in [(1, 1999), (2, 1972), (3, 2010), (4, 2008), (5, 1994), (6, 2010)]:
+            index.add(year, video_id)
+        
+        self.assertEqual(index.keys, [1972, 1994, 1999, 2008, 2010])
+        self.assertEqual(index.range(1994, 2008), {1, 4, 5})
+        self.assertEqual(index.range(2010), {3, 6})
+        self.assertEqual(index.range(high=1980), {2})
+        self.assertEqual(index.range(2011, 2020), set())
+    
+    def test_store_indexes_use_posting_lists(self):
+        """Test that store indexes are updated in place without duplicates"""
+        store = VideoMetadataStore()
+        video = Video(1, "Test Movie", 2023, ["Drama"],
+                      ["Test Actor"], ["Test Director"], ["test"], 8.0)
+        store.add_video(video)
+        store.add_video(video)
+        store.add_video(Video(2, "Other Movie", 2023, ["Drama"],
+                              ["Other Actor"], ["Test Director"], ["test"], 7.0))
+        
+        director_postings = store.director_index.search("test director")
+        self.assertIsInstance(director_postings, PostingList)
+        self.assertEqual(director_postings.to_list(), [1, 2])
+        self.assertEqual(store.year_index.search(2023).to_list(), [1, 2])
+        self.assertEqual(store.actor_index.search("test actor").to_list(), [1])
 
 
 class TestTrie(unittest.TestCase):
@@ -366,6 +1140,47 @@ class TestTrie(unittest.TestCase):
         self.assertIn("help", results)
         self.assertIn("helicopter", results)
     
+    def test_prefix_search_ranks_by_frequency(self):
+        """Test cached top completions return the most frequent words in order"""
+        trie = Trie(top_k=3)
+        counts = {"car": 1, "cart": 5, "carbon": 3, "care": 4, "cargo": 2, "cat": 6}
+        for word, count in counts.items():
+            for _ in range(count):
+                trie.insert(word)
+        
+        self.assertEqual(trie.search_prefix("car", 3), ["cart", "care", "carbon"])
+        self.assertEqual(trie.search_prefix("ca", 2), ["cat", "cart"])
+        self.assertEqual(trie.auto_complete("car", 1), ["cart"])
+        # Limits above top_k walk the subtree instead
+        self.assertEqual(trie.search_prefix("car", 10), ["cart", "care", "carbon", "cargo", "car"])
+        
+        # Lowering a frequency refills the cached lists from the subtree
+        for _ in range(4):
+            trie.remove("cart")
+        self.assertEqual(trie.search_prefix("car", 3), ["care", "carbon", "cargo"])
+        trie.remove("cart")
+        self.assertEqual(trie.search_prefix("cart", 3), [])
+        self.assertEqual(trie.search_prefix("c", 3), ["cat", "care", "carbon"])
+        
+        trie.insert("cargo")
+        trie.insert("cargo")
+        self.assertEqual(trie.search_prefix("car", 2), ["care", "cargo"])
+    
+    def test_top_completions_match_full_ranking(self):
+        """Test cached lists stay exact when promotion stops at the first unchanged list"""
+        words = [''.join(chars) for length in (1, 2, 3) for chars in itertools.product("abc", repeat=length)]
+        for trie in (Trie(top_k=3), RadixTrie(top_k=3)):
+            counts = dict.fromkeys(words, 0)
+            for step in range(400):
+                word = words[step * 7 % len(words)] if step % 3 else words[step % 5]
+                trie.insert(word)
+                counts[word] += 1
+                if step % 50 == 49:
+                    for prefix in words:
+                        expected = sorted((word for word in counts if word.startswith(prefix) and counts[word]),
+                                          key=lambda word: (-counts[word], word))
+                        self.assertEqual(trie.search_prefix(prefix, 3), expected[:3])
+    
     def test_fuzzy_search(self):
         """Test fuzzy search functionality"""
         self.trie.insert("hello")
@@ -379,6 +1194,32 @@ class TestTrie(unittest.TestCase):
         results = self.trie.fuzzy_search("helo", max_distance=1)
         self.assertIn("hello", results)
     
+    def test_fuzzy_search_matches_edit_distance(self):
+        """Test fuzzy results against a plain edit distance over every word"""
+        def edit_distance(a, b):
+            row = list(range(len(b) + 1))
+            for i, char_a in enumerate(a, 1):
+                previous, row[0] = row[0], i
+                for j, char_b in enumerate(b, 1):
+                    previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char_a != char_b))
+            return row[-1]
+        
+        words = ["hello", "help", "hell", "shell", "yellow", "hallo", "he", "world", "word", "sword"]
+        for word in words:
+            self.trie.insert(word)
+        self.trie.insert("help")  # More frequent, so ranked first among ties
+        
+        for query in ["hello", "helo", "wrld", "xyz", "h", "swordfish"]:
+            for max_distance in range(4):
+                results = self.trie.fuzzy_search(query, max_distance, limit=len(words))
+                expected = [w for w in words if edit_distance(query, w) <= max_distance]
+                self.assertEqual(len(results), len(set(results)))
+                self.assertEqual(sorted(results), sorted(expected), (query, max_distance))
+                distances = [edit_distance(query, w) for w in results]
+                self.assertEqual(distances, sorted(distances))
+        
+        self.assertEqual(self.trie.fuzzy_search("hel", 1)[0], "help")
+    
     def test_wildcard_search(self):
         """Test wildcard search functionality"""
         self.trie.insert("hello")
@@ -391,6 +1232,25 @@ class TestTrie(unittest.TestCase):
         self.assertIn("help", results)
         self.assertNotIn("world", results)
     
+    def test_wildcard_patterns(self):
+        """Test ?, character classes and result limits agree with fnmatch"""
+        words = ["hello", "help", "helm", "hold", "world", "word", "wild", "a", "aa", "abcab"]
+        for word in words:
+            self.trie.insert(word)
+        
+        for pattern in ["h?l*", "*l?", "[hw]o*", "he[!l]*", "*[a-d]", "w[a-o]*d", "*a*b*", "?", "**", "[a"]:
+            expected = sorted(w for w in words if fnmatch.fnmatchcase(w, pattern))
+            self.assertEqual(sorted(self.trie.wildcard_search(pattern)), expected, pattern)
+        
+        self.assertEqual(len(self.trie.wildcard_search("*", limit=3)), 3)
+        
+        # Many stars stay cheap: each node is visited once per pattern
+        for letters in itertools.product("aeiost", repeat=6):
+            self.trie.insert("".join(letters))
+        start_time = time.perf_counter()
+        self.trie.wildcard_search("*a*e*i*o*", limit=10**6)
+        self.assertLess(time.perf_counter() - start_time, 5.0)
+    
     def test_video_trie_system(self):
         """Test video trie system integration"""
         video = Video(1, "The Matrix", 1999, ["Sci-Fi"], 
@@ -405,6 +1265,214 @@ class TestTrie(unittest.TestCase):
         # Test actor search
         actor_results = self.video_trie_system.search_actors("Keanu")
         self.assertGreater(len(actor_results), 0)
+    
+    def test_auto_complete_merges_categories(self):
+        """Test suggestions from every category are merged by frequency, directors included"""
+        self.video_trie_system.add_video_to_tries(Video(1, "Kill Bill", 2003, ["Action"], ["Uma Thurman"],
+                                                        ["Quentin Tarantino"], ["katana"], 8.2))
+        for video_id, title in [(2, "John Wick"), (3, "Speed"), (4, "Point Break")]:
+            self.video_trie_system.add_video_to_tries(Video(video_id, title, 2000, ["Action"], ["Keanu Reeves"],
+                                                            ["Kathryn Bigelow"], ["killer"], 7.0))
+        
+        suggestions = self.video_trie_system.get_auto_complete_suggestions("k", limit=4)
+        self.assertEqual(suggestions, [('actor', 'keanu'), ('actor', 'keanu reeves'),
+                                       ('keyword', 'killer'), ('director', 'kathryn')])
+        self.assertEqual(self.video_trie_system.get_auto_complete_suggestions("ka", limit=3),
+                         [('director', 'kathryn'), ('director', 'kathryn bigelow'), ('keyword', 'katana')])
+        self.assertEqual(self.video_trie_system.get_auto_complete_suggestions("kill", 'title'),
+                         [('title', 'kill'), ('title', 'kill bill')])
+    
+    def test_popular_suggestions_are_lazy(self):
+        """Test popularity ranking reads cached completions before walking any subtree"""
+        popularity = QueryPopularity()
+        for trie_type in ('standard', 'radix'):
+            system = VideoTrieSystem(trie_type)
+            for video_id in range(1, 31):
+                system.add_video_to_tries(Video(video_id, f"Star {video_id:02d}", 2000, ["Sci-Fi"],
+                                                [], [], [], 7.0))
+            popularity.record("star 17")
+            trie = system.title_trie
+            iter_prefix = trie.iter_prefix
+            read = []
+            
+            def counting_iter_prefix(prefix):
+                for word, frequency in iter_prefix(prefix):
+                    read.append(word)
+                    yield word, frequency
+            
+            trie.iter_prefix = counting_iter_prefix
+            self.assertEqual(system.get_auto_complete_suggestions("sta", 'title', 2, popularity),
+                             [('title', 'star 17'), ('title', 'star')])
+            self.assertLessEqual(len(read), 2)
+            self.assertEqual(trie.search_prefix("star", 3, popularity), ["star 17", "star", "star 01"])
+            self.assertEqual(len(system.get_auto_complete_suggestions("sta", 'title', 40, popularity)), 31)
+    
+    def test_iter_prefix_walks_deep_subtrees(self):
+        """Test completions past top_k are collected without recursion"""
+        long_title = "x" * (sys.getrecursionlimit() + 100)
+        for i in range(self.trie.top_k):
+            self.trie.insert(f"x{i}")
+            self.trie.insert(f"x{i}")
+        self.trie.insert(long_title)
+        
+        words = [word for word, _ in self.trie.iter_prefix("x")]
+        self.assertEqual(len(words), self.trie.top_k + 1)
+        self.assertEqual(words[-1], long_title)
+    
+    def test_remove_prunes_branches(self):
+        """Test removal keeps shared prefixes and prunes dead branches"""
+        self.trie.insert("help", 1)
+        self.trie.insert("helpful", 2)
+        self.trie.insert("helpful", 3)
+        nodes_before = self.trie.get_stats()['node_count']
+        
+        self.assertTrue(self.trie.remove("helpful", 2))
+        self.assertEqual(self.trie.get_video_ids_for_word("helpful"), [3])
+        self.assertTrue(self.trie.remove("helpful", 3))
+        self.assertFalse(self.trie.search_exact("helpful"))
+        self.assertFalse(self.trie.remove("helpful", 3))
+        self.assertTrue(self.trie.search_exact("help"))
+        self.assertEqual(self.trie.word_count, 1)
+        self.assertEqual(self.trie.get_stats()['node_count'], nodes_before - 3)
+        
+        self.assertTrue(self.trie.remove("help", 1))
+        self.assertEqual(self.trie.root.children, {})
+        self.assertEqual(self.trie.word_count, 0)
+    
+    def test_stats_are_maintained_incrementally(self):
+        """Test stats track inserts and removals without walking deep tries"""
+        for trie in (self.trie, RadixTrie()):
+            trie.insert("star", 1)
+            trie.insert("start", 2)
+            trie.insert("stars wars", 3)
+            trie.bulk_insert([("stargate", 1, [4]), ("zoo", 1, [5])])
+            self.assertEqual(trie.get_stats()['max_depth'], 10)
+            
+            trie.remove("stars wars", 3)
+            self.assertEqual(trie.get_stats()['max_depth'], 8)
+            trie.remove("stargate", 4)
+            self.assertEqual(trie.word_lengths, [0, 0, 0, 1, 1, 1])
+            self.assertEqual(trie.get_stats()['word_length_histogram'], {3: 1, 4: 1, 5: 1})
+            
+            # Deeper than the recursion limit
+            long_title = "x" * (sys.getrecursionlimit() + 100)
+            trie.insert(long_title, 6)
+            stats = trie.get_stats()
+            self.assertEqual(stats['max_depth'], len(long_title))
+            self.assertEqual(stats['word_count'], 4)
+            trie.remove(long_title, 6)
+            self.assertEqual(trie.get_stats()['max_depth'], 5)
+        
+        self.assertEqual(self.trie.get_stats()['node_count'], 9)
+    
+    def test_radix_trie_matches_trie(self):
+        """Test the radix trie answers like Trie with far fewer nodes"""
+        radix = RadixTrie()
+        words = ["the matrix", "the matrix reloaded", "matrix", "the", "thematic",
+                 "inception", "interstellar", "in", "inter"]
+        for video_id, word in enumerate(words, 1):
+            self.trie.insert(word, video_id)
+            radix.insert(word, video_id)
+        radix.insert("matrix", 10)
+        self.trie.insert("matrix", 10)
+        
+        for query in ["the", "the m", "in", "inte", "x", "matrix"]:
+            self.assertEqual(radix.search_prefix(query), self.trie.search_prefix(query))
+            self.assertEqual(radix.search_exact(query), self.trie.search_exact(query))
+            self.assertEqual(radix.get_video_ids_for_word(query), self.trie.get_video_ids_for_word(query))
+        for query in ["matirx", "intr", "the"]:
+            self.assertEqual(radix.fuzzy_search(query), self.trie.fuzzy_search(query))
+        for pattern in ["the*", "*matrix*", "in*r", "*"]:
+            self.assertEqual(sorted(radix.wildcard_search(pattern)),
+                             sorted(self.trie.wildcard_search(pattern)))
+        
+        radix_stats = radix.get_stats()
+        trie_stats = self.trie.get_stats()
+        self.assertEqual(radix_stats['word_count'], trie_stats['word_count'])
+        self.assertEqual(radix_stats['max_depth'], trie_stats['max_depth'])
+        self.assertLess(radix_stats['node_count'], trie_stats['node_count'] / 3)
+        
+        # Removing words merges single-child chains back together
+        for video_id, word in enumerate(words, 1):
+            radix.remove(word, video_id)
+        self.assertEqual(radix.search_prefix("m"), ["matrix"])
+        self.assertEqual(radix.get_stats()['node_count'], 2)
+        
+        with self.assertRaises(ValueError):
+            VideoTrieSystem('unknown')
+    
+    def test_bulk_add_matches_per_video_inserts(self):
+        """Test the sorted bulk-load path builds the same tries as add_video_to_tries"""
+        videos = [
+            Video(1, "The Matrix", 1999, ["Sci-Fi"], ["Keanu Reeves"], ["Lana Wachowski"], ["virtual"], 8.7),
+            Video(2, "The Matrix Reloaded", 2003, ["Sci-Fi"], ["Keanu Reeves"], ["Lana Wachowski"], ["sequel"], 7.2),
+            Video(3, "Them", 1954, ["Horror", "Sci-Fi"], ["James Whitmore"], ["Gordon Douglas"], ["ants"], 7.1),
+            Video(4, "The The", 2000, ["Drama"], ["Keanu Reeves"], ["Gordon Douglas"], ["the"], 6.0)
+        ]
+        for trie_type in ('standard', 'radix'):
+            one_by_one = VideoTrieSystem(trie_type)
+            bulk = VideoTrieSystem(trie_type)
+            # Bulk loads merge into what is already there
+            one_by_one.add_video_to_tries(videos[0])
+            bulk.add_video_to_tries(videos[0])
+            for video in videos[1:]:
+                one_by_one.add_video_to_tries(video)
+            bulk.bulk_add_videos(videos[1:])
+            
+            for name in ('title', 'actor', 'genre', 'keyword', 'director'):
+                expected, actual = one_by_one._tries[name], bulk._tries[name]
+                self.assertEqual(list(actual.items()), list(expected.items()), name)
+                self.assertEqual(actual.word_count, expected.word_count)
+            self.assertEqual(bulk.search_titles("the"), one_by_one.search_titles("the"))
+            self.assertEqual(bulk.title_trie.get_video_ids_for_word("the"), [1, 2, 4])
+            self.assertEqual(bulk.get_system_stats(), one_by_one.get_system_stats())
+    
+    def test_frozen_trie(self):
+        """Test a frozen trie answers like the trie it came from and shares suffixes"""
+        words = {"walking": 3, "talking": 1, "walked": 2, "talked": 5, "walk": 4, "talk": 1}
+        for video_id, (word, count) in enumerate(words.items(), 1):
+            for _ in range(count):
+                self.trie.insert(word, video_id)
+        frozen = self.trie.freeze()
+        
+        for query in ["walk", "ta", "talking", "x"]:
+            self.assertEqual(frozen.search_prefix(query), self.trie.search_prefix(query))
+            self.assertEqual(frozen.search_exact(query), self.trie.search_exact(query))
+            self.assertEqual(frozen.get_video_ids_for_word(query), self.trie.get_video_ids_for_word(query))
+        self.assertEqual(sorted(frozen.fuzzy_search("wakled")), sorted(self.trie.fuzzy_search("wakled")))
+        self.assertEqual(sorted(frozen.wildcard_search("?alk*")), sorted(self.trie.wildcard_search("?alk*")))
+        self.assertEqual(list(frozen.items()), list(self.trie.items()))
+        
+        # walk/talk share every node after the first letter and all words
+        # end in one leaf: 9 nodes against 19 in the trie
+        self.assertEqual(frozen.get_stats()['node_count'], 9)
+        self.assertEqual(self.trie.get_stats()['node_count'], 19)
+        self.assertEqual(frozen.get_stats()['word_count'], 6)
+        with self.assertRaises(TypeError):
+            frozen.insert("walker")
+    
+    def test_frozen_trie_system_save_and_load(self):
+        """Test a frozen trie system round-trips through a memory-mapped file"""
+        video = Video(1, "The Matrix", 1999, ["Sci-Fi"], ["Keanu Reeves"], ["Wachowski"], ["virtual"], 8.7)
+        self.video_trie_system.add_video_to_tries(video)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tries.bin")
+            self.video_trie_system.save_frozen(path)
+            self.assertEqual(self.video_trie_system.trie_type, 'frozen')
+            with self.assertRaises(TypeError):
+                self.video_trie_system.add_video_to_tries(video)
+            
+            loaded = VideoTrieSystem.load_frozen(path)
+            self.assertEqual(loaded.search_titles("the matrix", 'exact'), [1])
+            self.assertEqual(loaded.search_actors("keanu"), ["keanu", "keanu reeves"])
+            self.assertEqual(loaded.get_system_stats(), self.video_trie_system.get_system_stats())
+            loaded.close()
+            
+            with open(path, 'wb') as f:
+                f.write(b'junk')
+            with self.assertRaises(ValueError):
+                VideoTrieSystem.load_frozen(path)
 
 
 class TestGraph(unittest.TestCase):
@@ -476,6 +1544,99 @@ class TestGraph(unittest.TestCase):
         self.assertGreater(stats['total_nodes'], 0)
 
 
+class TestSpellingIndex(unittest.TestCase):
+    """Test cases for the symmetric-delete spelling index"""
+    
+    def levenshtein(self, a, b):
+        previous = list(range(len(b) + 1))
+        for i, char_a in enumerate(a, 1):
+            current = [i]
+            for j, char_b in enumerate(b, 1):
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+            previous = current
+        return previous[-1]
+    
+    def test_lookup_matches_edit_distance(self):
+        """Test lookups find exactly the words within the distance, long words included"""
+        words = ["".join(letters) for length in (1, 2, 3, 9)
+                 for letters in itertools.product("ab", repeat=length)]
+        for max_distance in (1, 2):
+            index = SpellingIndex(max_distance, prefix_length=4)
+            for word in words:
+                index.add(word)
+            for query in ["a", "ba", "bbb", "abababab", "aaaaaaaaaa", "bbbbabbbb"]:
+                for distance in range(max_distance + 1):
+                    found = {word: d for word, d, _ in index.lookup(query, distance, limit=len(words))}
+                    expected = {word: self.levenshtein(query, word) for word in words
+                                if self.levenshtein(query, word) <= distance}
+                    self.assertEqual(found, expected)
+    
+    def test_ranking_and_removal(self):
+        """Test results rank by distance then count, and removed words stop matching"""
+        index = SpellingIndex(2)
+        index.add("matrix", 3)
+        index.add("matrix reloaded")
+        index.add("mattress")
+        index.add("metrix", 5)
+        self.assertEqual(index.lookup("matrx"), [("matrix", 1, 3), ("metrix", 2, 5)])
+        self.assertEqual(index.lookup("matrx", 1), [("matrix", 1, 3)])
+        self.assertEqual(index.lookup("matrix relaoded"), [("matrix reloaded", 2, 1)])
+        
+        entries = index.get_stats()['entry_count']
+        self.assertTrue(index.remove("matrix", 2))
+        self.assertEqual(index.lookup("matrx", 1), [("matrix", 1, 1)])
+        self.assertTrue(index.remove("matrix"))
+        self.assertFalse(index.remove("matrix"))
+        self.assertEqual(index.lookup("matrx", 1), [])
+        self.assertLess(index.get_stats()['entry_count'], entries)
+        self.assertEqual(sum(len(words) for words in index.deletes.values()), index.entry_count)
+
+
+class TestQueryPopularity(unittest.TestCase):
+    """Test cases for query popularity tracking"""
+    
+    def setUp(self):
+        self.now = [0.0]
+        self.popularity = QueryPopularity(capacity=5, width=1024, half_life=60.0, clock=lambda: self.now[0])
+    
+    def test_heavy_hitters_in_bounded_memory(self):
+        """Test frequent queries stay tracked while thousands of rare ones pass through"""
+        for i in range(3000):
+            if i % 10 == 0:
+                self.popularity.record("The Matrix")
+            if i % 20 == 0:
+                self.popularity.record("the godfather ")
+            self.popularity.record(f"rare query {i}")
+        
+        stats = self.popularity.get_stats()
+        self.assertEqual(stats['tracked_queries'], 5)
+        self.assertEqual(stats['total_recorded'], 3450)
+        self.assertLessEqual(len(self.popularity._heap), 4 * 5 + 1)
+        top = self.popularity.top_queries("the", limit=2)
+        self.assertEqual([query for query, _ in top], ["the matrix", "the godfather"])
+        # Count-min estimates never undercount and collisions stay small
+        self.assertGreaterEqual(self.popularity.score("the matrix"), 300)
+        self.assertLess(self.popularity.score("the matrix"), 330)
+    
+    def test_time_decay(self):
+        """Test searches lose half their weight every half-life"""
+        for _ in range(8):
+            self.popularity.record("inception")
+        self.now[0] = 60.0
+        self.assertAlmostEqual(self.popularity.score("inception"), 4.0)
+        for _ in range(4):
+            self.popularity.record("interstellar")
+        self.now[0] = 120.0
+        self.assertAlmostEqual(self.popularity.score("interstellar"), 2.0)
+        
+        # Weights are rescaled long before they overflow
+        self.now[0] = 60.0 * 45
+        self.popularity.record("inception")
+        self.assertAlmostEqual(self.popularity.score("inception"), 1.0)
+        self.assertLess(max(max(row) for row in self.popularity.sketch.rows), 2.0)
+        self.assertEqual(self.popularity.top_queries("in", limit=1)[0][0], "inception")
+
+
 class TestPerformance(unittest.TestCase):
     """Performance and stress tests"""
     
@@ -541,6 +1702,8 @@ def run_all_tests():
     test_classes = [
         TestVideoSearchSystem,
         TestHashTable,
+        TestPostingList,
+        TestSnapshot,
         TestTrie,
         TestGraph,
         TestPerformance
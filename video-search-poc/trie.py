@@ -4,6 +4,124 @@ Enhanced Trie implementation for Video Search Platform
 Supports prefix matching, fuzzy search, auto-complete, and wildcard searching
 """
 
+import gc
+import heapq
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from itertools import islice
+from spelling import SpellingIndex
+
+
+def _compile_wildcard(pattern):
+    """Compile a wildcard pattern into a bit-parallel matcher
+
+    Supports * (any run of characters), ? (any one character) and character
+    classes such as [aeiou], [a-f] or [!0-9]. Returns (start, accept, step):
+    a state is a bit mask of the pattern tokens reachable along a path, so
+    every (node, token) pair is visited at most once however many '*' the
+    pattern has, and step(states, char) advances the mask by one character.
+    """
+    tokens = []  # '*', '?', a literal character, or a (negated, chars, ranges) class
+    i = 0
+    while i < len(pattern):
+        end = pattern.find(']', i + 2) if pattern[i] == '[' else -1
+        if end == -1:
+            tokens.append(pattern[i])
+            i += 1
+            continue
+        body = pattern[i + 1:end]
+        negated = body[0] in '!^' and len(body) > 1
+        if negated:
+            body = body[1:]
+        chars, ranges = set(), []
+        j = 0
+        while j < len(body):
+            if j + 2 < len(body) and body[j + 1] == '-':
+                ranges.append((body[j], body[j + 2]))
+                j += 3
+            else:
+                chars.add(body[j])
+                j += 1
+        tokens.append((negated, frozenset(chars), tuple(ranges)))
+        i = end + 1
+    
+    stars = [i for i, token in enumerate(tokens) if token == '*']
+    star_mask = sum(1 << i for i in stars)
+    any_mask = sum(1 << i for i, token in enumerate(tokens) if token == '?')
+    literal_masks = {}
+    classes = []
+    for i, token in enumerate(tokens):
+        if isinstance(token, tuple):
+            classes.append((1 << i,) + token)
+        elif token not in ('*', '?'):
+            literal_masks[token] = literal_masks.get(token, 0) | (1 << i)
+    char_masks = {}
+    
+    def _skip_stars(states):
+        # A '*' may also match nothing
+        for i in stars:
+            if states >> i & 1:
+                states |= 1 << (i + 1)
+        return states
+    
+    def step(states, char):
+        mask = char_masks.get(char)
+        if mask is None:
+            mask = literal_masks.get(char, 0) | any_mask
+            for bit, negated, chars, ranges in classes:
+                if (char in chars or any(low <= char <= high for low, high in ranges)) != negated:
+                    mask |= bit
+            char_masks[char] = mask
+        # A '*' consumes the character and stays; anything else moves on
+        return _skip_stars((states & star_mask) | ((states & mask) << 1))
+    
+    return _skip_stars(1), 1 << len(tokens), step
+
+
+def _iter_by_popularity(trie, prefix, popularity):
+    """Yield completions of prefix ranked by recent search traffic, as (word, frequency, score)
+
+    Tracked popular queries under the prefix that are words of this trie
+    come first, by popularity score with insert frequency breaking ties.
+    The other completions follow with a score of 0 in the trie's own
+    frequency order, which is only walked as far as the caller reads.
+    """
+    popular = []
+    for query, _ in popularity.top_queries(prefix, popularity.capacity):
+        if trie.search_exact(query):
+            popular.append((query, trie.get_frequency(query), popularity.score(query)))
+    popular.sort(key=lambda entry: (-entry[2], -entry[1], entry[0]))
+    yield from popular
+    
+    seen = {word for word, _, _ in popular}
+    for word, frequency in trie.iter_prefix(prefix):
+        if word not in seen:
+            yield word, frequency, 0.0
+
+
+def _count_length(lengths, length):
+    """Add one word of the given length to a histogram of word lengths"""
+    if length >= len(lengths):
+        lengths.extend([0] * (length + 1 - len(lengths)))
+    lengths[length] += 1
+
+
+def _uncount_length(lengths, length):
+    """Remove one word of the given length, trimming empty lengths off the end"""
+    lengths[length] -= 1
+    while len(lengths) > 1 and not lengths[-1]:
+        lengths.pop()
+
+
+def _length_histogram(lengths):
+    """Word counts keyed by length, leaving out lengths no word has"""
+    return {length: count for length, count in enumerate(lengths) if count}
+
+
 class TrieNode:
     """Node class for the Trie data structure"""
     def __init__(self):
@@ -11,12 +129,72 @@ class TrieNode:
         self.is_end = False
         self.video_ids = []  # Store video IDs for words that end here
         self.frequency = 0   # Track frequency of searches for this word
+        self.top_completions = []  # Best (-frequency, word) pairs in this subtree, sorted
 
 class Trie:
-    """Enhanced Trie with fuzzy matching and auto-complete capabilities"""
-    def __init__(self):
+    """Enhanced Trie with fuzzy matching and auto-complete capabilities
+
+    Every node caches the top_k most frequent words below it, kept up to
+    date as frequencies change, so prefix completion only has to walk to
+    the prefix node rather than its whole subtree. The node count and a
+    histogram of word lengths are kept up to date the same way, so stats
+    never walk the trie.
+    """
+    def __init__(self, top_k=10):
         self.root = TrieNode()
         self.word_count = 0
+        self.node_count = 1
+        self.word_lengths = [0]  # word_lengths[n] = number of words n characters long
+        self.top_k = top_k
+
+    def _promote(self, path, word, frequency, previous_frequency):
+        """Re-rank a word whose frequency went up in the top lists on its path, deepest first
+
+        An ancestor's list is the top_k of a larger subtree, so once a node
+        neither lists the word nor admits its new entry, no ancestor does.
+        """
+        entry = (-frequency, word)
+        previous = (-previous_frequency, word)
+        top_k = self.top_k
+        for node in reversed(path):
+            top = node.top_completions
+            i = bisect_left(top, previous)
+            if i < len(top) and top[i] == previous:
+                del top[i]
+            elif len(top) >= top_k and entry >= top[-1]:
+                break
+            if len(top) < top_k or entry < top[-1]:
+                insort(top, entry)
+                del top[top_k:]
+
+    def _demote(self, path, word):
+        """Rebuild top lists holding a word whose frequency went down, deepest first
+
+        path[i] is the node for word[:i]. A node whose list does not hold the
+        word already has top_k better words, and so do all of its ancestors,
+        so the walk stops there.
+        """
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if not any(listed_word == word for _, listed_word in node.top_completions):
+                break
+            self._refresh_top(node, word[:depth])
+
+    def _refresh_top(self, node, word):
+        """Recompute the top list of the node spelling word from its children's lists"""
+        children = node.children
+        if not node.is_end and len(children) == 1:
+            # Inside a chain of single-child nodes the list is the child's
+            for child in children.values():
+                node.top_completions = child.top_completions[:]
+            return
+        top = [(-node.frequency, word)] if node.is_end else []
+        for child in children.values():
+            top.extend(child.top_completions)
+        if children:
+            top.sort()
+            del top[self.top_k:]
+        node.top_completions = top
 
     def insert(self, word, video_id=None):
         """Insert word into trie with optional video ID association"""
@@ -25,21 +203,120 @@ class Trie:
         
         word = word.lower().strip()
         node = self.root
+        path = [node]
         
         for char in word:
             if char not in node.children:
                 node.children[char] = TrieNode()
+                self.node_count += 1
             node = node.children[char]
+            path.append(node)
         
         if not node.is_end:
             self.word_count += 1
+            _count_length(self.word_lengths, len(word))
         
         node.is_end = True
         node.frequency += 1
+        self._promote(path, word, node.frequency, node.frequency - 1)
         
         if video_id and video_id not in node.video_ids:
             node.video_ids.append(video_id)
 
+    def bulk_insert(self, entries):
+        """Insert (word, count, distinct video_ids) groups, given in sorted word order
+
+        Same result as inserting each word count times, once per video ID,
+        but each word only walks the part it does not share with the one
+        before, ID lists are deduplicated with a set rather than scanned,
+        and a node's top completions are rebuilt once, when the sorted
+        order moves past its subtree. Out-of-order entries are still
+        handled correctly, just with more rebuilds.
+        """
+        path = [self.root]  # path[i] is the node for previous[:i]
+        previous = ""
+        
+        for word, count, video_ids in entries:
+            word = word.lower().strip()
+            if not word:
+                continue
+            common = 0
+            limit = min(len(word), len(previous))
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            # Nothing later in the batch falls below the nodes left behind
+            while len(path) > common + 1:
+                node = path.pop()
+                self._refresh_top(node, previous[:len(path)])
+            
+            node = path[-1]
+            for char in word[common:]:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = TrieNode()
+                    self.node_count += 1
+                node = child
+                path.append(node)
+            
+            if not node.is_end:
+                self.word_count += 1
+                _count_length(self.word_lengths, len(word))
+            node.is_end = True
+            node.frequency += count
+            if node.video_ids:
+                known = set(node.video_ids)
+                node.video_ids.extend(video_id for video_id in video_ids if video_id not in known)
+            else:
+                node.video_ids = list(video_ids)
+            previous = word
+        
+        while path:
+            node = path.pop()
+            self._refresh_top(node, previous[:len(path)])
+
+    def remove(self, word, video_id=None):
+        """Undo one insert of word, optionally dropping a video ID from it
+
+        The word stays in the trie while it still has video IDs or inserts
+        left; once it has neither it is unmarked and any branch that no
+        longer leads to a word is pruned.
+        """
+        if not word:
+            return False
+        
+        word = word.lower().strip()
+        node = self.root
+        path = [node]
+        
+        for char in word:
+            if char not in node.children:
+                return False
+            node = node.children[char]
+            path.append(node)
+        
+        if not node.is_end:
+            return False
+        
+        if video_id and video_id in node.video_ids:
+            node.video_ids.remove(video_id)
+        node.frequency = max(0, node.frequency - 1)
+        
+        if not node.frequency and not node.video_ids:
+            node.is_end = False
+            self.word_count -= 1
+            _uncount_length(self.word_lengths, len(word))
+            
+            # Prune nodes that no longer lead to any word
+            for depth in range(len(word), 0, -1):
+                child = path[depth]
+                if child.is_end or child.children:
+                    break
+                del path[depth - 1].children[word[depth - 1]]
+                self.node_count -= 1
+        
+        self._demote(path, word)
+        return True
+
     def search_exact(self, word):
         """Search for exact word match"""
         if not word:
@@ -55,10 +332,25 @@ class Trie:
         
         return node.is_end
 
-    def search_prefix(self, prefix, limit=10):
-        """Find all words with given prefix, limited by count"""
+    def search_prefix(self, prefix, limit=10, popularity=None):
+        """Find the most frequent words with given prefix, limited by count
+
+        With a QueryPopularity, words are ranked by recent searches instead.
+        """
         if not prefix:
             return []
+        if popularity is not None:
+            return [word for word, _, _ in islice(_iter_by_popularity(self, prefix, popularity), limit)]
+        return [word for word, _ in islice(self.iter_prefix(prefix), limit)]
+
+    def iter_prefix(self, prefix):
+        """Yield (word, frequency) for words with given prefix, most frequent first
+
+        The prefix node's cached top completions come first; the subtree is
+        only walked if the caller keeps asking after top_k of them.
+        """
+        if not prefix:
+            return
         
         prefix = prefix.lower().strip()
         node = self.root
@@ -66,86 +358,136 @@ class Trie:
         # Navigate to the prefix
         for char in prefix:
             if char not in node.children:
-                return []
+                return
             node = node.children[char]
         
-        # Collect all words with this prefix
-        words = self._collect_words(node, prefix, limit)
-        
-        # Sort by frequency (most searched first)
-        words.sort(key=lambda x: x[1], reverse=True)
+        top = node.top_completions
+        for negated_frequency, word in top:
+            yield word, -negated_frequency
+        if len(top) < self.top_k:
+            return
         
-        return [word for word, freq in words[:limit]]
+        # Collect all words with this prefix, most searched first
+        words = self._collect_words(node, prefix)
+        words.sort(key=lambda x: (-x[1], x[0]))
+        yield from words[len(top):]
 
-    def _collect_words(self, node, prefix, limit, collected=None):
-        """Helper method to collect words from a node"""
-        if collected is None:
-            collected = []
-        
-        if len(collected) >= limit:
-            return collected
-        
-        if node.is_end:
-            collected.append((prefix, node.frequency))
+    def _collect_words(self, node, prefix):
+        """Helper method to collect (word, frequency) pairs below a node
+
+        Walks with an explicit stack, so titles longer than the recursion
+        limit are collected like any other.
+        """
+        collected = []
+        stack = [(node, prefix)]
         
-        for char, child_node in node.children.items():
-            if len(collected) >= limit:
-                break
-            self._collect_words(child_node, prefix + char, limit, collected)
+        while stack:
+            node, prefix = stack.pop()
+            if node.is_end:
+                collected.append((prefix, node.frequency))
+            for char, child in node.children.items():
+                stack.append((child, prefix + char))
         
         return collected
 
-    def auto_complete(self, partial_word, limit=5):
-        """Provide auto-complete suggestions"""
-        suggestions = self.search_prefix(partial_word, limit)
+    def auto_complete(self, partial_word, limit=5, popularity=None):
+        """Provide auto-complete suggestions, optionally ranked by search popularity"""
+        suggestions = self.search_prefix(partial_word, limit, popularity)
         return suggestions
 
-    def fuzzy_search(self, word, max_distance=2):
-        """Fuzzy search allowing for character insertions, deletions, and substitutions"""
+    def fuzzy_search(self, word, max_distance=2, limit=10):
+        """Fuzzy search allowing for character insertions, deletions, and substitutions
+
+        Runs a bit-parallel Levenshtein automaton over the trie. For each
+        distance d <= max_distance a bit mask records which prefixes of the
+        query are within d edits of the current trie path; bit i stands for
+        the first i query characters. A child's masks are derived from its
+        parent's with a few shifts and ANDs, so words sharing a prefix share
+        the work. Once every edit is spent the rest of the path is forced, so
+        the remaining query suffixes are looked up directly rather than
+        exploring the subtree. Each word is reported once with its true edit
+        distance.
+        """
         if not word:
             return []
         
         word = word.lower().strip()
+        length = len(word)
+        full = (1 << (length + 1)) - 1
+        accept = 1 << length
         results = []
         
-        def _fuzzy_helper(node, target, current_word, distance):
-            if distance > max_distance:
-                return
-            
-            # If we've matched the target word
-            if not target and node.is_end:
-                results.append((current_word, distance))
-                return
-            
-            # If we've processed all characters in target
-            if not target:
-                if node.is_end:
-                    results.append((current_word, distance))
-                return
-            
-            # Try all possible operations
-            for char, child_node in node.children.items():
-                # Exact match
-                if target and char == target[0]:
-                    _fuzzy_helper(child_node, target[1:], current_word + char, distance)
-                
-                # Substitution
-                if target:
-                    _fuzzy_helper(child_node, target[1:], current_word + char, distance + 1)
-                
-                # Insertion
-                _fuzzy_helper(child_node, target, current_word + char, distance + 1)
-            
-            # Deletion
-            if target:
-                _fuzzy_helper(node, target[1:], current_word, distance + 1)
+        # Bit i of a character's mask is set where the query has it at position i
+        char_masks = {}
+        for i, char in enumerate(word, 1):
+            char_masks[char] = char_masks.get(char, 0) | (1 << i)
+        
+        # Query suffix left to spell once the bit's prefix has been matched
+        suffixes = {1 << i: word[i:] for i in range(length)}
+        before_accept = accept - 1
         
-        _fuzzy_helper(self.root, word, "", 0)
+        def _follow_suffixes(node, prefix, suffix_starts):
+            # Every edit is spent, so the path can only go on to spell the rest
+            # of the query after a prefix it already matches: look up each such
+            # suffix directly instead of exploring the subtree
+            suffix_starts &= before_accept  # The node itself was already checked
+            while suffix_starts:
+                bit = suffix_starts & -suffix_starts
+                suffix_starts ^= bit
+                suffix = suffixes[bit]
+                target = node
+                for char in suffix:
+                    target = target.children.get(char)
+                    if target is None:
+                        break
+                else:
+                    if target.is_end:
+                        results.append((prefix + suffix, max_distance, target.frequency))
+        
+        # At the root, the first d query characters are d deletions away
+        start = [((1 << (d + 1)) - 1) & full for d in range(max_distance + 1)]
+        distances = range(1, max_distance + 1)
+        if max_distance:
+            stack = [(self.root, "", start)]
+        else:
+            # No edits at all: a plain lookup of the whole query
+            _follow_suffixes(self.root, "", start[0])
+            stack = []
+        
+        while stack:
+            node, prefix, states = stack.pop()
+            first_state = states[0]
+            for char, child in node.children.items():
+                mask = char_masks.get(char, 0)
+                previous = first_state
+                current = (previous << 1) & mask  # Exact matches only
+                child_states = [current]
+                for d in distances:
+                    state = states[d]
+                    # Match at distance d, or one edit on top of distance d - 1:
+                    # insertion (previous), substitution (previous << 1) or
+                    # deletion (current << 1)
+                    current = (((state << 1) & mask) | previous | ((previous | current) << 1)) & full
+                    previous = state
+                    child_states.append(current)
+                
+                # The parent had edits left, so current is never empty: it
+                # contains the parent's mask one edit down via an insertion
+                word_so_far = prefix + char
+                if current & accept and child.is_end:
+                    distance = next(d for d, state in enumerate(child_states) if state & accept)
+                    results.append((word_so_far, distance, child.frequency))
+                if not child.children:
+                    continue
+                if child_states[max_distance - 1]:
+                    stack.append((child, word_so_far, child_states))
+                else:
+                    _follow_suffixes(child, word_so_far, current)
         
         # Sort by edit distance, then by frequency
-        results.sort(key=lambda x: (x[1], -self._get_frequency(x[0])))
+        results.sort(key=lambda x: (x[1], -x[2]))
         
-        return [word for word, distance in results[:10]]
+        return [word for word, distance, frequency in results[:limit]]
 
     def _get_frequency(self, word):
         """Get frequency of a word"""
@@ -156,38 +498,34 @@ class Trie:
             node = node.children[char]
         return node.frequency if node.is_end else 0
 
-    def wildcard_search(self, pattern):
-        """Search with wildcard support (* matches any sequence of characters)"""
+    def wildcard_search(self, pattern, limit=100):
+        """Search with wildcards: * matches any run of characters, ? any one
+
+        Character classes like [aeiou] or [!a-m] are also supported. Stops
+        once limit words have been found.
+        """
         if not pattern:
             return []
         
-        pattern = pattern.lower().strip()
+        start, accept, step = _compile_wildcard(pattern.lower().strip())
         results = []
+        stack = [(self.root, "", start)]
         
-        def _wildcard_helper(node, pattern_idx, current_word):
-            if pattern_idx >= len(pattern):
-                if node.is_end:
-                    results.append(current_word)
-                return
-            
-            char = pattern[pattern_idx]
-            
-            if char == '*':
-                # Match zero or more characters
-                # Try skipping the wildcard
-                _wildcard_helper(node, pattern_idx + 1, current_word)
-                
-                # Try matching one or more characters
-                for child_char, child_node in node.children.items():
-                    _wildcard_helper(child_node, pattern_idx, current_word + child_char)
-                    _wildcard_helper(child_node, pattern_idx + 1, current_word + child_char)
-            else:
-                # Exact character match
-                if char in node.children:
-                    _wildcard_helper(node.children[char], pattern_idx + 1, current_word + char)
+        while stack:
+            node, prefix, states = stack.pop()
+            for char, child in node.children.items():
+                child_states = step(states, char)
+                if not child_states:
+                    continue
+                word_so_far = prefix + char
+                if child_states & accept and child.is_end:
+                    results.append(word_so_far)
+                    if len(results) >= limit:
+                        return results
+                if child.children:
+                    stack.append((child, word_so_far, child_states))
         
-        _wildcard_helper(self.root, 0, "")
-        return list(set(results))  # Remove duplicates
+        return results
 
     def get_video_ids_for_word(self, word):
         """Get all video IDs associated with a word"""
@@ -204,81 +542,1124 @@ class Trie:
         
         return node.video_ids if node.is_end else []
 
+    def get_frequency(self, word):
+        """Get how many times a word was inserted, 0 if it is not in the trie"""
+        if not word:
+            return 0
+        
+        node = self.root
+        for char in word.lower().strip():
+            if char not in node.children:
+                return 0
+            node = node.children[char]
+        
+        return node.frequency if node.is_end else 0
+
+    def items(self):
+        """Yield (word, frequency, video_ids) for every word in sorted order"""
+        stack = [(self.root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if node.is_end:
+                yield prefix, node.frequency, node.video_ids
+            for char in sorted(node.children, reverse=True):
+                stack.append((node.children[char], prefix + char))
+
+    def freeze(self):
+        """Pack the trie into a read-only FrozenTrie"""
+        return FrozenTrie.build(self.items())
+
     def get_stats(self):
-        """Get trie statistics"""
-        node_count = self._count_nodes(self.root)
-        depth = self._max_depth(self.root)
+        """Get trie statistics
+
+        Dead branches are always pruned, so the deepest node ends the
+        longest word and max_depth is read off the word length histogram,
+        which is reported too.
+        """
+        return {
+            'word_count': self.word_count,
+            'node_count': self.node_count,
+            'max_depth': len(self.word_lengths) - 1,
+            'word_length_histogram': _length_histogram(self.word_lengths),
+            'memory_efficiency': self.word_count / self.node_count
+        }
+
+
+class RadixNode:
+    """Node of a RadixTrie, reached by an edge labelled with a whole substring
+
+    Leaves keep children, video_ids and top_completions as None, so a word
+    ending in a leaf costs a single small object.
+    """
+    __slots__ = ('label', 'children', 'is_end', 'video_ids', 'frequency', 'top_completions')
+
+    def __init__(self, label=""):
+        self.label = label
+        self.children = None         # First character of a child's label -> child
+        self.is_end = False
+        self.video_ids = None        # Store video IDs for words that end here
+        self.frequency = 0
+        self.top_completions = None  # As in TrieNode, but only kept on nodes with children
+
+class RadixTrie:
+    """Path-compressed (PATRICIA) trie with the same API as Trie
+
+    Chains of single-child nodes are collapsed into one edge labelled with
+    the whole substring, so a trie of titles and names holds about one
+    node per word rather than one per character. A leaf's top completions
+    are just its own word and are not stored.
+    """
+    def __init__(self, top_k=10):
+        self.root = RadixNode()
+        self.root.children = {}
+        self.root.top_completions = []
+        self.word_count = 0
+        self.node_count = 1
+        self.word_lengths = [0]  # As in Trie: words per length in characters
+        self.top_k = top_k
+
+    @staticmethod
+    def _top_of(node, word):
+        """Top completions below a node whose path spells word"""
+        if node.top_completions is not None:
+            return node.top_completions
+        return [(-node.frequency, word)] if node.is_end else []
+
+    def _promote(self, path, word, frequency, previous_frequency):
+        """Re-rank a word whose frequency went up in the top lists on its path, deepest first
+
+        Stops at the first list that neither holds the word nor admits it,
+        as in Trie.
+        """
+        entry = (-frequency, word)
+        previous = (-previous_frequency, word)
+        top_k = self.top_k
+        for node, _ in reversed(path):
+            top = node.top_completions
+            if top is None:
+                continue
+            i = bisect_left(top, previous)
+            if i < len(top) and top[i] == previous:
+                del top[i]
+            elif len(top) >= top_k and entry >= top[-1]:
+                break
+            if len(top) < top_k or entry < top[-1]:
+                insort(top, entry)
+                del top[top_k:]
+
+    def _demote(self, path, word):
+        """Rebuild top lists holding a word whose frequency went down, deepest first"""
+        for node, node_word in reversed(path):
+            top = node.top_completions
+            if top is None:
+                continue
+            if not any(listed_word == word for _, listed_word in top):
+                break
+            candidates = [self._top_of(child, node_word + child.label)
+                          for child in node.children.values()]
+            if node.is_end:
+                candidates.append([(-node.frequency, node_word)])
+            node.top_completions = heapq.nsmallest(self.top_k, heapq.merge(*candidates))
+
+    def _find_path(self, word):
+        """(node, word so far) pairs down to the node spelling word, or None"""
+        node = self.root
+        path = [(node, "")]
+        position = 0
+        
+        while position < len(word):
+            child = node.children.get(word[position]) if node.children else None
+            if child is None or not word.startswith(child.label, position):
+                return None
+            position += len(child.label)
+            node = child
+            path.append((node, word[:position]))
+        
+        return path
+
+    def insert(self, word, video_id=None):
+        """Insert word into trie with optional video ID association"""
+        self._insert(word, 1, [video_id] if video_id else ())
+
+    def bulk_insert(self, entries):
+        """Insert (word, count, video_ids) groups, walking each word once"""
+        for word, count, video_ids in entries:
+            self._insert(word, count, video_ids)
+
+    def _insert(self, word, count, video_ids):
+        """Add count to a word's frequency and merge in new video IDs"""
+        if not word:
+            return
+        
+        word = word.lower().strip()
+        node = self.root
+        path = [(node, "")]
+        position = 0
+        
+        while position < len(word):
+            char = word[position]
+            child = node.children.get(char) if node.children else None
+            if child is None:
+                # The rest of the word becomes a new leaf
+                if node.children is None:
+                    node.top_completions = self._top_of(node, word[:position])
+                    node.children = {}
+                child = RadixNode(word[position:])
+                node.children[char] = child
+                self.node_count += 1
+                position = len(word)
+            else:
+                label = child.label
+                common = 1
+                limit = min(len(label), len(word) - position)
+                while common < limit and label[common] == word[position + common]:
+                    common += 1
+                if common < len(label):
+                    # Split the edge where the word leaves its label
+                    middle = RadixNode(label[:common])
+                    middle.top_completions = list(self._top_of(child, word[:position] + label))
+                    child.label = label[common:]
+                    middle.children = {child.label[0]: child}
+                    node.children[char] = middle
+                    self.node_count += 1
+                    child = middle
+                position += common
+            node = child
+            path.append((node, word[:position]))
+        
+        if not node.is_end:
+            self.word_count += 1
+            _count_length(self.word_lengths, len(word))
+        
+        node.is_end = True
+        node.frequency += count
+        self._promote(path, word, node.frequency, node.frequency - count)
+        
+        if not video_ids:
+            return
+        if node.video_ids is None:
+            node.video_ids = list(video_ids)
+        elif len(video_ids) == 1:
+            if video_ids[0] not in node.video_ids:
+                node.video_ids.append(video_ids[0])
+        else:
+            known = set(node.video_ids)
+            node.video_ids.extend(video_id for video_id in video_ids if video_id not in known)
+
+    def remove(self, word, video_id=None):
+        """Undo one insert of word, optionally dropping a video ID from it
+
+        Same rules as Trie.remove; once the word is gone its leaf is deleted
+        and any node left with a single child is merged into it.
+        """
+        if not word:
+            return False
+        
+        word = word.lower().strip()
+        path = self._find_path(word)
+        if path is None or not path[-1][0].is_end:
+            return False
+        
+        node = path[-1][0]
+        if video_id and node.video_ids and video_id in node.video_ids:
+            node.video_ids.remove(video_id)
+            if not node.video_ids:
+                node.video_ids = None
+        node.frequency = max(0, node.frequency - 1)
+        
+        removed = not node.frequency and not node.video_ids
+        if removed:
+            node.is_end = False
+            self.word_count -= 1
+            _uncount_length(self.word_lengths, len(word))
+        
+        self._demote(path, word)
+        
+        if removed:
+            if not node.children:
+                parent = path[-2][0]
+                del parent.children[node.label[0]]
+                self.node_count -= 1
+                if not parent.children and parent is not self.root:
+                    parent.children = None
+                    parent.top_completions = None
+                node = parent
+            if node is not self.root and not node.is_end and node.children and len(node.children) == 1:
+                self._merge_with_child(node)
+                self.node_count -= 1
+        return True
+
+    @staticmethod
+    def _merge_with_child(node):
+        """Fold a node's only child into it, joining their labels"""
+        (child,) = node.children.values()
+        node.label += child.label
+        node.children = child.children
+        node.is_end = child.is_end
+        node.video_ids = child.video_ids
+        node.frequency = child.frequency
+        node.top_completions = child.top_completions
+
+    def search_exact(self, word):
+        """Search for exact word match"""
+        if not word:
+            return False
+        
+        path = self._find_path(word.lower().strip())
+        return path is not None and path[-1][0].is_end
+
+    def _locate_prefix(self, prefix):
+        """Highest node whose subtree holds exactly the words starting with prefix
+
+        Returns (node, word spelled by its path), or (None, None). The prefix
+        may end part way along the node's edge label.
+        """
+        node = self.root
+        position = 0
+        
+        while position < len(prefix):
+            child = node.children.get(prefix[position]) if node.children else None
+            if child is None:
+                return None, None
+            label = child.label
+            if prefix.startswith(label, position):
+                position += len(label)
+                node = child
+            elif label.startswith(prefix[position:]):
+                return child, prefix[:position] + label
+            else:
+                return None, None
         
+        return node, prefix
+
+    def search_prefix(self, prefix, limit=10, popularity=None):
+        """Find the most frequent words with given prefix, limited by count"""
+        if not prefix:
+            return []
+        if popularity is not None:
+            return [word for word, _, _ in islice(_iter_by_popularity(self, prefix, popularity), limit)]
+        return [word for word, _ in islice(self.iter_prefix(prefix), limit)]
+
+    def iter_prefix(self, prefix):
+        """Yield (word, frequency) for words with given prefix, most frequent first"""
+        if not prefix:
+            return
+        
+        node, node_word = self._locate_prefix(prefix.lower().strip())
+        if node is None:
+            return
+        
+        top = self._top_of(node, node_word)
+        for negated_frequency, word in top:
+            yield word, -negated_frequency
+        if len(top) < self.top_k:
+            return
+        
+        # Collect all words with this prefix, most searched first
+        words = self._collect_words(node, node_word)
+        words.sort(key=lambda x: (-x[1], x[0]))
+        yield from words[len(top):]
+
+    def _collect_words(self, node, node_word):
+        """Helper method to collect (word, frequency) pairs below a node"""
+        collected = []
+        stack = [(node, node_word)]
+        
+        while stack:
+            node, node_word = stack.pop()
+            if node.is_end:
+                collected.append((node_word, node.frequency))
+            if node.children:
+                for child in node.children.values():
+                    stack.append((child, node_word + child.label))
+        
+        return collected
+
+    def auto_complete(self, partial_word, limit=5, popularity=None):
+        """Provide auto-complete suggestions, optionally ranked by search popularity"""
+        return self.search_prefix(partial_word, limit, popularity)
+
+    def fuzzy_search(self, word, max_distance=2, limit=10):
+        """Fuzzy search allowing for character insertions, deletions, and substitutions
+
+        The bit-parallel Levenshtein automaton of Trie.fuzzy_search, stepped
+        through each edge label one character at a time.
+        """
+        if not word:
+            return []
+        
+        word = word.lower().strip()
+        length = len(word)
+        full = (1 << (length + 1)) - 1
+        accept = 1 << length
+        results = []
+        
+        char_masks = {}
+        for i, char in enumerate(word, 1):
+            char_masks[char] = char_masks.get(char, 0) | (1 << i)
+        
+        suffixes = {1 << i: word[i:] for i in range(length + 1)}
+        
+        def _follow_suffixes(node, consumed, spelled, suffix_starts):
+            # Every edit is spent: the rest of the node's label and the path
+            # below it must spell the rest of the query exactly
+            rest = node.label[consumed:]
+            while suffix_starts:
+                bit = suffix_starts & -suffix_starts
+                suffix_starts ^= bit
+                suffix = suffixes[bit]
+                if not suffix.startswith(rest):
+                    continue
+                target = node
+                position = len(rest)
+                while position < len(suffix):
+                    target = target.children.get(suffix[position]) if target.children else None
+                    if target is None or not suffix.startswith(target.label, position):
+                        break
+                    position += len(target.label)
+                else:
+                    if target.is_end:
+                        results.append((spelled + suffix, max_distance, target.frequency))
+        
+        start = [((1 << (d + 1)) - 1) & full for d in range(max_distance + 1)]
+        distances = range(1, max_distance + 1)
+        if max_distance:
+            stack = [(self.root, "", start)]
+        else:
+            _follow_suffixes(self.root, 0, "", start[0])
+            stack = []
+        
+        while stack:
+            node, prefix, parent_states = stack.pop()
+            for child in node.children.values():
+                label = child.label
+                states = parent_states
+                for position, char in enumerate(label):
+                    mask = char_masks.get(char, 0)
+                    previous = states[0]
+                    current = (previous << 1) & mask
+                    next_states = [current]
+                    for d in distances:
+                        state = states[d]
+                        current = (((state << 1) & mask) | previous | ((previous | current) << 1)) & full
+                        previous = state
+                        next_states.append(current)
+                    states = next_states
+                    if not states[max_distance - 1]:
+                        _follow_suffixes(child, position + 1, prefix + label[:position + 1], current)
+                        break
+                else:
+                    word_so_far = prefix + label
+                    if current & accept and child.is_end:
+                        distance = next(d for d, state in enumerate(states) if state & accept)
+                        results.append((word_so_far, distance, child.frequency))
+                    if child.children:
+                        stack.append((child, word_so_far, states))
+        
+        # Sort by edit distance, then by frequency
+        results.sort(key=lambda x: (x[1], -x[2]))
+        
+        return [word for word, distance, frequency in results[:limit]]
+
+    def wildcard_search(self, pattern, limit=100):
+        """Search with wildcards (*, ? and character classes), as in Trie"""
+        if not pattern:
+            return []
+        
+        start, accept, step = _compile_wildcard(pattern.lower().strip())
+        results = []
+        stack = [(self.root, "", start)]
+        
+        while stack:
+            node, prefix, parent_states = stack.pop()
+            for child in node.children.values():
+                states = parent_states
+                for char in child.label:
+                    states = step(states, char)
+                    if not states:
+                        break
+                else:
+                    word_so_far = prefix + child.label
+                    if states & accept and child.is_end:
+                        results.append(word_so_far)
+                        if len(results) >= limit:
+                            return results
+                    if child.children:
+                        stack.append((child, word_so_far, states))
+        
+        return results
+
+    def get_video_ids_for_word(self, word):
+        """Get all video IDs associated with a word"""
+        if not word:
+            return []
+        
+        path = self._find_path(word.lower().strip())
+        if path is None or not path[-1][0].is_end:
+            return []
+        return path[-1][0].video_ids or []
+
+    def get_frequency(self, word):
+        """Get how many times a word was inserted, 0 if it is not in the trie"""
+        if not word:
+            return 0
+        
+        path = self._find_path(word.lower().strip())
+        if path is None or not path[-1][0].is_end:
+            return 0
+        return path[-1][0].frequency
+
+    def items(self):
+        """Yield (word, frequency, video_ids) for every word in sorted order"""
+        stack = [(self.root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if node.is_end:
+                yield prefix, node.frequency, node.video_ids or []
+            if node.children:
+                for char in sorted(node.children, reverse=True):
+                    child = node.children[char]
+                    stack.append((child, prefix + child.label))
+
+    def freeze(self):
+        """Pack the trie into a read-only FrozenTrie"""
+        return FrozenTrie.build(self.items())
+
+    def get_stats(self):
+        """Get trie statistics; max_depth counts characters, as in Trie"""
         return {
             'word_count': self.word_count,
-            'node_count': node_count,
-            'max_depth': depth,
-            'memory_efficiency': self.word_count / node_count if node_count > 0 else 0
+            'node_count': self.node_count,
+            'max_depth': len(self.word_lengths) - 1,
+            'word_length_histogram': _length_histogram(self.word_lengths),
+            'memory_efficiency': self.word_count / self.node_count
         }
 
-    def _count_nodes(self, node):
-        """Count total nodes in trie"""
-        count = 1
-        for child in node.children.values():
-            count += self._count_nodes(child)
-        return count
 
-    def _max_depth(self, node, current_depth=0):
-        """Find maximum depth of trie"""
-        if not node.children:
-            return current_depth
+FROZEN_MAGIC = b'VFST'
+FROZEN_VERSION = 1
+
+# Sections in buffer order; the header stores (offset, length) for each. Word
+# data is indexed by rank, the word's position in sorted order
+FROZEN_SECTIONS = (
+    ('node_final', 'B'),   # 1 if a word ends at node n
+    ('node_words', 'I'),   # Number of words in node n's subtree, including its own
+    ('arc_start', 'I'),    # Arcs of node n are arc_start[n]:arc_start[n + 1]
+    ('arc_labels', 'I'),   # Code point of each arc, ascending within a node
+    ('arc_targets', 'I'),  # Node each arc leads to
+    ('arc_ranks', 'I'),    # Rank offset for taking the arc: words skipped before it
+    ('frequencies', 'q'),  # Frequency of each word
+    ('id_offsets', 'q'),   # Video IDs of word r are video_ids[id_offsets[r]:id_offsets[r + 1]]
+    ('video_ids', 'q'),
+)
+
+# magic, byte order, version, root node, word count, max depth
+FROZEN_HEADER = struct.Struct('=4s1s3xIQQQ' + 'QQ' * len(FROZEN_SECTIONS))
+
+
+class FrozenTrie:
+    """Read-only minimized DAWG packed into one buffer, with the Trie query API
+
+    Words sharing a suffix share its nodes, and every word has a rank (its
+    position in sorted order) that is summed up from arc_ranks on the way
+    down, so frequencies and video IDs can live in flat arrays indexed by
+    rank even though nodes are shared. Nodes and arcs are offsets into typed
+    sections, so queries run directly on bytes or a memory map.
+    """
+    def __init__(self, buffer):
+        self._mmap = None
+        self._file = None
+        self._view = memoryview(buffer)
+        if len(self._view) < FROZEN_HEADER.size:
+            raise ValueError("Not a frozen trie")
+        header = FROZEN_HEADER.unpack_from(self._view, 0)
+        magic, byte_order, version, self._root, self.word_count, self._max_depth = header[:6]
+        if magic != FROZEN_MAGIC or version != FROZEN_VERSION:
+            raise ValueError(f"Not a version {FROZEN_VERSION} frozen trie")
+        if byte_order != (b'L' if sys.byteorder == 'little' else b'B'):
+            raise ValueError("Frozen trie was written on a machine with a different byte order")
+        
+        for i, (name, typecode) in enumerate(FROZEN_SECTIONS):
+            offset, length = header[6 + 2 * i], header[7 + 2 * i]
+            setattr(self, f"_{name}", self._view[offset:offset + length].cast(typecode))
+
+    @classmethod
+    def build(cls, items):
+        """Build from (word, frequency, video_ids) tuples in sorted word order
+
+        Uses incremental minimization for sorted input: once a word is done,
+        the part of the previous word's path it does not share can never
+        change again, so those nodes are frozen bottom-up and replaced by an
+        identical node already built whenever there is one.
+        """
+        sections = {name: array(typecode) for name, typecode in FROZEN_SECTIONS}
+        node_final, node_words, arc_start = sections['node_final'], sections['node_words'], sections['arc_start']
+        arc_labels, arc_targets, arc_ranks = sections['arc_labels'], sections['arc_targets'], sections['arc_ranks']
+        id_offsets = sections['id_offsets']
+        id_offsets.append(0)
+        register = {}
+        
+        def _freeze_node(final, arcs):
+            signature = (final, tuple(arcs))
+            node = register.get(signature)
+            if node is None:
+                node = len(node_final)
+                register[signature] = node
+                node_final.append(final)
+                arc_start.append(len(arc_labels))
+                words = final
+                for char, target in arcs:
+                    arc_labels.append(ord(char))
+                    arc_targets.append(target)
+                    arc_ranks.append(words)
+                    words += node_words[target]
+                node_words.append(words)
+            return node
+        
+        # path[i] is [final, arcs] of the unfinished node spelling previous[:i]
+        path = [[0, []]]
+        previous = ""
+        max_depth = 0
+        for word, frequency, video_ids in items:
+            if word <= previous:
+                raise ValueError(f"Words must be distinct, non-empty and sorted: {word!r}")
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+            for depth in range(len(previous), common, -1):
+                final, arcs = path.pop()
+                path[-1][1].append((previous[depth - 1], _freeze_node(final, arcs)))
+            path.extend([0, []] for _ in range(len(word) - common))
+            path[-1][0] = 1
+            
+            sections['frequencies'].append(frequency)
+            sections['video_ids'].extend(video_ids or ())
+            id_offsets.append(len(sections['video_ids']))
+            previous = word
+            max_depth = max(max_depth, len(word))
+        
+        for depth in range(len(previous), 0, -1):
+            final, arcs = path.pop()
+            path[-1][1].append((previous[depth - 1], _freeze_node(final, arcs)))
+        root = _freeze_node(*path[0])
+        arc_start.append(len(arc_labels))
+        
+        layout = []
+        offset = FROZEN_HEADER.size
+        for name, _ in FROZEN_SECTIONS:
+            data = sections[name]
+            offset += -offset % 8  # Keep typed sections 8-byte aligned
+            layout.append((offset, len(data) * data.itemsize))
+            offset += len(data) * data.itemsize
+        
+        buffer = bytearray(offset)
+        byte_order = b'L' if sys.byteorder == 'little' else b'B'
+        FROZEN_HEADER.pack_into(buffer, 0, FROZEN_MAGIC, byte_order, FROZEN_VERSION, root,
+                                len(id_offsets) - 1, max_depth,
+                                *[value for pair in layout for value in pair])
+        for (name, _), (section_offset, length) in zip(FROZEN_SECTIONS, layout):
+            buffer[section_offset:section_offset + length] = sections[name].tobytes()
+        return cls(bytes(buffer))
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a frozen trie written by save"""
+        file = open(path, 'rb')
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            trie = cls(mapped)
+        except ValueError:
+            mapped.close()
+            file.close()
+            raise
+        trie._mmap, trie._file = mapped, file
+        return trie
+
+    def save(self, path):
+        """Write the buffer to path"""
+        with open(path, 'wb') as f:
+            f.write(self._view)
+
+    def close(self):
+        """Release the buffer views, and the memory map if loaded from disk"""
+        for name, _ in FROZEN_SECTIONS:
+            getattr(self, f"_{name}").release()
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def freeze(self):
+        """Already frozen"""
+        return self
+
+    def insert(self, word, video_id=None):
+        """Frozen tries cannot change"""
+        raise TypeError("FrozenTrie is read-only")
+
+    def remove(self, word, video_id=None):
+        """Frozen tries cannot change"""
+        raise TypeError("FrozenTrie is read-only")
+
+    def bulk_insert(self, entries):
+        """Frozen tries cannot change"""
+        raise TypeError("FrozenTrie is read-only")
+
+    def _walk(self, word, node=None, rank=0):
+        """Follow word from node; returns (node, rank), or (None, 0) if it leaves the trie"""
+        if node is None:
+            node = self._root
+        labels, arc_start = self._arc_labels, self._arc_start
+        for char in word:
+            code = ord(char)
+            end = arc_start[node + 1]
+            arc = bisect_left(labels, code, arc_start[node], end)
+            if arc == end or labels[arc] != code:
+                return None, 0
+            rank += self._arc_ranks[arc]
+            node = self._arc_targets[arc]
+        return node, rank
+
+    def _word_at(self, rank):
+        """Spell the word with the given rank"""
+        node = self._root
+        chars = []
+        while rank or not self._node_final[node]:
+            arc = bisect_right(self._arc_ranks, rank, self._arc_start[node], self._arc_start[node + 1]) - 1
+            rank -= self._arc_ranks[arc]
+            chars.append(chr(self._arc_labels[arc]))
+            node = self._arc_targets[arc]
+        return ''.join(chars)
+
+    def _arcs(self, node, rank):
+        """(character, child node, child rank) for each arc out of node"""
+        for arc in range(self._arc_start[node], self._arc_start[node + 1]):
+            yield chr(self._arc_labels[arc]), self._arc_targets[arc], rank + self._arc_ranks[arc]
+
+    def items(self):
+        """Yield (word, frequency, video_ids) for every word in sorted order"""
+        for rank in range(self.word_count):
+            yield self._word_at(rank), self._frequencies[rank], self._video_ids_at(rank)
+
+    def _video_ids_at(self, rank):
+        """Video IDs of the word with the given rank"""
+        return list(self._video_ids[self._id_offsets[rank]:self._id_offsets[rank + 1]])
+
+    def search_exact(self, word):
+        """Search for exact word match"""
+        if not word:
+            return False
         
-        max_child_depth = 0
-        for child in node.children.values():
-            child_depth = self._max_depth(child, current_depth + 1)
-            max_child_depth = max(max_child_depth, child_depth)
+        node, _ = self._walk(word.lower().strip())
+        return node is not None and bool(self._node_final[node])
+
+    def search_prefix(self, prefix, limit=10, popularity=None):
+        """Find the most frequent words with given prefix, limited by count
+
+        The words below a node have consecutive ranks, so their frequencies
+        are one contiguous slice to pick the best from.
+        """
+        if not prefix:
+            return []
+        if popularity is not None:
+            return [word for word, _, _ in islice(_iter_by_popularity(self, prefix, popularity), limit)]
         
-        return max_child_depth
+        node, rank = self._walk(prefix.lower().strip())
+        if node is None:
+            return []
+        
+        frequencies = self._frequencies
+        best = heapq.nsmallest(limit, range(rank, rank + self._node_words[node]),
+                               key=lambda r: (-frequencies[r], r))
+        return [self._word_at(r) for r in best]
+
+    def iter_prefix(self, prefix):
+        """Yield (word, frequency) for words with given prefix, most frequent first
+
+        Heapifies the prefix's rank slice once and spells words only as
+        they are popped.
+        """
+        if not prefix:
+            return
+        
+        node, rank = self._walk(prefix.lower().strip())
+        if node is None:
+            return
+        
+        frequencies = self._frequencies
+        ranked = [(-frequencies[r], r) for r in range(rank, rank + self._node_words[node])]
+        heapq.heapify(ranked)
+        while ranked:
+            negated_frequency, r = heapq.heappop(ranked)
+            yield self._word_at(r), -negated_frequency
+
+    def auto_complete(self, partial_word, limit=5, popularity=None):
+        """Provide auto-complete suggestions, optionally ranked by search popularity"""
+        return self.search_prefix(partial_word, limit, popularity)
+
+    def fuzzy_search(self, word, max_distance=2, limit=10):
+        """Fuzzy search allowing for character insertions, deletions, and substitutions
+
+        The bit-parallel Levenshtein automaton of Trie.fuzzy_search, run over
+        the arcs of the buffer.
+        """
+        if not word:
+            return []
+        
+        word = word.lower().strip()
+        length = len(word)
+        full = (1 << (length + 1)) - 1
+        accept = 1 << length
+        node_final, frequencies = self._node_final, self._frequencies
+        results = []
+        
+        char_masks = {}
+        for i, char in enumerate(word, 1):
+            char_masks[char] = char_masks.get(char, 0) | (1 << i)
+        
+        suffixes = {1 << i: word[i:] for i in range(length)}
+        before_accept = accept - 1
+        
+        def _follow_suffixes(node, rank, prefix, suffix_starts):
+            # Every edit is spent: look up the rest of the query directly
+            suffix_starts &= before_accept
+            while suffix_starts:
+                bit = suffix_starts & -suffix_starts
+                suffix_starts ^= bit
+                suffix = suffixes[bit]
+                target, target_rank = self._walk(suffix, node, rank)
+                if target is not None and node_final[target]:
+                    results.append((prefix + suffix, max_distance, frequencies[target_rank]))
+        
+        start = [((1 << (d + 1)) - 1) & full for d in range(max_distance + 1)]
+        distances = range(1, max_distance + 1)
+        if max_distance:
+            stack = [(self._root, 0, "", start)]
+        else:
+            _follow_suffixes(self._root, 0, "", start[0])
+            stack = []
+        
+        while stack:
+            node, rank, prefix, states = stack.pop()
+            first_state = states[0]
+            for char, child, child_rank in self._arcs(node, rank):
+                mask = char_masks.get(char, 0)
+                previous = first_state
+                current = (previous << 1) & mask
+                child_states = [current]
+                for d in distances:
+                    state = states[d]
+                    current = (((state << 1) & mask) | previous | ((previous | current) << 1)) & full
+                    previous = state
+                    child_states.append(current)
+                
+                word_so_far = prefix + char
+                if current & accept and node_final[child]:
+                    distance = next(d for d, state in enumerate(child_states) if state & accept)
+                    results.append((word_so_far, distance, frequencies[child_rank]))
+                if child_states[max_distance - 1]:
+                    stack.append((child, child_rank, word_so_far, child_states))
+                else:
+                    _follow_suffixes(child, child_rank, word_so_far, current)
+        
+        # Sort by edit distance, then by frequency
+        results.sort(key=lambda x: (x[1], -x[2]))
+        
+        return [word for word, distance, frequency in results[:limit]]
+
+    def wildcard_search(self, pattern, limit=100):
+        """Search with wildcards (*, ? and character classes), as in Trie"""
+        if not pattern:
+            return []
+        
+        start, accept, step = _compile_wildcard(pattern.lower().strip())
+        results = []
+        stack = [(self._root, "", start)]
+        
+        while stack:
+            node, prefix, states = stack.pop()
+            for char, child, _ in self._arcs(node, 0):
+                child_states = step(states, char)
+                if not child_states:
+                    continue
+                word_so_far = prefix + char
+                if child_states & accept and self._node_final[child]:
+                    results.append(word_so_far)
+                    if len(results) >= limit:
+                        return results
+                stack.append((child, word_so_far, child_states))
+        
+        return results
+
+    def get_video_ids_for_word(self, word):
+        """Get all video IDs associated with a word"""
+        if not word:
+            return []
+        
+        node, rank = self._walk(word.lower().strip())
+        if node is None or not self._node_final[node]:
+            return []
+        return self._video_ids_at(rank)
+
+    def get_frequency(self, word):
+        """Get how many times a word was inserted, 0 if it is not in the trie"""
+        if not word:
+            return 0
+        
+        node, rank = self._walk(word.lower().strip())
+        if node is None or not self._node_final[node]:
+            return 0
+        return self._frequencies[rank]
+
+    def get_stats(self):
+        """Get trie statistics, plus the size of the buffer"""
+        node_count = len(self._node_final)
+        return {
+            'word_count': self.word_count,
+            'node_count': node_count,
+            'max_depth': self._max_depth,
+            'memory_efficiency': self.word_count / node_count if node_count > 0 else 0,
+            'buffer_bytes': len(self._view)
+        }
+
+
+# Trie implementations selectable in VideoTrieSystem
+TRIE_TYPES = {
+    'standard': Trie,
+    'radix': RadixTrie
+}
+
+# magic, then (offset, length) of the title, actor, genre, keyword and
+# director FrozenTrie buffers
+SYSTEM_MAGIC = b'VTRS'
+SYSTEM_HEADER = struct.Struct('=4s4x' + 'QQ' * 5)
+
+# Categories with a symmetric-delete spelling index for typo correction
+SPELLING_CATEGORIES = ('title', 'actor')
 
 
 class VideoTrieSystem:
     """Comprehensive trie system for video search with multiple search categories"""
     
-    def __init__(self):
-        self.title_trie = Trie()      # For video titles
-        self.actor_trie = Trie()      # For actor names
-        self.genre_trie = Trie()      # For genres
-        self.keyword_trie = Trie()    # For plot keywords
-        self.director_trie = Trie()   # For directors
+    def __init__(self, trie_type='standard', spelling_distance=2):
+        if trie_type not in TRIE_TYPES:
+            raise ValueError(f"Unknown trie type: {trie_type}")
+        trie_class = TRIE_TYPES[trie_type]
+        self.trie_type = trie_type
+        
+        self.title_trie = trie_class()      # For video titles
+        self.actor_trie = trie_class()      # For actor names
+        self.genre_trie = trie_class()      # For genres
+        self.keyword_trie = trie_class()    # For plot keywords
+        self.director_trie = trie_class()   # For directors
+        self._tries = {
+            'title': self.title_trie,
+            'actor': self.actor_trie,
+            'genre': self.genre_trie,
+            'keyword': self.keyword_trie,
+            'director': self.director_trie
+        }
+        
+        # Spelling indexes are built from their trie on the first correction
+        # in a category, then kept in step with it; ingest pays nothing until then
+        self.spelling_distance = spelling_distance
+        self._spelling = {}
+        self._file = None
+        self._mmap = None
     
-    def add_video_to_tries(self, video):
-        """Add video information to all relevant tries"""
-        video_id = video.video_id
+    def _set_tries(self, tries):
+        """Swap in a new trie for every category"""
+        self._tries = tries
+        self.title_trie = tries['title']
+        self.actor_trie = tries['actor']
+        self.genre_trie = tries['genre']
+        self.keyword_trie = tries['keyword']
+        self.director_trie = tries['director']
+    
+    def freeze(self):
+        """Replace every trie with a read-only FrozenTrie once ingest is done
+
+        Searches keep working; adding, removing or updating videos raises
+        TypeError afterwards.
+        """
+        self._set_tries({name: trie.freeze() for name, trie in self._tries.items()})
+        self.trie_type = 'frozen'
+    
+    def save_frozen(self, path):
+        """Freeze the tries if needed and write all of their buffers to path"""
+        if self.trie_type != 'frozen':
+            self.freeze()
         
-        # Add title words
-        title_words = video.title.lower().split()
-        for word in title_words:
-            self.title_trie.insert(word, video_id)
+        layout = []
+        offset = SYSTEM_HEADER.size
+        for trie in self._tries.values():
+            offset += -offset % 8
+            layout.append((offset, len(trie._view)))
+            offset += len(trie._view)
         
-        # Add full title
-        self.title_trie.insert(video.title, video_id)
+        with open(path, 'wb') as f:
+            f.write(SYSTEM_HEADER.pack(SYSTEM_MAGIC, *[value for pair in layout for value in pair]))
+            for trie, (trie_offset, _) in zip(self._tries.values(), layout):
+                f.write(b'\0' * (trie_offset - f.tell()))
+                f.write(trie._view)
+    
+    @classmethod
+    def load_frozen(cls, path):
+        """Memory-map tries written by save_frozen; nothing is rebuilt"""
+        system = cls()
+        system._file = open(path, 'rb')
+        system._mmap = mmap.mmap(system._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(system._mmap) < SYSTEM_HEADER.size:
+                raise ValueError(f"Not a frozen trie system: {path}")
+            header = SYSTEM_HEADER.unpack_from(system._mmap, 0)
+            if header[0] != SYSTEM_MAGIC:
+                raise ValueError(f"Not a frozen trie system: {path}")
+            tries = {}
+            for i, name in enumerate(system._tries):
+                offset, length = header[1 + 2 * i], header[2 + 2 * i]
+                tries[name] = FrozenTrie(memoryview(system._mmap)[offset:offset + length])
+        except ValueError:
+            system.close()
+            raise
+        system._set_tries(tries)
+        system.trie_type = 'frozen'
+        return system
+    
+    def close(self):
+        """Release a memory map opened by load_frozen"""
+        if self._mmap is None:
+            return
+        for trie in self._tries.values():
+            if isinstance(trie, FrozenTrie):
+                trie.close()
+        self._mmap.close()
+        self._file.close()
+        self._mmap = self._file = None
+    
+    def _video_terms(self, video):
+        """Map each trie to a Counter of the words a video inserts into it"""
+        terms = {name: Counter() for name in self._tries}
+        
+        def _add(name, word):
+            word = word.lower().strip()
+            if word:
+                terms[name][word] += 1
         
-        # Add actors
+        # Title words and the full title
+        for word in video.title.lower().split():
+            _add('title', word)
+        _add('title', video.title)
+        
+        # Actors and directors, plus their individual names
         for actor in video.actors:
-            self.actor_trie.insert(actor, video_id)
-            # Also add individual names
+            _add('actor', actor)
             for name_part in actor.split():
-                self.actor_trie.insert(name_part, video_id)
+                _add('actor', name_part)
         
-        # Add genres
         for genre in video.genre:
-            self.genre_trie.insert(genre, video_id)
+            _add('genre', genre)
         
-        # Add keywords
         for keyword in video.keywords:
-            self.keyword_trie.insert(keyword, video_id)
+            _add('keyword', keyword)
         
-        # Add directors
         for director in video.directors:
-            self.director_trie.insert(director, video_id)
-            # Also add individual names
+            _add('director', director)
             for name_part in director.split():
-                self.director_trie.insert(name_part, video_id)
+                _add('director', name_part)
+        
+        return terms
+    
+    def add_video_to_tries(self, video):
+        """Add video information to all relevant tries"""
+        video_id = video.video_id
+        for name, words in self._video_terms(video).items():
+            trie = self._tries[name]
+            spelling = self._spelling.get(name)
+            for word, count in words.items():
+                for _ in range(count):
+                    trie.insert(word, video_id)
+                if spelling is not None:
+                    spelling.add(word, count)
+    
+    def bulk_add_videos(self, videos, pause_gc=False):
+        """Add a batch of videos with one sorted pass over each trie
+
+        The batch's words are grouped per trie with their total count and
+        video IDs in batch order, then sorted, so each trie and spelling
+        index receives every distinct word once, in the order bulk_insert
+        expects.
+
+        Building allocates millions of long-lived nodes, none of them in
+        reference cycles. pause_gc=True disables cyclic GC for the build so
+        it does not rescan them all; GC is process-wide, so only callers
+        that own the process (batch loaders, benchmarks) should ask for it.
+        """
+        groups = {name: {} for name in self._tries}  # word -> [count, video IDs]
+        for video in videos:
+            video_id = video.video_id
+            for name, words in self._video_terms(video).items():
+                trie_groups = groups[name]
+                for word, count in words.items():
+                    group = trie_groups.get(word)
+                    if group is None:
+                        trie_groups[word] = [count, [video_id] if video_id else []]
+                    else:
+                        group[0] += count
+                        if video_id:
+                            group[1].append(video_id)
+        
+        gc_was_enabled = gc.isenabled()
+        if pause_gc:
+            gc.disable()
+        try:
+            for name, trie_groups in groups.items():
+                # A video listed twice in the batch still adds its ID once
+                entries = [(word, count, list(dict.fromkeys(video_ids)))
+                           for word, (count, video_ids) in sorted(trie_groups.items())]
+                self._tries[name].bulk_insert(entries)
+                spelling = self._spelling.get(name)
+                if spelling is not None:
+                    for word, count, _ in entries:
+                        spelling.add(word, count)
+        finally:
+            if pause_gc and gc_was_enabled:
+                gc.enable()
+    
+    def remove_video_from_tries(self, video):
+        """Remove every word a video inserted, pruning branches left empty"""
+        self.update_video_in_tries(video, None)
+    
+    def update_video_in_tries(self, old_video, new_video):
+        """Apply only the word insertions and removals that differ between versions
+
+        new_video=None removes old_video entirely.
+        """
+        video_id = old_video.video_id
+        old_terms = self._video_terms(old_video)
+        new_terms = self._video_terms(new_video) if new_video is not None else {}
+        for name, old_words in old_terms.items():
+            trie = self._tries[name]
+            spelling = self._spelling.get(name)
+            new_words = new_terms.get(name, Counter())
+            for word in old_words.keys() | new_words.keys():
+                delta = new_words[word] - old_words[word]
+                for _ in range(delta):
+                    trie.insert(word, video_id)
+                # Keep the video ID on a word the new version still contains
+                drop_id = video_id if not new_words[word] else None
+                for _ in range(-delta):
+                    trie.remove(word, drop_id)
+                if spelling is not None and delta > 0:
+                    spelling.add(word, delta)
+                elif spelling is not None and delta < 0:
+                    spelling.remove(word, -delta)
     
     def search_titles(self, query, search_type='prefix'):
         """Search video titles"""
@@ -306,27 +1687,53 @@ class VideoTrieSystem:
         else:
             return []
     
-    def get_auto_complete_suggestions(self, query, category='all', limit=5):
-        """Get auto-complete suggestions across categories"""
-        suggestions = []
-        
-        if category in ['all', 'title']:
-            title_suggestions = self.title_trie.auto_complete(query, limit)
-            suggestions.extend([('title', s) for s in title_suggestions])
-        
-        if category in ['all', 'actor']:
-            actor_suggestions = self.actor_trie.auto_complete(query, limit)
-            suggestions.extend([('actor', s) for s in actor_suggestions])
-        
-        if category in ['all', 'genre']:
-            genre_suggestions = self.genre_trie.auto_complete(query, limit)
-            suggestions.extend([('genre', s) for s in genre_suggestions])
+    def correct_spelling(self, category, word, max_distance=None, limit=10):
+        """Known title or actor terms within max_distance edits of word
+
+        Nearest first, then most frequent, as with fuzzy_search, but looked
+        up in the category's symmetric-delete index, which the first call
+        builds. max_distance defaults to spelling_distance; larger distances
+        fall back to the trie's fuzzy_search.
+        """
+        if max_distance is None:
+            max_distance = self.spelling_distance
+        if category not in SPELLING_CATEGORIES or max_distance > self.spelling_distance:
+            return self._tries[category].fuzzy_search(word, max_distance, limit)
+        if not word:
+            return []
         
-        if category in ['all', 'keyword']:
-            keyword_suggestions = self.keyword_trie.auto_complete(query, limit)
-            suggestions.extend([('keyword', s) for s in keyword_suggestions])
+        spelling = self._spelling.get(category)
+        if spelling is None:
+            spelling = self._spelling[category] = SpellingIndex(self.spelling_distance)
+            for term, frequency, _ in self._tries[category].items():
+                spelling.add(term, frequency)
+        return [term for term, _, _ in spelling.lookup(word, max_distance, limit)]
+    
+    def get_auto_complete_suggestions(self, query, category='all', limit=5, popularity=None):
+        """Get the best auto-complete suggestions across categories
+
+        Each category's trie yields its completions best first and a heap
+        merges the streams, so a trie is only asked for its next completion
+        when its previous one made the cut. Suggestions are ranked by
+        popularity score when given (searched words first, the rest by
+        frequency), then by frequency (every category counts one insert
+        per video), then by category order.
+        """
+        streams = [self._suggestion_stream(name, order, trie, query, popularity)
+                   for order, (name, trie) in enumerate(self._tries.items())
+                   if category in ('all', name)]
         
-        return suggestions[:limit]
+        return [(entry[-1], entry[-2]) for entry in islice(heapq.merge(*streams), limit)]
+    
+    @staticmethod
+    def _suggestion_stream(name, order, trie, query, popularity):
+        """Yield one category's sort keys for get_auto_complete_suggestions, best first"""
+        if popularity is None:
+            for word, frequency in trie.iter_prefix(query):
+                yield -frequency, order, word, name
+        elif query:
+            for word, frequency, score in _iter_by_popularity(trie, query, popularity):
+                yield -score, -frequency, order, word, name
     
     def get_system_stats(self):
         """Get comprehensive trie system statistics"""
@@ -337,3 +1744,7 @@ class VideoTrieSystem:
             'keyword_trie': self.keyword_trie.get_stats(),
             'director_trie': self.director_trie.get_stats()
         }
+    
+    def get_spelling_stats(self):
+        """Get statistics of the spelling indexes built so far"""
+        return {f'{name}_spelling': spelling.get_stats() for name, spelling in self._spelling.items()}
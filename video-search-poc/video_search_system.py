@@ -5,10 +5,12 @@ Integrates hash tables, tries, and graphs for advanced video content search
 """
 
 from hash_table import Video, VideoMetadataStore
+from posting_list import BitmapPostingList
 from trie import VideoTrieSystem
 from graph import VideoContentGraph
+from popularity import QueryPopularity
 import time
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Iterable, Tuple, Optional
 
 
 class SearchResult:
@@ -28,12 +30,17 @@ class VideoSearchSystem:
     Provides comprehensive search functionality for video content discovery
     """
     
-    def __init__(self):
+    def __init__(self, table_type: str = 'chained', columnar: bool = False,
+                 posting_types: Optional[Dict[str, str]] = None, trie_type: str = 'standard',
+                 spelling_distance: int = 2):
         # Initialize all data structures
-        self.metadata_store = VideoMetadataStore()
-        self.trie_system = VideoTrieSystem()
+        self.metadata_store = VideoMetadataStore(table_type, columnar, posting_types)
+        self.trie_system = VideoTrieSystem(trie_type, spelling_distance)
         self.content_graph = VideoContentGraph()
         
+        # Recent search traffic, used to rank auto-complete suggestions
+        self.query_popularity = QueryPopularity()
+        
         # Search performance tracking
         self.search_stats = {
             'total_searches': 0,
@@ -61,6 +68,53 @@ class VideoSearchSystem:
             print(f"Error adding video {video.video_id}: {e}")
             return False
     
+    def remove_video(self, video_id: int) -> bool:
+        """
+        Remove a video from all data structures
+        Returns True if it was found and removed, False otherwise
+        """
+        try:
+            video = self.metadata_store.get_video(video_id)
+            if video is None:
+                return False
+            
+            # The tries go first: frozen tries refuse changes, and failing
+            # there leaves the store and graph untouched
+            self.trie_system.remove_video_from_tries(video)
+            self.metadata_store.remove_video(video_id)
+            self.content_graph.remove_video_from_graph(video)
+            return True
+        except Exception as e:
+            print(f"Error removing video {video_id}: {e}")
+            return False
+    
+    def update_video(self, video: Video) -> bool:
+        """
+        Replace a video's metadata, touching only the postings, trie words
+        and graph edges of fields that changed (adds it if not yet stored)
+        Returns True if successful, False otherwise
+        """
+        try:
+            if not isinstance(video, Video):
+                raise TypeError("Expected Video object")
+            old_video = self.metadata_store.get_video(video.video_id)
+            
+            # As in remove_video, the tries go first so a refused change
+            # leaves the store and graph untouched
+            if old_video is None:
+                self.trie_system.add_video_to_tries(video)
+            else:
+                self.trie_system.update_video_in_tries(old_video, video)
+            self.metadata_store.update_video(video)
+            if old_video is None:
+                self.content_graph.add_video_to_graph(video)
+            else:
+                self.content_graph.update_video_in_graph(old_video, video)
+            return True
+        except Exception as e:
+            print(f"Error updating video {video.video_id}: {e}")
+            return False
+    
     def search_by_title(self, query: str, search_type: str = 'fuzzy', limit: int = 10) -> List[SearchResult]:
         """Search videos by title using trie-based searching"""
         start_time = time.time()
@@ -88,7 +142,7 @@ class VideoSearchSystem:
             
             elif search_type == 'fuzzy':
                 # Fuzzy matching for typos and variations
-                matching_titles = self.trie_system.title_trie.fuzzy_search(query)
+                matching_titles = self.trie_system.correct_spelling('title', query)
                 for title in matching_titles:
                     video_ids = self.trie_system.title_trie.get_video_ids_for_word(title)
                     for video_id in video_ids:
@@ -111,6 +165,7 @@ class VideoSearchSystem:
         except Exception as e:
             print(f"Error in title search: {e}")
         
+        self._record_query(query, results)
         self._update_search_stats('title', time.time() - start_time)
         return self._sort_and_limit_results(results, limit)
     
@@ -126,7 +181,7 @@ class VideoSearchSystem:
                 results.append(SearchResult(video, 1.0, "exact_actor"))
             
             # Also try fuzzy search for actor names
-            fuzzy_actors = self.trie_system.actor_trie.fuzzy_search(actor_name)
+            fuzzy_actors = self.trie_system.correct_spelling('actor', actor_name)
             for actor in fuzzy_actors:
                 video_ids = self.trie_system.actor_trie.get_video_ids_for_word(actor)
                 for video_id in video_ids:
@@ -137,6 +192,7 @@ class VideoSearchSystem:
         except Exception as e:
             print(f"Error in actor search: {e}")
         
+        self._record_query(actor_name, results)
         self._update_search_stats('actor', time.time() - start_time)
         return self._sort_and_limit_results(results, limit)
     
@@ -155,6 +211,7 @@ class VideoSearchSystem:
         except Exception as e:
             print(f"Error in genre search: {e}")
         
+        self._record_query(genre, results)
         self._update_search_stats('genre', time.time() - start_time)
         return self._sort_and_limit_results(results, limit)
     
@@ -175,6 +232,25 @@ class VideoSearchSystem:
         self._update_search_stats('year', time.time() - start_time)
         return self._sort_and_limit_results(results, limit)
     
+    def search_substring(self, field: str, text: str, limit: int = 10) -> List[SearchResult]:
+        """Find videos whose title, actor or director name contains text anywhere"""
+        start_time = time.time()
+        results = []
+        
+        try:
+            if field not in self.metadata_store.SUBSTRING_FIELDS:
+                raise ValueError(f"No substring index for field: {field}")
+            for video in self.metadata_store.search_by_substring(field, text):
+                score = min(1.0, (video.rating / 10.0) * 0.3 + 0.5)
+                results.append(SearchResult(video, score, f"substring_{field}"))
+        
+        except Exception as e:
+            print(f"Error in substring search: {e}")
+        
+        self._record_query(text, results)
+        self._update_search_stats('substring', time.time() - start_time)
+        return self._sort_and_limit_results(results, limit)
+    
     def complex_search(self, criteria: Dict, limit: int = 10) -> List[SearchResult]:
         """
         Perform complex multi-criteria search
@@ -187,11 +263,10 @@ class VideoSearchSystem:
         }
         """
         start_time = time.time()
-        all_videos = self.metadata_store.get_all_videos()
         results = []
         
         try:
-            for video in all_videos:
+            for video in self._complex_search_candidates(criteria):
                 score = 0.0
                 match_criteria = []
                 
@@ -240,9 +315,45 @@ class VideoSearchSystem:
         except Exception as e:
             print(f"Error in complex search: {e}")
         
+        for field in ('title', 'actor', 'genre'):
+            if field in criteria:
+                self._record_query(criteria[field], results)
         self._update_search_stats('complex', time.time() - start_time)
         return self._sort_and_limit_results(results, limit)
     
+    def _complex_search_candidates(self, criteria: Dict) -> Iterable[Video]:
+        """Narrow complex search to videos matching the indexed criteria with bitmap set algebra"""
+        store = self.metadata_store
+        candidates = None
+        
+        # Title and actor substrings narrow through their trigram indexes
+        for field in ('title', 'actor'):
+            if field in criteria:
+                substring_postings = store.get_substring_postings(field, criteria[field])
+                if substring_postings is not None:
+                    candidates = substring_postings if candidates is None else candidates & substring_postings
+        
+        if 'genre' in criteria:
+            # Genres are few, so resolve the substring match over the index keys
+            genre_query = criteria['genre'].lower()
+            matching_genres = [genre for genre in store.get_index_keys('genre') if genre_query in genre]
+            genre_postings = store.union_postings('genre', matching_genres)
+            candidates = genre_postings if candidates is None else candidates & genre_postings
+        
+        if 'year_range' in criteria:
+            start_year, end_year = criteria['year_range']
+            year_postings = store.get_year_range_postings(start_year, end_year)
+            candidates = year_postings if candidates is None else candidates & year_postings
+        
+        if 'min_rating' in criteria:
+            rating_ids = BitmapPostingList.from_ids(sorted(store.search_by_min_rating(criteria['min_rating'])))
+            candidates = rating_ids if candidates is None else candidates & rating_ids
+        
+        if candidates is None:
+            # Nothing indexed to narrow by; stream the catalog instead of listing it
+            return store.iter_videos()
+        return store.get_videos(candidates.to_list())
+    
     def get_similar_videos(self, video_id: int, limit: int = 10) -> List[SearchResult]:
         """Find videos similar to the given video using graph analysis"""
         start_time = time.time()
@@ -285,7 +396,8 @@ class VideoSearchSystem:
     def get_auto_complete_suggestions(self, query: str, category: str = 'all', limit: int = 5) -> List[Tuple[str, str]]:
         """Get auto-complete suggestions for search queries"""
         try:
-            return self.trie_system.get_auto_complete_suggestions(query, category, limit)
+            return self.trie_system.get_auto_complete_suggestions(query, category, limit,
+                                                                  self.query_popularity)
         except Exception as e:
             print(f"Error getting auto-complete suggestions: {e}")
             return []
@@ -316,6 +428,15 @@ class VideoSearchSystem:
         
         return sorted_results[:limit]
     
+    def _record_query(self, query: str, results: List[SearchResult]):
+        """Count a search towards auto-complete popularity if it found anything
+
+        Searches that come back empty are mostly typos, which should not be
+        promoted as suggestions.
+        """
+        if results and isinstance(query, str):
+            self.query_popularity.record(query)
+    
     def _update_search_stats(self, search_type: str, response_time: float):
         """Update search performance statistics"""
         self.search_stats['total_searches'] += 1
@@ -333,23 +454,30 @@ class VideoSearchSystem:
     def get_system_statistics(self) -> Dict:
         """Get comprehensive system statistics"""
         return {
-            'hash_table_stats': self.metadata_store.get_storage_stats(),
+            'hash_table_stats': self.metadata_store.get_storage_stats(include_postings=False),
             'trie_stats': self.trie_system.get_system_stats(),
+            'spelling_stats': self.trie_system.get_spelling_stats(),
             'graph_stats': self.content_graph.get_graph_stats(),
             'search_performance': self.search_stats,
-            'total_videos': len(self.metadata_store.get_all_videos())
+            'query_popularity': self.query_popularity.get_stats(),
+            'total_videos': self.metadata_store.get_video_count()
         }
     
-    def export_data(self) -> Dict:
-        """Export all system data for backup or analysis"""
+    def export_data(self, stream: bool = False) -> Dict:
+        """Export all system data for backup or analysis
+
+        With stream=True, 'videos' is a generator of video dicts so a caller
+        writing them out one at a time never holds the whole catalog.
+        """
+        videos = (video.to_dict() for video in self.metadata_store.iter_videos())
         return {
-            'videos': [video.to_dict() for video in self.metadata_store.get_all_videos()],
+            'videos': videos if stream else list(videos),
             'graph_data': self.content_graph.export_graph_data(),
             'system_stats': self.get_system_statistics()
         }
     
     def search_with_spell_correction(self, query: str, search_type: str = 'title', limit: int = 10) -> List[SearchResult]:
-        """Search with automatic spell correction using fuzzy matching"""
+        """Search with automatic spell correction using the spelling indexes"""
         start_time = time.time()
         
         if search_type == 'title':
@@ -369,17 +497,43 @@ class VideoSearchSystem:
         self._update_search_stats('spell_corrected', time.time() - start_time)
         return results
     
-    def bulk_add_videos(self, videos: List[Video]) -> Dict[str, int]:
-        """Add multiple videos and return success/failure counts"""
-        success_count = 0
+    def bulk_add_videos(self, videos: List[Video], pause_gc: bool = False) -> Dict[str, int]:
+        """Add multiple videos and return success/failure counts
+
+        The metadata store and graph take videos one at a time; the tries are
+        loaded afterwards in one sorted pass over the whole batch. If that
+        pass fails, the batch is taken back out of the store and graph so
+        no video is left half added. pause_gc is passed on to the tries.
+        """
+        added = []
         failure_count = 0
         
         for video in videos:
-            if self.add_video(video):
-                success_count += 1
-            else:
+            try:
+                self.metadata_store.add_video(video)
+            except Exception as e:
+                print(f"Error adding video {getattr(video, 'video_id', video)}: {e}")
+                failure_count += 1
+                continue
+            try:
+                self.content_graph.add_video_to_graph(video)
+                added.append(video)
+            except Exception as e:
+                print(f"Error adding video {video.video_id}: {e}")
+                self.metadata_store.remove_video(video.video_id)
                 failure_count += 1
         
+        try:
+            self.trie_system.bulk_add_videos(added, pause_gc)
+            success_count = len(added)
+        except Exception as e:
+            print(f"Error adding videos to tries: {e}")
+            for video in added:
+                self.metadata_store.remove_video(video.video_id)
+                self.content_graph.remove_video_from_graph(video)
+            success_count = 0
+            failure_count = len(videos)
+        
         return {
             'success': success_count,
             'failures': failure_count,